@@ -0,0 +1,51 @@
+"""Add jobs table (fila local de tarefas em segundo plano)
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('tipo', sa.String(50), nullable=False),
+        sa.Column('parametros', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pendente'),
+        sa.Column('tentativas', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_tentativas', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('executar_apos', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('worker', sa.String(100), nullable=True),
+        sa.Column('erro', sa.Text(), nullable=True),
+        sa.Column('arquivo_path', sa.String(500), nullable=True),
+        sa.Column('arquivo_nome', sa.String(255), nullable=True),
+        sa.Column('media_type', sa.String(100), nullable=True),
+        sa.Column('tamanho', sa.Integer(), nullable=True),
+        sa.Column('usuario_id', sa.Integer(), sa.ForeignKey('usuarios.id'), nullable=True),
+        sa.Column('iniciado_em', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('concluido_em', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expira_em', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_jobs_id', 'jobs', ['id'])
+    op.create_index('ix_jobs_status', 'jobs', ['status'])
+    op.create_index('ix_jobs_executar_apos', 'jobs', ['executar_apos'])
+    op.create_index('ix_jobs_usuario_id', 'jobs', ['usuario_id'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_usuario_id')
+    op.drop_index('ix_jobs_executar_apos')
+    op.drop_index('ix_jobs_status')
+    op.drop_index('ix_jobs_id')
+    op.drop_table('jobs')
@@ -0,0 +1,42 @@
+"""Add documentos_armazenados table (PDFs persistidos com deduplicação)
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'documentos_armazenados',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('beneficio_id', sa.Integer(), sa.ForeignKey('beneficios.id'), nullable=False),
+        sa.Column('tipo', sa.String(30), nullable=False),
+        sa.Column('status', sa.String(30), nullable=False),
+        sa.Column('versao', sa.String(64), nullable=False),
+        sa.Column('sha256', sa.String(64), nullable=False),
+        sa.Column('tamanho', sa.Integer(), nullable=False),
+        sa.Column('nome_arquivo', sa.String(255), nullable=False),
+        sa.Column('media_type', sa.String(100), nullable=False, server_default='application/pdf'),
+        sa.Column('usuario_id', sa.Integer(), sa.ForeignKey('usuarios.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint('beneficio_id', 'tipo', 'versao', name='uq_documento_beneficio_tipo_versao'),
+    )
+    op.create_index('ix_documentos_armazenados_id', 'documentos_armazenados', ['id'])
+    op.create_index('ix_documentos_armazenados_beneficio_id', 'documentos_armazenados', ['beneficio_id'])
+    op.create_index('ix_documentos_armazenados_sha256', 'documentos_armazenados', ['sha256'])
+
+
+def downgrade():
+    op.drop_index('ix_documentos_armazenados_sha256')
+    op.drop_index('ix_documentos_armazenados_beneficio_id')
+    op.drop_index('ix_documentos_armazenados_id')
+    op.drop_table('documentos_armazenados')
@@ -0,0 +1,22 @@
+"""Add batimento_em to jobs (órfãos detectados pelo batimento do worker)
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('jobs', sa.Column('batimento_em', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('jobs', 'batimento_em')
@@ -3,6 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
 
+from app.core import limite_taxa
 from app.core.database import get_db
 from app.core.security import (
     verify_password,
@@ -42,7 +43,7 @@ def build_usuario_response(user: Usuario) -> UsuarioResponse:
     )
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(limite_taxa.limitar_login)])
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -6,6 +6,8 @@ from decimal import Decimal
 import csv
 import io
 
+from app.core import cache, respostas
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.usuario import Usuario
@@ -22,9 +24,11 @@ from app.schemas.beneficio import (
     AdministradoraCreate, AdministradoraUpdate, AdministradoraResponse,
     SimulacaoRequest, SimulacaoResponse,
     BeneficioHistoricoResponse,
-    BeneficioFaixaCreate, BeneficioFaixaUpdate, BeneficioFaixaResponse
+    BeneficioFaixaCreate, BeneficioFaixaUpdate, BeneficioFaixaResponse,
+    CronogramaResponse, CenarioCorrecao, IndiceCorrecao
 )
 from app.models.administradora import Administradora
+from app.services import pdf_cache
 
 # Status and type definitions (using strings since model uses String columns)
 StatusBeneficio = Literal[
@@ -46,11 +50,23 @@ async def list_beneficios(
     cliente_id: Optional[int] = None,
     status: Optional[StatusBeneficio] = None,
     tipo_bem: Optional[TipoBem] = None,
+    formato: Optional[Literal["compact"]] = Query(None, alias="format"),
+    fields: Optional[str] = Query(None, description="Campos da resposta separados por vírgula (ex.: id,status)"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Lista benefícios com filtros"""
-    query = db.query(Beneficio).filter(Beneficio.ativo == True)
+    """
+    Lista benefícios com filtros (?format=compact: campos + linhas em arrays).
+    Seleciona só as colunas da resposta, com o nome do cliente no mesmo SELECT.
+    """
+    campos = respostas.campos(BeneficioListResponse, fields)
+    colunas = [
+        (Cliente.nome if c == "cliente_nome" else getattr(Beneficio, c)).label(c)
+        for c in campos
+    ]
+    query = db.query(*colunas).select_from(Beneficio).filter(Beneficio.ativo == True)
+    if "cliente_nome" in campos:
+        query = query.outerjoin(Cliente, Cliente.id == Beneficio.cliente_id)
 
     if cliente_id:
         query = query.filter(Beneficio.cliente_id == cliente_id)
@@ -61,24 +77,7 @@ async def list_beneficios(
 
     beneficios = query.order_by(Beneficio.created_at.desc()).offset(skip).limit(limit).all()
 
-    result = []
-    for b in beneficios:
-        cliente = db.query(Cliente).filter(Cliente.id == b.cliente_id).first()
-        result.append(BeneficioListResponse(
-            id=b.id,
-            cliente_id=b.cliente_id,
-            cliente_nome=cliente.nome if cliente else None,
-            tipo_bem=b.tipo_bem,
-            valor_credito=b.valor_credito,
-            parcela=b.parcela,
-            prazo_grupo=b.prazo_grupo,
-            status=b.status,
-            grupo=b.grupo,
-            cota=b.cota,
-            created_at=b.created_at
-        ))
-
-    return result
+    return respostas.lista(BeneficioListResponse, beneficios, formato, nomes=campos)
 
 
 @router.post("/", response_model=BeneficioResponse, status_code=status.HTTP_201_CREATED)
@@ -288,6 +287,11 @@ async def update_beneficio_status(
     db.add(historico)
 
     db.commit()
+
+    # Contrato/termo costumam ser baixados logo após a transição: renderiza em segundo plano
+    if is_forward:
+        pdf_cache.agendar_pre_renderizacao(db, beneficio.id, status_data.status, current_user.id)
+
     db.refresh(beneficio)
 
     return beneficio
@@ -414,9 +418,41 @@ async def delete_faixa(
     db.commit()
 
 
+# ==================== CRONOGRAMA ====================
+
+@router.get("/{beneficio_id}/cronograma", response_model=CronogramaResponse)
+async def get_cronograma(
+    beneficio_id: int,
+    cenario: CenarioCorrecao = "sem_correcao",
+    indice: Optional[IndiceCorrecao] = Query(None, description="Sobrescreve o índice de correção do benefício"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Cronograma completo de parcelas do benefício (mês a mês), expandido a partir das faixas.
+    Sem faixas cadastradas, usa os percentuais do próprio benefício distribuídos pelo prazo.
+    """
+    beneficio = db.query(Beneficio).filter(Beneficio.id == beneficio_id).first()
+    if not beneficio:
+        raise HTTPException(status_code=404, detail="Benefício não encontrado")
+
+    faixas = db.query(BeneficioFaixa).filter(
+        BeneficioFaixa.beneficio_id == beneficio_id
+    ).order_by(BeneficioFaixa.parcela_inicio).all()
+
+    # NumPy só é carregado no primeiro cronograma, fora do startup
+    from app.services.cronograma import montar_cronograma
+    try:
+        return montar_cronograma(beneficio, faixas, cenario=cenario, indice=indice)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ==================== TABELAS DE CRÉDITO ====================
 
 @router.get("/tabelas/", response_model=List[TabelaCreditoResponse])
+@cache.em_cache("referencia", settings.CACHE_TTL_REFERENCIA, tags=("tabelas_credito", "administradoras"),
+                modelo=List[TabelaCreditoResponse])
 async def list_tabelas_credito(
     tipo_bem: Optional[TipoBem] = None,
     administradora_id: Optional[int] = None,
@@ -671,6 +707,8 @@ async def importar_tabelas_csv(
 
 
 @router.post("/simular", response_model=SimulacaoResponse)
+@cache.em_cache("simulacao", settings.CACHE_TTL_SIMULACAO, tags=("tabelas_credito", "administradoras"),
+                modelo=SimulacaoResponse)
 async def simular_beneficio(
     simulacao: SimulacaoRequest,
     db: Session = Depends(get_db),
@@ -697,6 +735,8 @@ async def simular_beneficio(
 # ==================== ADMINISTRADORAS ====================
 
 @router.get("/administradoras/", response_model=List[AdministradoraResponse])
+@cache.em_cache("referencia", settings.CACHE_TTL_REFERENCIA, tags=("administradoras",),
+                modelo=List[AdministradoraResponse])
 async def list_administradoras(
     ativo: bool = True,
     db: Session = Depends(get_db),
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+
+from app.core import limite_taxa
+from app.core.database import get_db, SessionLocal
+from app.models.usuario import Usuario
+from app.api.v1.endpoints.perfis import check_permission
+from app.services.elegibilidade import carregar_indice_tabelas, gerar_csv, CHUNK_PADRAO
+
+router = APIRouter(prefix="/campanhas", tags=["Campanhas"])
+
+
+@router.get("/elegibilidade", dependencies=[Depends(limite_taxa.limitar("exportacoes"))])
+async def exportar_elegibilidade(
+    top_n: int = Query(3, ge=1, le=20),
+    tipo_bem: Optional[str] = None,
+    unidade_id: Optional[int] = None,
+    apenas_ativos: bool = True,
+    chunk: int = Query(CHUNK_PADRAO, ge=1000, le=100000),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(check_permission("clientes.visualizar"))
+):
+    """
+    Exporta (CSV) as tabelas de crédito para as quais cada cliente se qualifica.
+    Capacidade livre = 30% do salário - dívidas declaradas; retorna as top-N
+    tabelas de maior crédito com parcela dentro da capacidade.
+    """
+    indice = carregar_indice_tabelas(db, top_n=top_n, tipo_bem=tipo_bem)
+
+    def stream():
+        # Sessão própria: o streaming continua depois que a dependência termina
+        sessao = SessionLocal()
+        try:
+            yield from gerar_csv(sessao, indice, chunk=chunk, unidade_id=unidade_id, apenas_ativos=apenas_ativos)
+        finally:
+            sessao.close()
+
+    filename = f"elegibilidade_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+    return StreamingResponse(
+        stream(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 
+from app.core import respostas
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.usuario import Usuario
@@ -19,11 +20,17 @@ async def list_clientes(
     search: Optional[str] = None,
     unidade_id: Optional[int] = None,
     ativo: Optional[bool] = None,
+    formato: Optional[Literal["compact"]] = Query(None, alias="format"),
+    fields: Optional[str] = Query(None, description="Campos da resposta separados por vírgula (ex.: id,nome,cpf)"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Lista clientes com paginação e filtros"""
-    query = db.query(Cliente)
+    """
+    Lista clientes com paginação e filtros (?format=compact: campos + linhas em
+    arrays). Seleciona só as colunas da resposta, não a linha inteira do cliente.
+    """
+    campos = respostas.campos(ClienteListResponse, fields)
+    query = db.query(*(getattr(Cliente, c) for c in campos)).select_from(Cliente)
 
     if search:
         query = query.filter(
@@ -38,10 +45,9 @@ async def list_clientes(
     if ativo is not None:
         query = query.filter(Cliente.ativo == ativo)
 
-    total = query.count()
     clientes = query.order_by(Cliente.created_at.desc()).offset(skip).limit(limit).all()
 
-    return clientes
+    return respostas.lista(ClienteListResponse, clientes, formato, nomes=campos)
 
 
 @router.post("/", response_model=ClienteResponse, status_code=status.HTTP_201_CREATED)
@@ -1,9 +1,15 @@
+import os
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
 from app.core.security import get_current_user
+from app.core import cache, profiling
+from app.core.config import settings as app_settings
+from app.api.v1.endpoints.perfis import check_permission
 from app.models.usuario import Usuario
 from app.models.configuracao import Configuracao
 from app.schemas.configuracao import (
@@ -30,6 +36,8 @@ def get_or_create_config(db: Session, chave: str, categoria: str, valor_default:
 
 
 @router.get("/", response_model=List[ConfiguracaoResponse])
+@cache.em_cache("configuracoes", app_settings.CACHE_TTL_CONFIGURACOES, tags=("configuracoes",),
+                modelo=List[ConfiguracaoResponse])
 async def list_configuracoes(
     categoria: str = None,
     db: Session = Depends(get_db),
@@ -43,6 +51,7 @@ async def list_configuracoes(
 
 
 @router.get("/empresa", response_model=EmpresaSettings)
+@cache.em_cache("configuracoes", app_settings.CACHE_TTL_CONFIGURACOES, tags=("configuracoes",), modelo=EmpresaSettings)
 async def get_empresa_settings(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
@@ -86,6 +95,7 @@ async def update_empresa_settings(
 
 
 @router.get("/pdf", response_model=PDFSettings)
+@cache.em_cache("configuracoes", app_settings.CACHE_TTL_CONFIGURACOES, tags=("configuracoes",), modelo=PDFSettings)
 async def get_pdf_settings(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
@@ -134,6 +144,7 @@ async def update_pdf_settings(
 
 
 @router.get("/sistema", response_model=SistemaSettings)
+@cache.em_cache("configuracoes", app_settings.CACHE_TTL_CONFIGURACOES, tags=("configuracoes",), modelo=SistemaSettings)
 async def get_sistema_settings(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
@@ -213,6 +224,9 @@ async def seed_configuracoes(
         ("sistema_session_timeout_minutes", "30", "sistema", "Timeout da sessão em minutos"),
         ("sistema_enable_notifications", "true", "sistema", "Habilitar notificações"),
         ("sistema_default_currency", "BRL", "sistema", "Moeda padrão"),
+        ("sistema_rate_limit_login_per_minute", "10", "sistema", "Tentativas de login por minuto (por IP e por e-mail)"),
+        ("sistema_rate_limit_reports_per_minute", "30", "sistema", "PDFs e documentos por minuto por usuário"),
+        ("sistema_rate_limit_exports_per_minute", "5", "sistema", "Exportações por minuto por usuário"),
     ]
 
     created = 0
@@ -231,3 +245,31 @@ async def seed_configuracoes(
     db.commit()
 
     return {"message": f"{created} configurações criadas"}
+
+
+@router.get("/profiling")
+async def list_profiling(
+    current_user: Usuario = Depends(check_permission("configuracoes.sistema"))
+):
+    """Lista os profilings gravados (header X-Profile ou ?_profile=)"""
+    pasta = profiling.pasta()
+    if not os.path.isdir(pasta):
+        return []
+    arquivos = []
+    for nome in sorted(os.listdir(pasta), reverse=True):
+        caminho = os.path.join(pasta, nome)
+        if os.path.isfile(caminho):
+            arquivos.append({"nome": nome, "tamanho": os.path.getsize(caminho)})
+    return arquivos
+
+
+@router.get("/profiling/{nome}")
+async def download_profiling(
+    nome: str,
+    current_user: Usuario = Depends(check_permission("configuracoes.sistema"))
+):
+    """Baixa um profiling (HTML/speedscope abrem no navegador, .pstats no snakeviz/pstats)"""
+    caminho = os.path.join(profiling.pasta(), nome)
+    if os.path.basename(nome) != nome or not os.path.isfile(caminho):
+        raise HTTPException(status_code=404, detail="Profiling não encontrado")
+    return FileResponse(caminho, filename=nome)
@@ -4,7 +4,9 @@ from sqlalchemy import func, case
 from datetime import datetime, timedelta
 from typing import List
 
-from app.core.database import get_db
+from app.core import cache, coalescencia
+from app.core.config import settings
+from app.core.database import get_read_db
 from app.core.security import get_current_user
 from app.models.usuario import Usuario
 from app.models.cliente import Cliente
@@ -14,8 +16,10 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
 @router.get("/metricas")
+@cache.em_cache("dashboard", settings.CACHE_TTL_DASHBOARD, tags=("clientes", "beneficios"))
+@coalescencia.coalescer("dashboard")
 async def get_metricas(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """Retorna métricas para o dashboard"""
@@ -77,9 +81,11 @@ async def get_metricas(
 
 
 @router.get("/atividades-recentes")
+@cache.em_cache("dashboard", settings.CACHE_TTL_DASHBOARD, tags=("clientes", "beneficios"))
+@coalescencia.coalescer("dashboard")
 async def get_atividades_recentes(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """Retorna atividades recentes do sistema"""
@@ -99,16 +105,16 @@ async def get_atividades_recentes(
         })
 
     # Últimos benefícios criados/atualizados
-    ultimos_beneficios = db.query(Beneficio).filter(
+    ultimos_beneficios = db.query(Beneficio, Cliente.nome).outerjoin(
+        Cliente, Cliente.id == Beneficio.cliente_id
+    ).filter(
         Beneficio.ativo == True
     ).order_by(Beneficio.created_at.desc()).limit(5).all()
 
-    for beneficio in ultimos_beneficios:
-        cliente = db.query(Cliente).filter(Cliente.id == beneficio.cliente_id).first()
-        cliente_nome = cliente.nome if cliente else 'Cliente'
+    for beneficio, cliente_nome in ultimos_beneficios:
         atividades.append({
             'tipo': 'beneficio',
-            'descricao': f'Benefício #{beneficio.id} - {cliente_nome} ({beneficio.status})',
+            'descricao': f'Benefício #{beneficio.id} - {cliente_nome or "Cliente"} ({beneficio.status})',
             'data': beneficio.created_at.isoformat() if beneficio.created_at else None,
         })
 
@@ -119,9 +125,11 @@ async def get_atividades_recentes(
 
 
 @router.get("/vendas-por-periodo")
+@cache.em_cache("dashboard", settings.CACHE_TTL_DASHBOARD, tags=("beneficios",))
+@coalescencia.coalescer("dashboard")
 async def get_vendas_por_periodo(
     dias: int = 30,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """Retorna vendas agrupadas por dia nos últimos X dias"""
@@ -153,8 +161,10 @@ async def get_vendas_por_periodo(
 
 
 @router.get("/status-distribuicao")
+@cache.em_cache("dashboard", settings.CACHE_TTL_DASHBOARD, tags=("beneficios",))
+@coalescencia.coalescer("dashboard")
 async def get_status_distribuicao(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """Retorna distribuição de status para gráfico de pizza"""
@@ -192,8 +202,10 @@ async def get_status_distribuicao(
 
 
 @router.get("/tipo-bem-distribuicao")
+@cache.em_cache("dashboard", settings.CACHE_TTL_DASHBOARD, tags=("beneficios",))
+@coalescencia.coalescer("dashboard")
 async def get_tipo_bem_distribuicao(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """Retorna distribuição por tipo de bem para gráfico de pizza"""
@@ -219,9 +231,11 @@ async def get_tipo_bem_distribuicao(
 
 
 @router.get("/vendas-mensal")
+@cache.em_cache("dashboard", settings.CACHE_TTL_DASHBOARD, tags=("beneficios",))
+@coalescencia.coalescer("dashboard")
 async def get_vendas_mensal(
     meses: int = 12,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """Retorna vendas agrupadas por mês para gráfico de linha"""
@@ -269,9 +283,11 @@ async def get_vendas_mensal(
 
 
 @router.get("/top-representantes")
+@cache.em_cache("dashboard", settings.CACHE_TTL_DASHBOARD, tags=("beneficios", "usuarios"))
+@coalescencia.coalescer("dashboard")
 async def get_top_representantes(
     limit: int = 5,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """Retorna top representantes por vendas"""
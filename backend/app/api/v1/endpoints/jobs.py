@@ -0,0 +1,93 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.core import limite_taxa
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models.usuario import Usuario
+from app.models.job import Job
+from app.schemas.job import JobCreate, JobResponse
+from app.schemas.relatorio import LoteDocumentosRequest
+from app.api.v1.endpoints.perfis import has_permission
+from app.services import jobs
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def _buscar_job(db: Session, job_id: int, current_user: Usuario) -> Job:
+    """Job do usuário (administradores do sistema veem todos)"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job or (
+        job.usuario_id != current_user.id
+        and not has_permission(db, current_user, "configuracoes.sistema")
+    ):
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return job
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(limite_taxa.limitar("relatorios"))])
+async def criar_job(
+    job_data: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Enfileira a geração de um documento ou de um lote em segundo plano.
+    Acompanhe por GET /jobs/{id} e baixe por GET /jobs/{id}/download.
+    """
+    if job_data.tipo == "documento":
+        if not job_data.documento or not job_data.id:
+            raise HTTPException(status_code=400, detail="Informe o documento e o id para jobs do tipo documento")
+        parametros = {"documento": job_data.documento, "id": job_data.id}
+    else:
+        filtros = job_data.filtros or LoteDocumentosRequest()
+        parametros = {"filtros": filtros.model_dump(mode="json")}
+
+    parametros["usuario_id"] = current_user.id
+    return jobs.enfileirar(db, job_data.tipo, parametros, usuario_id=current_user.id)
+
+
+@router.get("", response_model=List[JobResponse])
+async def listar_jobs(
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Lista os jobs mais recentes do usuário"""
+    return db.query(Job).filter(
+        Job.usuario_id == current_user.id
+    ).order_by(Job.id.desc()).limit(min(limit, 200)).all()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def status_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Status do job (pendente, executando, concluido, erro, expirado)"""
+    return _buscar_job(db, job_id, current_user)
+
+
+@router.get("/{job_id}/download")
+async def download_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Baixa o arquivo gerado pelo job"""
+    job = _buscar_job(db, job_id, current_user)
+
+    if jobs.expirado(job):
+        raise HTTPException(status_code=410, detail="O resultado deste job expirou")
+    if job.status != "concluido":
+        raise HTTPException(status_code=409, detail=f"Job ainda não concluído (status: {job.status})")
+    if not job.arquivo_path or not os.path.exists(job.arquivo_path):
+        raise HTTPException(status_code=410, detail="Arquivo do job não está mais disponível")
+
+    return FileResponse(job.arquivo_path, media_type=job.media_type, filename=job.arquivo_nome)
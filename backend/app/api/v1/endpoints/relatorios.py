@@ -1,30 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from io import BytesIO
+from datetime import datetime
 
-from app.core.database import get_db
+from app.core import cache, coalescencia, limite_taxa
+from app.core.database import get_read_db, SessionLeitura
 from app.core.security import get_current_user
+from app.core.instrumentacao import medir_pdf
 from app.models.usuario import Usuario
 from app.models.cliente import Cliente
 from app.models.beneficio import Beneficio
 from app.models.tabela_credito import TabelaCredito
-from app.models.empresa import Empresa
-from app.models.representante import Representante
-from app.models.beneficio_faixa import BeneficioFaixa
-from app.services.pdf_generator import ClientePDFGenerator
-from app.services.termo_adesao_pdf_generator import TermoAdesaoPDFGenerator
-from app.services.ficha_cliente_pdf import FichaClientePDFGenerator
-from app.services.contrato_venda_pdf import ContratoVendaPDFGenerator
+from app.models.documento_armazenado import DocumentoArmazenado
+from app.services import armazenamento, documentos, dossie
+from app.schemas.relatorio import LoteDocumentosRequest, DocumentoArmazenadoResponse
+from app.utils.zip_stream import stream_zip
+from app.utils.range_response import resposta_com_range
+from app.utils.download import content_disposition
+
+# Renderização é o recurso mais caro: limite por usuário em todas as rotas
+router = APIRouter(prefix="/relatorios", tags=["Relatórios"],
+                   dependencies=[Depends(limite_taxa.limitar("relatorios"))])
+
+
+def _resposta_documento(request: Request, documento: DocumentoArmazenado):
+    return resposta_com_range(
+        request,
+        lambda inicio, fim: armazenamento.ler(documento, inicio, fim),
+        documento.tamanho,
+        documento.media_type,
+        documento.nome_arquivo,
+        etag=documento.sha256,
+    )
+
+
+async def _documento_armazenado(tipo: str, beneficio_id: int, request: Request, current_user: Usuario, db: Session):
+    """
+    Contrato/termo servidos do armazenamento de documentos quando já existe um
+    para a versão atual do benefício (sem renderizar). Caso contrário renderiza
+    pelo cache de PDFs (uma única vez por chave) e armazena.
+    """
+    dados = documentos.carregar_documento(db, tipo, beneficio_id, documentos.snapshot(current_user))
+    if dados is None:
+        raise HTTPException(status_code=404, detail="Benefício não encontrado")
 
-router = APIRouter(prefix="/relatorios", tags=["Relatórios"])
+    versao = armazenamento.versao(tipo, dados)
+    documento = armazenamento.buscar(db, beneficio_id, tipo, versao)
+    if documento is None:
+        # Pedidos simultâneos da mesma versão esperam um único armazenamento
+        documento_id = await coalescencia.executar(
+            cache.chave("documentos", tipo, beneficio_id, versao),
+            lambda: run_in_threadpool(lambda: armazenamento.garantir(db, tipo, beneficio_id, dados, current_user.id).id)
+        )
+        documento = db.get(DocumentoArmazenado, documento_id) or await run_in_threadpool(
+            armazenamento.garantir, db, tipo, beneficio_id, dados, current_user.id
+        )
+    return _resposta_documento(request, documento)
 
 
 @router.get("/cliente/{cliente_id}/pdf")
 async def gerar_pdf_cliente(
     cliente_id: int,
-    db: Session = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Usuario = Depends(get_current_user),
+    voo: coalescencia.Voo = Depends(coalescencia.por_requisicao("relatorios"))
 ):
     """
     Gera PDF com dados do cliente (Planejamento Financeiro)
@@ -49,13 +90,16 @@ async def gerar_pdf_cliente(
             TabelaCredito.ativo == True
         ).order_by(TabelaCredito.valor_credito).limit(4).all()
 
-    # Gera PDF
+    # Gera PDF (ReportLab só é importado na primeira renderização)
+    from app.services.pdf_generator import ClientePDFGenerator
     pdf_generator = ClientePDFGenerator(
         cliente=cliente,
         tabelas_simulacao=tabelas
     )
 
-    pdf_bytes = pdf_generator.generate()
+    # Renderização fora do event loop, uma só para pedidos iguais simultâneos
+    with medir_pdf():
+        pdf_bytes = await voo.executar(lambda: run_in_threadpool(pdf_generator.generate))
 
     # Retorna como streaming response
     filename = f"planejamento_{cliente.nome.replace(' ', '_')}_{cliente_id}.pdf"
@@ -64,7 +108,7 @@ async def gerar_pdf_cliente(
         BytesIO(pdf_bytes),
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f"attachment; filename={filename}"
+            "Content-Disposition": content_disposition(filename)
         }
     )
 
@@ -72,8 +116,9 @@ async def gerar_pdf_cliente(
 @router.get("/beneficio/{beneficio_id}/pdf")
 async def gerar_pdf_beneficio(
     beneficio_id: int,
-    db: Session = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Usuario = Depends(get_current_user),
+    voo: coalescencia.Voo = Depends(coalescencia.por_requisicao("relatorios"))
 ):
     """
     Gera PDF com dados do benefício e cliente
@@ -93,13 +138,15 @@ async def gerar_pdf_beneficio(
     tabelas = [tabela] if tabela else []
 
     # Gera PDF
+    from app.services.pdf_generator import ClientePDFGenerator
     pdf_generator = ClientePDFGenerator(
         cliente=cliente,
         beneficio=beneficio,
         tabelas_simulacao=tabelas
     )
 
-    pdf_bytes = pdf_generator.generate()
+    with medir_pdf():
+        pdf_bytes = await voo.executar(lambda: run_in_threadpool(pdf_generator.generate))
 
     # Retorna como streaming response
     filename = f"proposta_{beneficio_id}_{cliente.nome.replace(' ', '_')}.pdf"
@@ -108,7 +155,7 @@ async def gerar_pdf_beneficio(
         BytesIO(pdf_bytes),
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f"attachment; filename={filename}"
+            "Content-Disposition": content_disposition(filename)
         }
     )
 
@@ -116,8 +163,10 @@ async def gerar_pdf_beneficio(
 @router.get("/ficha-atendimento/{cliente_id}/pdf")
 async def gerar_ficha_atendimento_pdf(
     cliente_id: int,
-    db: Session = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Usuario = Depends(get_current_user),
+    # Sem representante no cliente a ficha sai em nome de quem pede
+    voo: coalescencia.Voo = Depends(coalescencia.por_requisicao("relatorios", escopo="usuario"))
 ):
     """
     Gera PDF da Ficha de Atendimento do Cliente (3 páginas)
@@ -138,19 +187,21 @@ async def gerar_ficha_atendimento_pdf(
         representante = current_user
 
     # Gera PDF
+    from app.services.ficha_cliente_pdf import FichaClientePDFGenerator
     pdf_generator = FichaClientePDFGenerator(
         cliente=cliente,
         representante=representante
     )
 
-    pdf_bytes = pdf_generator.generate()
+    with medir_pdf():
+        pdf_bytes = await voo.executar(lambda: run_in_threadpool(pdf_generator.generate))
     filename = pdf_generator.get_filename()
 
     return StreamingResponse(
         BytesIO(pdf_bytes),
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f"attachment; filename={filename}"
+            "Content-Disposition": content_disposition(filename)
         }
     )
 
@@ -158,77 +209,21 @@ async def gerar_ficha_atendimento_pdf(
 @router.get("/termo-adesao/{beneficio_id}/pdf")
 async def gerar_termo_adesao_pdf(
     beneficio_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """
     Gera PDF do termo de adesão ao consórcio
     """
-    # Busca benefício
-    beneficio = db.query(Beneficio).filter(Beneficio.id == beneficio_id).first()
-    if not beneficio:
-        raise HTTPException(status_code=404, detail="Benefício não encontrado")
-
-    # Busca cliente
-    cliente = db.query(Cliente).filter(Cliente.id == beneficio.cliente_id).first()
-    if not cliente:
-        raise HTTPException(status_code=404, detail="Cliente não encontrado")
-
-    # Busca usuário (representante do benefício ou usuário logado)
-    usuario = None
-    if beneficio.representante_id:
-        usuario = db.query(Usuario).filter(Usuario.id == beneficio.representante_id).first()
-    if not usuario:
-        usuario = current_user
-
-    # Busca empresa (diretamente do benefício)
-    empresa = None
-    if beneficio.empresa_id:
-        empresa = db.query(Empresa).filter(Empresa.id == beneficio.empresa_id).first()
-
-    # Busca representante (modelo Representante com razão social)
-    representante = None
-    if beneficio.unidade_id:
-        representante = db.query(Representante).filter(
-            Representante.unidade_id == beneficio.unidade_id,
-            Representante.ativo == True
-        ).first()
-    if not representante:
-        representante = db.query(Representante).filter(Representante.ativo == True).first()
-
-    # Busca faixas de parcelas do benefício
-    faixas = db.query(BeneficioFaixa).filter(
-        BeneficioFaixa.beneficio_id == beneficio_id
-    ).order_by(BeneficioFaixa.parcela_inicio).all()
-
-    # Gera PDF do termo de adesão
-    pdf_generator = TermoAdesaoPDFGenerator(
-        cliente=cliente,
-        beneficio=beneficio,
-        usuario=usuario,
-        empresa=empresa,
-        representante=representante,
-        faixas=faixas
-    )
-
-    pdf_bytes = pdf_generator.generate()
-
-    # Retorna como streaming response
-    filename = f"termo_adesao_{beneficio_id}_{cliente.nome.replace(' ', '_')}.pdf"
-
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
+    return await _documento_armazenado("termo", beneficio_id, request, current_user, db)
 
 
 @router.get("/contrato/{beneficio_id}/pdf")
 async def gerar_contrato_venda_pdf(
     beneficio_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """
@@ -244,45 +239,94 @@ async def gerar_contrato_venda_pdf(
     - Página 9: Questionário de Checagem
     - Página 10: Ciência da Análise Creditícia
     """
-    # Busca benefício
-    beneficio = db.query(Beneficio).filter(Beneficio.id == beneficio_id).first()
-    if not beneficio:
-        raise HTTPException(status_code=404, detail="Benefício não encontrado")
+    return await _documento_armazenado("contrato", beneficio_id, request, current_user, db)
 
-    # Carrega a tabela de crédito para obter valor_intermediacao
-    if beneficio.tabela_credito_id:
-        tabela_credito = db.query(TabelaCredito).filter(TabelaCredito.id == beneficio.tabela_credito_id).first()
-        beneficio.tabela_credito = tabela_credito
 
-    # Busca cliente
-    cliente = db.query(Cliente).filter(Cliente.id == beneficio.cliente_id).first()
-    if not cliente:
-        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+@router.get("/documentos/beneficio/{beneficio_id}", response_model=list[DocumentoArmazenadoResponse])
+async def listar_documentos_armazenados(
+    beneficio_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Versões de contrato/termo já armazenadas para o benefício (mais recentes primeiro)"""
+    return db.query(DocumentoArmazenado).filter(
+        DocumentoArmazenado.beneficio_id == beneficio_id
+    ).order_by(DocumentoArmazenado.created_at.desc(), DocumentoArmazenado.id.desc()).all()
 
-    # Busca representante (do benefício)
-    representante = None
-    if beneficio.representante_id:
-        representante = db.query(Representante).filter(Representante.id == beneficio.representante_id).first()
 
-    # Busca empresa (do benefício)
-    empresa = None
-    if beneficio.empresa_id:
-        empresa = db.query(Empresa).filter(Empresa.id == beneficio.empresa_id).first()
+@router.get("/documentos/{documento_id}/arquivo")
+async def baixar_documento_armazenado(
+    documento_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Download de uma versão armazenada (aceita Range para retomada)"""
+    documento = db.query(DocumentoArmazenado).filter(DocumentoArmazenado.id == documento_id).first()
+    if not documento:
+        raise HTTPException(status_code=404, detail="Documento não encontrado")
+    return _resposta_documento(request, documento)
 
-    # Gera PDF do contrato
-    pdf_generator = ContratoVendaPDFGenerator(
-        cliente=cliente,
-        beneficio=beneficio,
-        representante=representante,
-        empresa=empresa
-    )
 
-    pdf_bytes = pdf_generator.generate()
-    filename = pdf_generator.get_filename()
+@router.get("/dossie/{beneficio_id}")
+async def gerar_dossie_pdf(
+    beneficio_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Dossiê da venda em um único PDF com marcadores:
+    ficha de atendimento, planejamento, contrato e termo de adesão.
+    Os dados são carregados de uma vez e os documentos renderizados em paralelo.
+    """
+    documentos_dossie = documentos.carregar_dossie(db, beneficio_id, documentos.snapshot(current_user))
+    if documentos_dossie is None:
+        raise HTTPException(status_code=404, detail="Benefício não encontrado")
+
+    partes = await dossie.renderizar(documentos_dossie)
+    writer = await run_in_threadpool(dossie.juntar, partes)
 
+    cliente = documentos_dossie[0][1]["cliente"]
+    filename = f"dossie_{beneficio_id}_{cliente.nome.replace(' ', '_')}.pdf"
     return StreamingResponse(
-        BytesIO(pdf_bytes),
+        dossie.stream_pdf(writer),
         media_type="application/pdf",
+        headers={
+            "Content-Disposition": content_disposition(filename)
+        }
+    )
+
+
+@router.post("/lote")
+async def gerar_lote_documentos(
+    filtros: LoteDocumentosRequest,
+    db: Session = Depends(get_read_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Gera contratos e/ou termos de vários benefícios em um único ZIP.
+    Os PDFs são renderizados em paralelo no pool de processos e cada um
+    entra no ZIP assim que fica pronto (download começa imediatamente).
+    """
+    beneficio_ids = documentos.ids_lote(db, filtros)
+    if not beneficio_ids:
+        raise HTTPException(status_code=404, detail="Nenhum benefício encontrado para os filtros informados")
+
+    usuario_padrao = documentos.snapshot(current_user)
+    tipos = set(filtros.documentos)
+
+    def arquivos():
+        # Sessão própria: o ZIP continua sendo gerado depois que a dependência termina
+        sessao = SessionLeitura()
+        try:
+            yield from documentos.arquivos_lote(sessao, beneficio_ids, tipos, usuario_padrao)
+        finally:
+            sessao.close()
+
+    filename = f"documentos_{datetime.now().strftime('%Y%m%d_%H%M')}.zip"
+    return StreamingResponse(
+        stream_zip(arquivos()),
+        media_type="application/zip",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
         }
@@ -2,7 +2,8 @@ from fastapi import APIRouter
 from app.api.v1.endpoints import (
     auth, usuarios, clientes, beneficios, unidades, empresas,
     utils, dashboard, relatorios, configuracoes,
-    representantes, consultores, perfis, tabelas_credito
+    representantes, consultores, perfis, tabelas_credito,
+    campanhas, jobs
 )
 
 api_router = APIRouter(prefix="/api/v1")
@@ -21,3 +22,5 @@ api_router.include_router(relatorios.router)
 api_router.include_router(configuracoes.router)
 api_router.include_router(perfis.router)
 api_router.include_router(tabelas_credito.router)
+api_router.include_router(campanhas.router)
+api_router.include_router(jobs.router)
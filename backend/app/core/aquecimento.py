@@ -0,0 +1,103 @@
+"""
+Aquecimento do processo antes de marcá-lo como pronto
+
+Cada etapa preenche um cache que, frio, seria pago pela primeira requisição
+do worker: mappers do ORM, conexões do pool, e templates compilados e assets
+dos PDFs nos processos que renderizam.
+
+- "compartilhada": só toca memória do processo; o servidor de produção
+  (app.servidor) roda essas antes do fork, e os workers herdam as páginas
+  prontas (copy-on-write)
+- "processo": roda no startup de cada worker HTTP (conexões)
+- "render": roda só onde os PDFs são renderizados (initializer do pool de
+  app.services.pdf_pool e startup dos workers de jobs). Os processos HTTP
+  nunca renderizam, e carregar ReportLab/WeasyPrint/PIL neles desfaria o
+  import enxuto de app.main
+- Falha numa etapa vira aviso no log: o processo sobe frio, mas sobe
+
+Novos caches registram sua etapa com @etapa("nome", tipo).
+"""
+import time
+
+from app.core import inicializacao
+from app.core.config import settings
+
+
+_etapas = []  # (nome, função, tipo)
+
+
+def etapa(nome, tipo="compartilhada"):
+    def registrar(funcao):
+        _etapas.append((nome, funcao, tipo))
+        return funcao
+    return registrar
+
+
+def _rodar(tipos):
+    if not settings.AQUECIMENTO:
+        return 0.0
+    inicio = time.perf_counter()
+    for nome, funcao, tipo in _etapas:
+        if tipo not in tipos:
+            continue
+        comeco = time.perf_counter()
+        try:
+            funcao()
+        except Exception as e:
+            print(f"Aviso: aquecimento '{nome}' falhou: {e}")
+        inicializacao.registrar_etapa(f"aquecimento_{nome}", time.perf_counter() - comeco)
+    return round((time.perf_counter() - inicio) * 1000, 1)
+
+
+def aquecer(apenas_compartilhadas=False):
+    """Etapas do processo HTTP; devolve o tempo total em ms"""
+    return _rodar(("compartilhada",) if apenas_compartilhadas else ("compartilhada", "processo"))
+
+
+def aquecer_render():
+    """Etapas dos processos que renderizam PDFs (initializer do pool, workers de jobs)"""
+    return _rodar(("render",))
+
+
+# ===================== ETAPAS =====================
+
+@etapa("orm")
+def _orm():
+    """Configura os mappers (relacionamentos resolvidos na primeira consulta)"""
+    from sqlalchemy.orm import configure_mappers
+    import app.models  # noqa: F401
+    configure_mappers()
+
+
+@etapa("templates", "render")
+def _templates():
+    """Template Jinja2 compilado e CSS do contrato analisado (WeasyPrint)"""
+    from app.services import contrato_venda_pdf
+    contrato_venda_pdf.template()
+    contrato_venda_pdf.folha_css()
+
+
+@etapa("assets_pdf", "render")
+def _assets_pdf():
+    """Imagens dos PDFs decodificadas e reduzidas para o tamanho de render"""
+    from app.services import pdf_assets
+    for nome in pdf_assets.TAMANHOS_RENDER:
+        pdf_assets.imagem(nome)
+
+
+@etapa("pool_db", "processo")
+def _pool_db():
+    """Abre as conexões do pool (pool_size) em vez de na primeira rajada"""
+    from sqlalchemy import text
+    from app.core.database import engine
+
+    tamanho = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    conexoes = []
+    try:
+        for _ in range(max(1, tamanho)):
+            conexao = engine.connect()
+            conexoes.append(conexao)
+            conexao.execute(text("SELECT 1"))
+    finally:
+        for conexao in conexoes:
+            conexao.close()
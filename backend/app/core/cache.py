@@ -0,0 +1,350 @@
+"""
+Cache de aplicação: Redis quando REDIS_URL está configurado, senão LRU em
+memória de cada processo
+
+- Valores JSON (orjson); resultados de ORM passam antes por `json(modelo, valor)`
+- Chaves com o prefixo do ambiente (REDIS_PREFIXO), ex.: hm:cache:dashboard:...
+- Tags: `invalidar("beneficios")` apaga todas as entradas gravadas com a tag.
+  Commits invalidam sozinhos as tags com o nome das tabelas alteradas
+  (eventos de sessão em app.core.database)
+- Stampede: cada entrada fica "fresca" por `ttl` e ainda pode ser servida
+  vencida por CACHE_STALE_SEGUNDOS; só quem pega a trava recalcula, os demais
+  devolvem o valor vencido (ou esperam o primeiro cálculo, se não há nenhum)
+- Redis fora do ar: as operações caem no LRU local por alguns segundos
+
+- Cálculo x invalidação: cada tag guarda o instante da última invalidação.
+  O valor calculado não é gravado se alguma tag foi invalidada durante o
+  cálculo ou, quando a sessão leu da réplica (get_read_db), até
+  DB_REPLICA_ATRASO_MAX_SEGUNDOS antes dele: a réplica pode ainda não ter o
+  commit que invalidou, e o valor antigo ficaria gravado até o TTL
+
+Sem Redis (ou com ele fora do ar), a invalidação só alcança o próprio
+processo: com vários workers o valor antigo pode durar em outro worker. Por
+isso, nesse modo, o TTL e a janela de vencido ficam limitados a
+CACHE_TTL_LOCAL_MAX segundos.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+import orjson
+
+from app.core import metricas, redis_cliente, respostas
+from app.core.config import settings
+
+
+PAUSA_REDIS = 5.0  # segundos no LRU local depois de uma falha do Redis
+ESPERA_PRIMEIRO_CALCULO = 2.0
+TRAVA_SEGUNDOS = 30
+MARCA_INVALIDACAO_SEGUNDOS = 300  # quanto o instante da invalidação de uma tag fica no Redis
+
+CONSULTAS = metricas.contador(
+    "cache_requests_total", "Leituras do cache por namespace e resultado (hit, stale, miss)",
+    ("namespace", "result")
+)
+DESCARTADOS = metricas.contador(
+    "cache_discarded_fills_total", "Valores calculados não gravados por invalidação concorrente", ("namespace",)
+)
+ERROS_REDIS = metricas.contador("cache_redis_errors_total", "Falhas do Redis (operação caiu no cache local)")
+
+_lock = threading.Lock()
+_local = OrderedDict()  # chave -> (expira_em, bytes)
+_tags_local = {}  # tag -> set(chaves)
+_travas_local = {}  # chave -> expira_em
+_invalidadas_local = {}  # tag -> time.time() da última invalidação
+_redis_pausado_ate = [0.0]
+
+
+# ===================== SERIALIZAÇÃO =====================
+
+def _padrao(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo não serializável no cache: {type(valor).__name__}")
+
+
+def _serializar(valor, fresco_ate):
+    return orjson.dumps({"v": valor, "f": fresco_ate}, default=_padrao)
+
+
+def json(modelo, valor):
+    """Objetos (ORM) convertidos pelo schema de resposta para tipos JSON"""
+    return respostas.adaptador(modelo).dump_python(valor, mode="json")
+
+
+def chave(namespace, *partes):
+    return ":".join([namespace, *("" if p is None else str(p) for p in partes)])
+
+
+# ===================== BACKENDS =====================
+
+def _redis():
+    if time.monotonic() < _redis_pausado_ate[0]:
+        return None
+    return redis_cliente.cliente()
+
+
+def _falha_redis(e):
+    ERROS_REDIS.inc()
+    _redis_pausado_ate[0] = time.monotonic() + PAUSA_REDIS
+    print(f"Cache: Redis indisponível, usando cache local por {PAUSA_REDIS:.0f}s: {e}")
+
+
+def _ler_bruto(c):
+    cliente = _redis()
+    if cliente is not None:
+        try:
+            return cliente.get(redis_cliente.chave("cache", c))
+        except Exception as e:
+            _falha_redis(e)
+    with _lock:
+        item = _local.get(c)
+        if item is None:
+            return None
+        if item[0] <= time.time():
+            del _local[c]
+            return None
+        _local.move_to_end(c)
+        return item[1]
+
+
+def _gravar_bruto(c, dados, expira_em_segundos, tags):
+    cliente = _redis()
+    if cliente is not None:
+        try:
+            pipe = cliente.pipeline()
+            pipe.set(redis_cliente.chave("cache", c), dados, px=int(expira_em_segundos * 1000))
+            for tag in tags:
+                chave_tag = redis_cliente.chave("tag", tag)
+                pipe.sadd(chave_tag, c)
+                pipe.expire(chave_tag, int(expira_em_segundos) + 60)
+            pipe.execute()
+            return
+        except Exception as e:
+            _falha_redis(e)
+    with _lock:
+        _local[c] = (time.time() + expira_em_segundos, dados)
+        _local.move_to_end(c)
+        for tag in tags:
+            _tags_local.setdefault(tag, set()).add(c)
+        while len(_local) > settings.CACHE_LOCAL_MAX_ITENS:
+            _local.popitem(last=False)
+
+
+def _travar(c):
+    cliente = _redis()
+    if cliente is not None:
+        try:
+            return bool(cliente.set(redis_cliente.chave("trava", c), 1, nx=True, ex=TRAVA_SEGUNDOS))
+        except Exception as e:
+            _falha_redis(e)
+    agora = time.time()
+    with _lock:
+        if _travas_local.get(c, 0) > agora:
+            return False
+        _travas_local[c] = agora + TRAVA_SEGUNDOS
+        return True
+
+
+def _destravar(c):
+    cliente = _redis()
+    if cliente is not None:
+        try:
+            cliente.delete(redis_cliente.chave("trava", c))
+            return
+        except Exception as e:
+            _falha_redis(e)
+    with _lock:
+        _travas_local.pop(c, None)
+
+
+# ===================== API =====================
+
+def _ler(c):
+    dados = _ler_bruto(c)
+    return orjson.loads(dados) if dados is not None else None
+
+
+def obter(c, padrao=None):
+    """Valor da chave (fresco ou vencido) ou `padrao`"""
+    if not settings.CACHE_HABILITADO:
+        return padrao
+    entrada = _ler(c)
+    return padrao if entrada is None else entrada["v"]
+
+
+def _prazos(ttl):
+    """(segundos fresco, segundos vencido) da entrada; curtos quando só há o cache local"""
+    stale = settings.CACHE_STALE_SEGUNDOS
+    if _redis() is None:
+        limite = settings.CACHE_TTL_LOCAL_MAX
+        return min(ttl, limite), min(stale, limite)
+    return ttl, stale
+
+
+def definir(c, valor, ttl, tags=()):
+    if not settings.CACHE_HABILITADO:
+        return
+    ttl, stale = _prazos(ttl)
+    dados = _serializar(valor, time.time() + ttl)
+    _gravar_bruto(c, dados, ttl + stale, tags)
+
+
+def remover(*chaves):
+    cliente = _redis()
+    if cliente is not None:
+        try:
+            cliente.delete(*(redis_cliente.chave("cache", c) for c in chaves))
+        except Exception as e:
+            _falha_redis(e)
+    with _lock:
+        for c in chaves:
+            _local.pop(c, None)
+
+
+def invalidar(*tags):
+    """Remove todas as entradas gravadas com alguma das tags"""
+    if not tags:
+        return
+    agora = time.time()
+    cliente = _redis()
+    if cliente is not None:
+        try:
+            chaves_tags = [redis_cliente.chave("tag", t) for t in tags]
+            membros = cliente.sunion(chaves_tags)
+            pipe = cliente.pipeline()
+            if membros:
+                pipe.delete(*(redis_cliente.chave("cache", m.decode()) for m in membros))
+            pipe.delete(*chaves_tags)
+            for tag in tags:
+                pipe.set(redis_cliente.chave("tag_invalidada", tag), agora, ex=MARCA_INVALIDACAO_SEGUNDOS)
+            pipe.execute()
+        except Exception as e:
+            _falha_redis(e)
+    # O local também: pode ter recebido gravações enquanto o Redis estava fora
+    with _lock:
+        for tag in tags:
+            _invalidadas_local[tag] = agora
+            for c in _tags_local.pop(tag, ()):
+                _local.pop(c, None)
+
+
+def _invalidada_desde(tags, instante):
+    """Alguma das tags foi invalidada a partir de `instante` (time.time())?"""
+    if not tags:
+        return False
+    with _lock:
+        if any(_invalidadas_local.get(t, 0.0) >= instante for t in tags):
+            return True
+    cliente = _redis()
+    if cliente is not None:
+        try:
+            marcas = cliente.mget([redis_cliente.chave("tag_invalidada", t) for t in tags])
+            return any(m is not None and float(m) >= instante for m in marcas)
+        except Exception as e:
+            _falha_redis(e)
+    return False
+
+
+def limpar_local():
+    with _lock:
+        _local.clear()
+        _tags_local.clear()
+        _travas_local.clear()
+        _invalidadas_local.clear()
+
+
+async def _executar(calcular):
+    valor = calcular()
+    return await valor if inspect.isawaitable(valor) else valor
+
+
+async def obter_ou_calcular(c, calcular, ttl, tags=(), atraso=None):
+    """
+    Valor em cache ou `calcular()` (função ou corrotina), gravado por `ttl`
+    segundos. O namespace das métricas é o primeiro segmento da chave.
+    `atraso()`, chamado depois do cálculo, diz quantos segundos os dados lidos
+    podem estar atrasados (réplica); invalidações nessa janela impedem a gravação.
+    """
+    if not settings.CACHE_HABILITADO:
+        return await _executar(calcular)
+    namespace = c.split(":", 1)[0]
+    entrada = _ler(c)
+
+    if entrada is not None:
+        if entrada["f"] > time.time():
+            CONSULTAS.inc(namespace=namespace, result="hit")
+            return entrada["v"]
+        CONSULTAS.inc(namespace=namespace, result="stale")
+        if not _travar(c):
+            return entrada["v"]  # outro processo já está recalculando
+        return await _calcular_e_gravar(c, calcular, ttl, tags, atraso)
+
+    CONSULTAS.inc(namespace=namespace, result="miss")
+    if _travar(c):
+        return await _calcular_e_gravar(c, calcular, ttl, tags, atraso)
+    # Primeiro cálculo em andamento em outra requisição: espera um pouco por ele
+    limite = time.monotonic() + ESPERA_PRIMEIRO_CALCULO
+    while time.monotonic() < limite:
+        await asyncio.sleep(0.05)
+        entrada = _ler(c)
+        if entrada is not None:
+            return entrada["v"]
+    return await _executar(calcular)
+
+
+async def _calcular_e_gravar(c, calcular, ttl, tags, atraso=None):
+    try:
+        inicio = time.time()
+        valor = await _executar(calcular)
+        janela = atraso() if atraso is not None else 0.0
+        if _invalidada_desde(tags, inicio - janela):
+            DESCARTADOS.inc(namespace=c.split(":", 1)[0])
+        else:
+            definir(c, valor, ttl, tags)
+        return valor
+    finally:
+        _destravar(c)
+
+
+def _parte(nome, valor):
+    if hasattr(valor, "model_dump_json"):
+        valor = valor.model_dump_json()
+    elif hasattr(valor, "value"):
+        valor = valor.value
+    return f"{nome}={valor}"
+
+
+def partes(kwargs, ignorar=()):
+    """Parâmetros de uma rota normalizados para compor chaves (ordem fixa)"""
+    return [_parte(k, v) for k, v in sorted(kwargs.items()) if k not in ignorar]
+
+
+def em_cache(namespace, ttl, tags=(), modelo=None, ignorar=("db", "current_user")):
+    """
+    Rota com a resposta em cache, chaveada pelos parâmetros (menos sessão e
+    usuário: use só em rotas cujo resultado não depende de quem pede).
+    `modelo` converte o retorno (objetos ORM) para JSON antes de gravar.
+    Com sessão de leitura o cálculo segue na réplica (ver SessaoLeitura) e
+    não é gravado se as tags foram invalidadas dentro do atraso tolerado.
+    """
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        async def rota(**kwargs):
+            async def calcular():
+                valor = await funcao(**kwargs)
+                return json(modelo, valor) if modelo is not None else valor
+
+            def atraso():
+                db = kwargs.get("db")
+                replica = db is not None and getattr(db, "info", {}).get("replica")
+                return settings.DB_REPLICA_ATRASO_MAX_SEGUNDOS if replica else 0.0
+
+            c = chave(namespace, funcao.__name__, *partes(kwargs, ignorar))
+            return await obter_ou_calcular(c, calcular, ttl, tags, atraso)
+        return rota
+    return decorar
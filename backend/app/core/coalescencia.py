@@ -0,0 +1,227 @@
+"""
+Coalescência de requisições idênticas (single-flight)
+
+Requisições iguais ao mesmo tempo compartilham um único cálculo: a primeira
+calcula e as demais recebem o mesmo resultado (ou a mesma exceção).
+
+- No worker: um Future por chave no event loop
+- Entre workers/instâncias (com REDIS_URL): trava SET NX com o token do
+  voo; quem não pegou a trava espera o resultado publicado pelo dono por
+  até COALESCENCIA_ESPERA_SEGUNDOS e depois calcula por conta própria.
+  O resultado só trafega se for bytes ou JSON (orjson)
+- Chave: rota + parâmetros normalizados + escopo de permissão (perfil do
+  usuário, ou o próprio usuário quando a resposta depende de quem pede)
+
+    @router.get("/metricas")
+    @coalescencia.coalescer("dashboard")
+    async def get_metricas(...): ...
+
+    voo: coalescencia.Voo = Depends(coalescencia.por_requisicao("relatorios"))
+    pdf = await voo.executar(lambda: run_in_threadpool(gerador.generate))
+"""
+import asyncio
+import functools
+import inspect
+import time
+import uuid
+from decimal import Decimal
+
+import orjson
+from fastapi import Depends, Request
+
+from app.core import cache, metricas, redis_cliente
+from app.core.config import settings
+from app.core.security import get_current_user
+
+
+PAUSA_REDIS = 5.0
+RESULTADO_SEGUNDOS = 10  # tempo do resultado no Redis para quem espera
+INTERVALO_ESPERA = 0.05
+
+RESULTADOS = metricas.contador(
+    "singleflight_requests_total",
+    "Requisições coalescidas por namespace e papel (leader, local, remote, fallback)",
+    ("namespace", "result")
+)
+
+_em_andamento = {}  # chave -> asyncio.Future do voo no worker
+_redis_pausado_ate = [0.0]
+
+
+async def _executar(calcular):
+    valor = calcular()
+    return await valor if inspect.isawaitable(valor) else valor
+
+
+def _padrao(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def _serializar(valor):
+    if isinstance(valor, bytes):
+        return b"b" + valor
+    return b"j" + orjson.dumps(valor, default=_padrao)
+
+
+def _desserializar(dados):
+    return dados[1:] if dados[:1] == b"b" else orjson.loads(dados[1:])
+
+
+# ===================== ENTRE WORKERS =====================
+
+def _redis():
+    if time.monotonic() < _redis_pausado_ate[0]:
+        return None
+    return redis_cliente.cliente()
+
+
+def _falha_redis(e):
+    _redis_pausado_ate[0] = time.monotonic() + PAUSA_REDIS
+    print(f"Coalescência: Redis indisponível, só dentro do worker por {PAUSA_REDIS:.0f}s: {e}")
+
+
+def _soltar(cliente, trava, token):
+    try:
+        if cliente.get(trava) == token.encode():
+            cliente.delete(trava)
+    except Exception as e:
+        _falha_redis(e)
+
+
+async def _como_dono(cliente, trava, token, calcular):
+    try:
+        valor = await _executar(calcular)
+    except BaseException:
+        _soltar(cliente, trava, token)
+        raise
+    try:
+        cliente.set(redis_cliente.chave("voo_resultado", token), _serializar(valor), ex=RESULTADO_SEGUNDOS)
+    except TypeError:
+        pass  # resultado que não trafega: quem espera calcula ao ver a trava livre
+    except Exception as e:
+        _falha_redis(e)
+    _soltar(cliente, trava, token)
+    return valor
+
+
+async def _entre_workers(c, calcular, namespace):
+    cliente = _redis()
+    if cliente is None:
+        RESULTADOS.inc(namespace=namespace, result="leader")
+        return await _executar(calcular)
+
+    trava = redis_cliente.chave("voo", c)
+    token = uuid.uuid4().hex
+    espera = settings.COALESCENCIA_ESPERA_SEGUNDOS
+    try:
+        dono = None
+        if not cliente.set(trava, token, nx=True, ex=espera):
+            dono = cliente.get(trava)
+    except Exception as e:
+        _falha_redis(e)
+        RESULTADOS.inc(namespace=namespace, result="leader")
+        return await _executar(calcular)
+    if dono is None:
+        RESULTADOS.inc(namespace=namespace, result="leader")
+        return await _como_dono(cliente, trava, token, calcular)
+
+    # Outro worker calculando: espera o resultado do voo dele
+    resultado = redis_cliente.chave("voo_resultado", dono.decode())
+    limite = time.monotonic() + espera
+    try:
+        while time.monotonic() < limite:
+            await asyncio.sleep(INTERVALO_ESPERA)
+            dados = cliente.get(resultado)
+            if dados is None and cliente.get(trava) != dono:
+                dados = cliente.get(resultado)  # publicado logo antes de soltar a trava?
+                if dados is None:
+                    break
+            if dados is not None:
+                RESULTADOS.inc(namespace=namespace, result="remote")
+                return _desserializar(dados)
+    except Exception as e:
+        _falha_redis(e)
+    RESULTADOS.inc(namespace=namespace, result="fallback")
+    return await _executar(calcular)
+
+
+# ===================== API =====================
+
+async def executar(c, calcular):
+    """
+    `calcular()` (função ou corrotina) uma única vez para chamadas simultâneas
+    com a mesma chave. O namespace das métricas é o primeiro segmento da chave.
+    """
+    if not settings.COALESCENCIA_HABILITADA:
+        return await _executar(calcular)
+    namespace = c.split(":", 1)[0]
+
+    futuro = _em_andamento.get(c)
+    if futuro is not None:
+        RESULTADOS.inc(namespace=namespace, result="local")
+        try:
+            return await asyncio.shield(futuro)
+        except asyncio.CancelledError:
+            if not futuro.cancelled():
+                raise
+            # O dono foi cancelado (cliente desconectou): tenta de novo
+            return await executar(c, calcular)
+
+    futuro = asyncio.get_running_loop().create_future()
+    _em_andamento[c] = futuro
+    try:
+        valor = await _entre_workers(c, calcular, namespace)
+    except asyncio.CancelledError:
+        futuro.cancel()
+        raise
+    except BaseException as e:
+        futuro.set_exception(e)
+        futuro.exception()  # sem ninguém esperando não vira aviso de exceção não lida
+        raise
+    else:
+        futuro.set_result(valor)
+        return valor
+    finally:
+        _em_andamento.pop(c, None)
+
+
+def _escopo(usuario, escopo):
+    if usuario is None:
+        return "anonimo"
+    return f"usuario={usuario.id}" if escopo == "usuario" else f"perfil={usuario.perfil_id}"
+
+
+def coalescer(namespace, escopo="perfil", ignorar=("db", "current_user")):
+    """Rota inteira coalescida, chaveada pelos parâmetros e pelo escopo de `current_user`"""
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        async def rota(**kwargs):
+            c = cache.chave(namespace, funcao.__name__, _escopo(kwargs.get("current_user"), escopo),
+                            *cache.partes(kwargs, ignorar))
+            return await executar(c, lambda: funcao(**kwargs))
+        return rota
+    return decorar
+
+
+class Voo:
+    """Chave da requisição atual, para coalescer só a parte cara da rota"""
+
+    def __init__(self, chave):
+        self.chave = chave
+
+    async def executar(self, calcular, *partes):
+        return await executar(cache.chave(self.chave, *partes), calcular)
+
+
+def por_requisicao(namespace, escopo="perfil"):
+    """Dependência: Voo chaveado por método, rota, parâmetros de caminho e query e escopo"""
+    async def dependencia(request: Request, current_user=Depends(get_current_user)):
+        rota = request.scope.get("route")
+        parametros = sorted(request.path_params.items()) + sorted(request.query_params.multi_items())
+        return Voo(cache.chave(
+            namespace, request.method, getattr(rota, "path", request.url.path),
+            _escopo(current_user, escopo), *(f"{k}={v}" for k, v in parametros)
+        ))
+    return dependencia
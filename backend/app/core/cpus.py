@@ -0,0 +1,53 @@
+"""
+CPUs que o processo realmente pode usar
+
+os.cpu_count() devolve os núcleos da máquina, não os do container: num host
+de 64 núcleos com limite de 2 CPUs, dimensionar workers por ele cria dezenas
+de processos disputando 2 CPUs. Aqui vale o menor entre a afinidade do
+processo e a cota do cgroup (v2 cpu.max, v1 cpu.cfs_quota_us / cfs_period_us).
+"""
+import math
+import os
+from functools import lru_cache
+
+
+CPU_MAX_V2 = "/sys/fs/cgroup/cpu.max"
+COTA_V1 = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+PERIODO_V1 = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _ler(caminho):
+    try:
+        with open(caminho) as arquivo:
+            return arquivo.read().split()
+    except OSError:
+        return None
+
+
+def _cota_cgroup():
+    """CPUs permitidas pela cota do cgroup (None = sem limite)"""
+    partes = _ler(CPU_MAX_V2)
+    if partes and len(partes) == 2:
+        cota, periodo = partes
+    else:
+        cota, periodo = (_ler(COTA_V1) or [None])[0], (_ler(PERIODO_V1) or [None])[0]
+    if cota in (None, "max", "-1") or not periodo:
+        return None
+    try:
+        cota, periodo = int(cota), int(periodo)
+    except ValueError:
+        return None
+    if cota <= 0 or periodo <= 0:
+        return None
+    return max(1, math.ceil(cota / periodo))
+
+
+@lru_cache()
+def disponiveis():
+    """Número de CPUs utilizáveis (afinidade e cota do container), no mínimo 1"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    cota = _cota_cgroup()
+    return max(1, min(cpus, cota) if cota else cpus)
@@ -1,22 +1,200 @@
-from sqlalchemy import create_engine
+"""
+Engines e sessões do banco
+
+- get_db: sessão no primário (escritas e leituras transacionais)
+- get_read_db: sessão de leitura para dashboard e relatórios. Com
+  DATABASE_REPLICA_URL, as consultas vão para a réplica enquanto o atraso
+  dela ficar dentro de DB_REPLICA_ATRASO_MAX_SEGUNDOS; senão, no primário.
+  Qualquer flush na sessão de leitura vai para o primário e fixa a sessão nele
+- Read-your-writes: o commit com escrita marca o usuário da requisição
+  (Redis, se configurado, para valer entre workers; senão memória do
+  processo) e as leituras dele ficam no primário durante a janela tolerada
+- O commit também invalida no app.core.cache as tags com o nome das tabelas
+  alteradas (inclusive por update/delete em massa do ORM)
+"""
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from app.core import cache, metricas, redis_cliente
 from app.core.config import settings
+from app.core.instrumentacao import PoolMedido, instrumentar_engine
 
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20
+
+def _argumentos_pool():
+    return {
+        "poolclass": PoolMedido,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def criar_engine(url):
+    """Engine com o pool e os timeouts de Settings (DB_*)"""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            # Banco em memória: uma conexão por thread (pool padrão do dialeto)
+            return create_engine(url, connect_args={"check_same_thread": False})
+        return create_engine(url, connect_args={"check_same_thread": False}, **_argumentos_pool())
+
+    connect_args = {}
+    if settings.DB_PGBOUNCER and url.get_driver_name() == "psycopg":
+        # psycopg 3 prepara consultas repetidas no servidor; o psycopg2 nunca prepara
+        connect_args["prepare_threshold"] = None
+    if settings.DB_STATEMENT_TIMEOUT_MS and not settings.DB_PGBOUNCER:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    novo = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        **_argumentos_pool()
     )
+    if settings.DB_STATEMENT_TIMEOUT_MS and settings.DB_PGBOUNCER:
+        # O PgBouncer recusa parâmetros de sessão na conexão: vale por transação
+        @event.listens_for(novo, "begin")
+        def _timeout_transacao(conn):
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+    return novo
+
+
+engine = criar_engine(settings.DATABASE_URL)
+engine_replica = criar_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+
+# Tempo, número de consultas e linhas por requisição (Server-Timing e /metrics)
+instrumentar_engine(engine)
+if engine_replica is not None:
+    instrumentar_engine(engine_replica, "replica")
+
+REPLICA_ATRASO = metricas.gauge("db_replica_lag_seconds", "Atraso da réplica na última verificação (-1 = indisponível)")
+LEITURAS = metricas.contador("db_read_sessions_total", "Sessões de leitura por destino", ("target",))
+
+
+# ===================== RÉPLICA =====================
+
+# Usuário autenticado da requisição (definido em get_current_user)
+_usuario_atual = ContextVar("usuario_atual", default=None)
+_escritas = {}  # usuario_id -> time.time() do último commit com escrita (sem Redis)
+_atraso = {"valor": None, "verificado_em": 0.0}
+
+SQL_ATRASO = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def definir_usuario(usuario_id):
+    _usuario_atual.set(usuario_id)
+
+
+def atraso_replica():
+    """Atraso da réplica em segundos (None = indisponível), reconsultado a cada DB_REPLICA_VERIFICACAO_SEGUNDOS"""
+    agora = time.monotonic()
+    if agora - _atraso["verificado_em"] < settings.DB_REPLICA_VERIFICACAO_SEGUNDOS:
+        return _atraso["valor"]
+    _atraso["verificado_em"] = agora
+    try:
+        if engine_replica.dialect.name != "postgresql":
+            valor = 0.0
+        else:
+            with engine_replica.connect() as conn:
+                valor = float(conn.execute(SQL_ATRASO).scalar() or 0.0)
+    except Exception as e:
+        print(f"Réplica indisponível, leituras no primário: {e}")
+        valor = None
+    _atraso["valor"] = valor
+    REPLICA_ATRASO.set(-1 if valor is None else valor)
+    return valor
+
+
+def registrar_escrita(usuario_id):
+    janela = settings.DB_REPLICA_ATRASO_MAX_SEGUNDOS
+    cliente = redis_cliente.cliente()
+    if cliente is not None:
+        try:
+            cliente.set(redis_cliente.chave("escrita", usuario_id), 1, px=int(janela * 1000) + 1)
+            return
+        except Exception as e:
+            print(f"Redis indisponível para read-your-writes: {e}")
+    _escritas[usuario_id] = time.time()
+
+
+def escreveu_recentemente(usuario_id):
+    if usuario_id is None:
+        return False
+    cliente = redis_cliente.cliente()
+    if cliente is not None:
+        try:
+            return bool(cliente.exists(redis_cliente.chave("escrita", usuario_id)))
+        except Exception:
+            return True  # na dúvida, primário
+    momento = _escritas.get(usuario_id)
+    return momento is not None and time.time() - momento < settings.DB_REPLICA_ATRASO_MAX_SEGUNDOS
+
+
+def _usar_replica():
+    if escreveu_recentemente(_usuario_atual.get()):
+        return False
+    atraso = atraso_replica()
+    return atraso is not None and atraso <= settings.DB_REPLICA_ATRASO_MAX_SEGUNDOS
+
+
+class SessaoLeitura(Session):
+    """Sessão que lê da réplica quando ela está em dia; escritas sempre no primário"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if engine_replica is None or self._flushing or self.info.get("primario"):
+            return engine
+        if "replica" not in self.info:
+            # Decidido na primeira consulta (depois das dependências) e mantido na sessão
+            self.info["replica"] = _usar_replica()
+            LEITURAS.inc(target="replica" if self.info["replica"] else "primario")
+        return engine_replica if self.info["replica"] else engine
+
+
+def _antes_flush(session, flush_context, instances):
+    session.info["primario"] = True
+    session.info["escreveu"] = True
+    tabelas = session.info.setdefault("tabelas", set())
+    for objeto in (*session.new, *session.dirty, *session.deleted):
+        tabelas.add(objeto.__table__.name)
+
+
+def _execucao_orm(estado):
+    # query.update()/delete() não passam pelo flush
+    if (estado.is_update or estado.is_delete) and estado.bind_mapper is not None:
+        estado.session.info["escreveu"] = True
+        estado.session.info.setdefault("tabelas", set()).add(estado.bind_mapper.local_table.name)
+
+
+def _depois_commit(session):
+    tabelas = session.info.pop("tabelas", None)
+    if tabelas:
+        cache.invalidar(*tabelas)
+    if session.info.pop("escreveu", False) and engine_replica is not None:
+        usuario_id = _usuario_atual.get()
+        if usuario_id is not None:
+            registrar_escrita(usuario_id)
+
+
+def _depois_rollback(session):
+    session.info.pop("tabelas", None)
+    session.info.pop("escreveu", None)
+
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLeitura = sessionmaker(class_=SessaoLeitura, autocommit=False, autoflush=False, bind=engine)
+for _fabrica in (SessionLocal, SessionLeitura):
+    event.listen(_fabrica, "before_flush", _antes_flush)
+    event.listen(_fabrica, "do_orm_execute", _execucao_orm)
+    event.listen(_fabrica, "after_commit", _depois_commit)
+    event.listen(_fabrica, "after_rollback", _depois_rollback)
 
 Base = declarative_base()
 
@@ -28,3 +206,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Sessão de leitura (réplica quando disponível e em dia; ver SessaoLeitura)"""
+    db = SessionLeitura()
+    try:
+        yield db
+    finally:
+        db.close()
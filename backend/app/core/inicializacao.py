@@ -0,0 +1,184 @@
+"""
+Inicialização do processo: schema, seed e prontidão
+
+Com vários workers do uvicorn, só um deles (o que pegar a trava primeiro)
+mexe no schema e roda o seed; os outros esperam a trava e encontram tudo
+pronto, sem repetir o trabalho.
+
+- Trava: pg_advisory_lock no PostgreSQL (pg_advisory_xact_lock com
+  DB_PGBOUNCER), flock num arquivo ao lado do banco no SQLite
+- STARTUP_SCHEMA=auto: nada a fazer se o alembic_version já está no head;
+  banco vazio recebe create_all + stamp do head; banco antigo sem alembic
+  continua recebendo create_all (com aviso para migrar)
+- STARTUP_SCHEMA=migrar: `alembic upgrade head` no líder
+- STARTUP_SCHEMA=nenhum: migrações rodam fora do app (deploy)
+- Seed uma única vez por SEED_VERSAO (marcador em configuracoes)
+
+O uvicorn só aceita conexões depois do startup do lifespan; /ready responde
+503 até lá e também durante o encerramento, para o balanceador tirar o
+worker antes de ele parar.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import inspect, text
+
+from app.core import metricas
+from app.core.config import settings
+
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic")
+TRAVA_ID = 7_305_011  # pg_advisory_lock da inicialização
+SEED_CHAVE = "startup_seed_versao"
+SEED_VERSAO = "1"
+
+COLD_START = metricas.gauge("app_cold_start_seconds", "Tempo de inicialização do processo por etapa", ("etapa",))
+
+_estado = {"pronto": False, "etapas": {}}
+
+
+def pronto():
+    return _estado["pronto"]
+
+
+def etapas():
+    return dict(_estado["etapas"])
+
+
+def marcar_pronto(valor=True):
+    _estado["pronto"] = valor
+
+
+def registrar_etapa(etapa, segundos):
+    _estado["etapas"][etapa] = round(segundos * 1000, 1)
+    COLD_START.set(segundos, etapa=etapa)
+
+
+@contextmanager
+def _medir(etapa):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_etapa(etapa, time.perf_counter() - inicio)
+
+
+# ===================== TRAVA =====================
+
+@contextmanager
+def trava_lider(engine):
+    """Exclusão mútua entre os processos que sobem ao mesmo tempo"""
+    if engine.dialect.name == "postgresql" and settings.DB_PGBOUNCER:
+        # Transaction pooling: trava de sessão ficaria presa na conexão do servidor
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": TRAVA_ID})
+            yield
+        return
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": TRAVA_ID})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": TRAVA_ID})
+                conn.commit()
+        return
+
+    banco = engine.url.database if engine.dialect.name == "sqlite" else None
+    caminho = f"{os.path.abspath(banco)}.startup.lock" if banco and banco != ":memory:" else None
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    if caminho is None or fcntl is None:
+        yield
+        return
+    with open(caminho, "a") as arquivo:
+        fcntl.flock(arquivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+
+# ===================== SCHEMA =====================
+
+def _script():
+    from alembic.script import ScriptDirectory
+    return ScriptDirectory(ALEMBIC_DIR)
+
+
+def _versao_atual(conn):
+    from alembic.runtime.migration import MigrationContext
+    return set(MigrationContext.configure(conn).get_current_heads())
+
+
+def preparar_schema(engine, metadata):
+    """Retorna o que foi feito: 'em_dia', 'criado', 'create_all', 'migrado' ou 'ignorado'"""
+    modo = settings.STARTUP_SCHEMA
+    if modo == "nenhum":
+        return "ignorado"
+
+    script = _script()
+    head = set(script.get_heads())
+    with engine.connect() as conn:
+        if _versao_atual(conn) == head:
+            return "em_dia"
+        banco_vazio = not inspect(conn).get_table_names()
+
+    if modo == "migrar":
+        from alembic import command
+        from alembic.config import Config
+
+        # Sem alembic.ini: o fileConfig reconfiguraria os loggers do uvicorn
+        config = Config()
+        config.set_main_option("script_location", ALEMBIC_DIR)
+        command.upgrade(config, "head")
+        return "migrado"
+
+    metadata.create_all(bind=engine)
+    if banco_vazio:
+        from alembic.runtime.migration import MigrationContext
+        with engine.begin() as conn:
+            MigrationContext.configure(conn).stamp(script, "head")
+        return "criado"
+    print("Aviso: banco fora do head do alembic; rode `alembic upgrade head` (create_all só cria tabelas novas)")
+    return "create_all"
+
+
+# ===================== SEED =====================
+
+def seed_uma_vez(seed):
+    """Roda `seed()` se o marcador da versão atual ainda não existir (seed() == False não marca)"""
+    from app.core.database import SessionLocal
+    from app.models.configuracao import Configuracao
+
+    db = SessionLocal()
+    try:
+        marcador = db.query(Configuracao).filter(Configuracao.chave == SEED_CHAVE).first()
+        if marcador and marcador.valor == SEED_VERSAO:
+            return False
+        if seed() is False:
+            return False
+        if marcador is None:
+            marcador = Configuracao(chave=SEED_CHAVE, categoria="sistema",
+                                    descricao="Versão do seed inicial aplicada no startup")
+            db.add(marcador)
+        marcador.valor = SEED_VERSAO
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def inicializar(engine, metadata, seed):
+    """Schema e seed sob a trava do líder; devolve o resumo para o log"""
+    inicio = time.perf_counter()
+    with trava_lider(engine):
+        registrar_etapa("trava", time.perf_counter() - inicio)
+        with _medir("schema"):
+            schema = preparar_schema(engine, metadata)
+        with _medir("seed"):
+            semeado = seed_uma_vez(seed)
+    return schema, semeado
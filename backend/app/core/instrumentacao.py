@@ -0,0 +1,218 @@
+"""
+Instrumentação por requisição: tempo total, tempo de banco, número de
+consultas, linhas retornadas e tempo de renderização de PDFs.
+
+- Eventos do SQLAlchemy no engine (instrumentar_engine) somam as consultas na
+  medição da requisição atual (ContextVar, propagada para o threadpool)
+- MiddlewareInstrumentacao abre a medição, devolve o header Server-Timing e
+  alimenta os histogramas por rota de app.core.metricas
+- Consultas lentas e possíveis N+1 (mesmo SQL repetido) vão para o log, com
+  limites em SLOW_QUERY_MS e N_MAIS_UM_LIMIAR
+- PoolMedido mede a espera por conexão; o estado do pool (em uso, ociosas,
+  overflow) é lido a cada coleta do /metrics
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+from app.core import metricas
+from app.core.config import settings
+
+
+_medicao = ContextVar("medicao_requisicao", default=None)
+
+HTTP_DURACAO = metricas.histograma(
+    "http_request_duration_seconds", "Tempo total da requisição", ("method", "route", "status")
+)
+HTTP_DB = metricas.histograma(
+    "http_request_db_seconds", "Tempo gasto no banco por requisição", ("route",)
+)
+HTTP_CONSULTAS = metricas.histograma(
+    "http_request_queries", "Consultas SQL por requisição", ("route",), buckets=metricas.BUCKETS_CONSULTAS
+)
+HTTP_LINHAS = metricas.contador(
+    "http_request_rows_total", "Linhas retornadas pelo banco", ("route",)
+)
+PDF_DURACAO = metricas.histograma(
+    "pdf_render_seconds", "Tempo de renderização de PDFs por requisição", ("route",)
+)
+CONSULTAS_LENTAS = metricas.contador(
+    "db_slow_queries_total", "Consultas acima de SLOW_QUERY_MS", ("route",)
+)
+N_MAIS_UM = metricas.contador(
+    "db_n_plus_one_total", "Requisições com o mesmo SQL repetido acima de N_MAIS_UM_LIMIAR", ("route",)
+)
+POOL_CONEXOES = metricas.gauge(
+    "db_pool_connections", "Conexões do pool por estado (checked_out, idle, overflow)", ("db", "state")
+)
+POOL_TAMANHO = metricas.gauge("db_pool_size", "Tamanho configurado do pool (sem overflow)", ("db",))
+POOL_ESPERA = metricas.histograma(
+    "db_pool_wait_seconds", "Tempo para obter uma conexão do pool (inclui abrir conexão nova)"
+)
+POOL_TIMEOUTS = metricas.contador("db_pool_timeouts_total", "Esperas por conexão que passaram de DB_POOL_TIMEOUT")
+
+
+class Medicao:
+    """Acumuladores de uma requisição"""
+
+    __slots__ = ("inicio", "scope", "db_ms", "consultas", "linhas", "pdf_ms", "sqls")
+
+    def __init__(self, scope):
+        self.inicio = time.perf_counter()
+        self.scope = scope
+        self.db_ms = 0.0
+        self.consultas = 0
+        self.linhas = 0
+        self.pdf_ms = 0.0
+        self.sqls = Counter()
+
+    def total_ms(self):
+        return (time.perf_counter() - self.inicio) * 1000
+
+    def server_timing(self):
+        return (
+            f'app;dur={self.total_ms():.1f}, '
+            f'db;dur={self.db_ms:.1f};desc="{self.consultas} consultas, {self.linhas} linhas", '
+            f'pdf;dur={self.pdf_ms:.1f}'
+        )
+
+
+def atual():
+    return _medicao.get()
+
+
+# ===================== SQLALCHEMY =====================
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info["instrumentacao_inicio"] = time.perf_counter()
+
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    ms = (time.perf_counter() - conn.info.pop("instrumentacao_inicio", time.perf_counter())) * 1000
+    medicao = _medicao.get()
+
+    if medicao is not None:
+        medicao.db_ms += ms
+        medicao.consultas += 1
+        medicao.sqls[statement] += 1
+        # psycopg2 informa as linhas do SELECT em rowcount; o SQLite devolve -1
+        if cursor.rowcount and cursor.rowcount > 0 and statement.lstrip()[:6].upper() == "SELECT":
+            medicao.linhas += cursor.rowcount
+
+    if ms >= settings.SLOW_QUERY_MS:
+        rota = _rota(medicao.scope) if medicao else "-"
+        CONSULTAS_LENTAS.inc(route=rota)
+        print(f"Consulta lenta ({ms:.0f}ms) em {rota}: {' '.join(statement.split())[:500]}")
+
+
+def instrumentar_engine(engine, nome="primario"):
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _depois)
+    if isinstance(engine.pool, QueuePool):
+        metricas.registrar_coletor(lambda: _coletar_pool(engine, nome))
+
+
+# ===================== POOL =====================
+
+class PoolMedido(QueuePool):
+    """QueuePool que registra quanto cada checkout esperou (e os timeouts)"""
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_ESPERA.observar(time.perf_counter() - inicio)
+
+
+def _coletar_pool(engine, nome):
+    # engine.pool muda no dispose(): lido a cada coleta
+    pool = engine.pool
+    POOL_TAMANHO.set(pool.size(), db=nome)
+    POOL_CONEXOES.set(pool.checkedout(), db=nome, state="checked_out")
+    POOL_CONEXOES.set(pool.checkedin(), db=nome, state="idle")
+    POOL_CONEXOES.set(max(0, pool.overflow()), db=nome, state="overflow")
+
+
+# ===================== PDF =====================
+
+@contextmanager
+def medir_pdf():
+    """Soma o tempo do bloco no tempo de PDF da requisição (renderizações paralelas se somam)"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao = _medicao.get()
+        if medicao is not None:
+            medicao.pdf_ms += (time.perf_counter() - inicio) * 1000
+
+
+# ===================== MIDDLEWARE =====================
+
+def _rota(scope):
+    # O FastAPI grava a rota encontrada no scope; 404 fica agrupado em "nao_encontrada"
+    rota = scope.get("route")
+    return getattr(rota, "path", None) or "nao_encontrada"
+
+
+def _registrar(scope, medicao, status):
+    rota = _rota(scope)
+    HTTP_DURACAO.observar(medicao.total_ms() / 1000, method=scope["method"], route=rota, status=status)
+    HTTP_DB.observar(medicao.db_ms / 1000, route=rota)
+    HTTP_CONSULTAS.observar(medicao.consultas, route=rota)
+    if medicao.linhas:
+        HTTP_LINHAS.inc(medicao.linhas, route=rota)
+    if medicao.pdf_ms:
+        PDF_DURACAO.observar(medicao.pdf_ms / 1000, route=rota)
+
+    repetidas = [(sql, n) for sql, n in medicao.sqls.items() if n >= settings.N_MAIS_UM_LIMIAR]
+    if repetidas:
+        N_MAIS_UM.inc(route=rota)
+        for sql, n in repetidas:
+            print(f"Possível N+1 em {scope['method']} {rota}: {n}x {' '.join(sql.split())[:300]}")
+
+
+class MiddlewareInstrumentacao:
+    """Middleware ASGI (não bufferiza respostas em streaming)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        medicao = Medicao(scope)
+        token = _medicao.set(medicao)
+        status = {"codigo": 500, "registrado": False}
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status["codigo"] = mensagem["status"]
+                if settings.SERVER_TIMING:
+                    headers = list(mensagem.get("headers", []))
+                    headers.append((b"server-timing", medicao.server_timing().encode("latin-1")))
+                    mensagem = {**mensagem, "headers": headers}
+            elif mensagem["type"] == "http.response.body" and not mensagem.get("more_body", False):
+                # Streaming: o histograma considera até o último bloco enviado
+                await send(mensagem)
+                if not status["registrado"]:
+                    status["registrado"] = True
+                    _registrar(scope, medicao, status["codigo"])
+                return
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            if not status["registrado"]:
+                _registrar(scope, medicao, status["codigo"])
+            _medicao.reset(token)
@@ -0,0 +1,186 @@
+"""
+Limite de requisições (token bucket) para rotas caras
+
+    router = APIRouter(dependencies=[Depends(limite_taxa.limitar("relatorios"))])
+
+- Um balde por usuário e limite (login: por IP e por e-mail), com capacidade
+  de N requisições e reposição de N por minuto
+- N vem das configurações do sistema (rate_limit_*_per_minute; 0 = sem
+  limite), lidas pelo cache de aplicação e invalidadas ao salvar
+- Com REDIS_URL o balde é compartilhado por todos os workers/instâncias
+  (script Lua atômico, relógio do Redis); sem Redis, ou com ele fora do ar,
+  cada processo mantém os próprios baldes
+- Excedido: 429 com Retry-After
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.core import cache, metricas, redis_cliente
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.schemas.configuracao import SistemaSettings
+
+
+PAUSA_REDIS = 5.0
+MAX_BALDES_LOCAIS = 10000
+
+# Nome do limite -> campo em SistemaSettings (chave sistema_<campo> em configuracoes)
+LIMITES = {
+    "login": "rate_limit_login_per_minute",
+    "relatorios": "rate_limit_reports_per_minute",
+    "exportacoes": "rate_limit_exports_per_minute",
+}
+
+REJEITADAS = metricas.contador("rate_limit_rejected_total", "Requisições recusadas (429) por limite", ("limite",))
+
+# KEYS[1] balde; ARGV capacidade, reposição por segundo, custo
+# Devolve {permitido, tokens restantes}
+SCRIPT_BALDE = """
+local capacidade = tonumber(ARGV[1])
+local taxa = tonumber(ARGV[2])
+local custo = tonumber(ARGV[3])
+local relogio = redis.call("TIME")
+local agora = tonumber(relogio[1]) + tonumber(relogio[2]) / 1000000
+local dados = redis.call("HMGET", KEYS[1], "t", "ts")
+local tokens = tonumber(dados[1]) or capacidade
+local ts = tonumber(dados[2]) or agora
+tokens = math.min(capacidade, tokens + math.max(0, agora - ts) * taxa)
+local permitido = 0
+if tokens >= custo then
+    tokens = tokens - custo
+    permitido = 1
+end
+redis.call("HSET", KEYS[1], "t", tostring(tokens), "ts", tostring(agora))
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacidade / taxa * 1000) + 1000)
+return {permitido, tostring(tokens)}
+"""
+
+_lock = threading.Lock()
+_baldes = OrderedDict()  # chave -> (tokens, instante)
+_redis_pausado_ate = [0.0]
+
+
+# ===================== BALDES =====================
+
+@lru_cache()
+def _script_balde(cliente):
+    return cliente.register_script(SCRIPT_BALDE)
+
+
+def _consumir_redis(cliente, c, capacidade, taxa, custo):
+    permitido, tokens = _script_balde(cliente)(keys=[redis_cliente.chave("limite", c)], args=[capacidade, taxa, custo])
+    return bool(permitido), float(tokens)
+
+
+def _consumir_local(c, capacidade, taxa, custo):
+    agora = time.monotonic()
+    with _lock:
+        tokens, ts = _baldes.pop(c, (capacidade, agora))
+        tokens = min(capacidade, tokens + (agora - ts) * taxa)
+        permitido = tokens >= custo
+        if permitido:
+            tokens -= custo
+        _baldes[c] = (tokens, agora)
+        while len(_baldes) > MAX_BALDES_LOCAIS:
+            _baldes.popitem(last=False)
+    return permitido, tokens
+
+
+def consumir(c, por_minuto, custo=1):
+    """
+    Tira `custo` tokens do balde `c` (capacidade e reposição de `por_minuto`).
+    Devolve (permitido, segundos até haver tokens suficientes).
+    """
+    capacidade = float(por_minuto)
+    taxa = capacidade / 60
+    cliente = redis_cliente.cliente() if time.monotonic() >= _redis_pausado_ate[0] else None
+    resultado = None
+    if cliente is not None:
+        try:
+            resultado = _consumir_redis(cliente, c, capacidade, taxa, custo)
+        except Exception as e:
+            _redis_pausado_ate[0] = time.monotonic() + PAUSA_REDIS
+            print(f"Limite de taxa: Redis indisponível, usando baldes locais por {PAUSA_REDIS:.0f}s: {e}")
+    if resultado is None:
+        resultado = _consumir_local(c, capacidade, taxa, custo)
+    permitido, tokens = resultado
+    return permitido, 0.0 if permitido else (custo - tokens) / taxa
+
+
+def limpar_local():
+    with _lock:
+        _baldes.clear()
+
+
+# ===================== CONFIGURAÇÃO =====================
+
+def _ler_limites():
+    from app.core.database import SessionLocal
+    from app.models.configuracao import Configuracao
+
+    padrao = SistemaSettings()
+    limites = {nome: getattr(padrao, campo) for nome, campo in LIMITES.items()}
+    db = SessionLocal()
+    try:
+        configs = db.query(Configuracao.chave, Configuracao.valor).filter(
+            Configuracao.chave.in_([f"sistema_{campo}" for campo in LIMITES.values()]),
+            Configuracao.ativo == True
+        ).all()
+    finally:
+        db.close()
+    campos = {f"sistema_{campo}": nome for nome, campo in LIMITES.items()}
+    for chave, valor in configs:
+        if valor is not None and valor.isdigit():
+            limites[campos[chave]] = int(valor)
+    return limites
+
+
+async def limites():
+    """Requisições por minuto de cada limite (configurações do sistema)"""
+    return await cache.obter_ou_calcular(
+        cache.chave("configuracoes", "limites_taxa"), _ler_limites,
+        settings.CACHE_TTL_CONFIGURACOES, tags=("configuracoes",)
+    )
+
+
+async def verificar(nome, *identidades, custo=1):
+    """429 se algum dos baldes (um por identidade) do limite `nome` estiver vazio"""
+    if not settings.RATE_LIMIT_HABILITADO:
+        return
+    por_minuto = (await limites()).get(nome) or 0
+    if por_minuto <= 0:
+        return
+    for identidade in identidades:
+        permitido, espera = consumir(f"{nome}:{identidade}", por_minuto, custo)
+        if not permitido:
+            REJEITADAS.inc(limite=nome)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Muitas requisições. Tente novamente em instantes.",
+                headers={"Retry-After": str(max(1, math.ceil(espera)))},
+            )
+
+
+def _ip(request: Request):
+    # Atrás de proxy o uvicorn (proxy_headers) já resolve o X-Forwarded-For
+    return request.client.host if request.client else "desconhecido"
+
+
+# ===================== DEPENDÊNCIAS =====================
+
+def limitar(nome):
+    """Dependência: limite por usuário autenticado"""
+    async def dependencia(current_user=Depends(get_current_user)):
+        await verificar(nome, f"usuario:{current_user.id}")
+    return dependencia
+
+
+async def limitar_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """Dependência do login: limite por IP e por e-mail informado"""
+    await verificar("login", f"ip:{_ip(request)}", f"email:{form_data.username.strip().lower()}")
@@ -0,0 +1,136 @@
+"""
+Métricas no formato de texto do Prometheus (GET /metrics)
+Registro mínimo em memória (contadores e histogramas com labels), sem
+dependências externas. Cada processo do uvicorn expõe as próprias métricas.
+"""
+import threading
+from bisect import bisect_left
+
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_metricas = {}
+_coletores = []
+_lock = threading.Lock()
+
+
+def _labels(nomes, valores):
+    if not nomes:
+        return ""
+    pares = ",".join(f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores))
+    return "{" + pares + "}"
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nome, descricao, labels=()):
+        self.nome, self.descricao, self.labels = nome, descricao, tuple(labels)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valor=1, **labels):
+        chave = tuple(labels.get(n, "") for n in self.labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def linhas(self):
+        with self._lock:
+            itens = list(self._valores.items())
+        for chave, valor in itens:
+            yield f"{self.nome}{_labels(self.labels, chave)} {_formatar(valor)}"
+
+
+class Gauge(Contador):
+    tipo = "gauge"
+
+    def set(self, valor, **labels):
+        chave = tuple(labels.get(n, "") for n in self.labels)
+        with self._lock:
+            self._valores[chave] = valor
+
+
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nome, descricao, labels=(), buckets=BUCKETS_SEGUNDOS):
+        self.nome, self.descricao, self.labels = nome, descricao, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor, **labels):
+        chave = tuple(labels.get(n, "") for n in self.labels)
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * len(self.buckets), 0, 0.0]
+            if indice < len(self.buckets):
+                serie[0][indice] += 1
+            serie[1] += 1
+            serie[2] += valor
+
+    def linhas(self):
+        with self._lock:
+            itens = [(chave, (list(s[0]), s[1], s[2])) for chave, s in self._series.items()]
+        for chave, (contagens, total, soma) in itens:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets, contagens):
+                acumulado += contagem
+                yield f"{self.nome}_bucket{_labels(self.labels + ('le',), chave + (_formatar(limite),))} {acumulado}"
+            yield f"{self.nome}_bucket{_labels(self.labels + ('le',), chave + ('+Inf',))} {total}"
+            yield f"{self.nome}_sum{_labels(self.labels, chave)} {_formatar(soma)}"
+            yield f"{self.nome}_count{_labels(self.labels, chave)} {total}"
+
+
+def _registrar(classe, nome, *args, **kwargs):
+    with _lock:
+        if nome not in _metricas:
+            _metricas[nome] = classe(nome, *args, **kwargs)
+        return _metricas[nome]
+
+
+def contador(nome, descricao, labels=()):
+    return _registrar(Contador, nome, descricao, labels)
+
+
+def gauge(nome, descricao, labels=()):
+    return _registrar(Gauge, nome, descricao, labels)
+
+
+def histograma(nome, descricao, labels=(), buckets=BUCKETS_SEGUNDOS):
+    return _registrar(Histograma, nome, descricao, labels, buckets)
+
+
+def registrar_coletor(funcao):
+    """`funcao()` é chamada a cada coleta para atualizar gauges (ex.: pool de conexões)"""
+    _coletores.append(funcao)
+    return funcao
+
+
+def exportar():
+    """Texto no formato de exposição do Prometheus (version=0.0.4)"""
+    for coletor in list(_coletores):
+        try:
+            coletor()
+        except Exception as e:
+            print(f"Coletor de métricas falhou: {e}")
+
+    with _lock:
+        metricas = list(_metricas.values())
+    linhas = []
+    for metrica in metricas:
+        linhas.append(f"# HELP {metrica.nome} {metrica.descricao}")
+        linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+        linhas.extend(metrica.linhas())
+    return "\n".join(linhas) + "\n"
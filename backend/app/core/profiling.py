@@ -0,0 +1,173 @@
+"""
+Profiling sob demanda de uma única requisição (somente administradores)
+
+Ativado com o header `X-Profile: html|speedscope|pstats` ou o parâmetro
+`?_profile=html|speedscope|pstats`. O token precisa ter a permissão
+"configuracoes.sistema"; caso contrário a requisição segue normalmente.
+
+- html/speedscope: profiler por amostragem (pyinstrument), acompanha os awaits
+- pstats: cProfile (determinístico), também usado se o pyinstrument faltar
+
+O resultado é gravado em PROFILING_DIR e o nome do arquivo volta no header
+X-Profile-Arquivo (download em /api/v1/configuracoes/profiling/{nome}).
+Um profiling por vez por processo, limitado a PROFILING_MAX_POR_HORA.
+Sem o header/parâmetro o custo é só a verificação do scope.
+"""
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from urllib.parse import parse_qs
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+
+FORMATOS = {"html": ".html", "speedscope": ".speedscope.json", "pstats": ".pstats"}
+PERMISSAO = "configuracoes.sistema"
+
+_execucoes = deque()
+_execucoes_lock = threading.Lock()
+_em_andamento = threading.Lock()
+
+
+def pasta():
+    return os.path.abspath(settings.PROFILING_DIR)
+
+
+def _solicitado(scope):
+    """Formato pedido ou None (verificação barata, feita em toda requisição)"""
+    for nome, valor in scope["headers"]:
+        if nome == b"x-profile":
+            formato = valor.decode("latin-1").strip().lower()
+            return formato if formato in FORMATOS else "html"
+    query = scope.get("query_string", b"")
+    if b"_profile" in query:
+        formato = parse_qs(query.decode("latin-1")).get("_profile", ["html"])[0].lower()
+        return formato if formato in FORMATOS else "html"
+    return None
+
+
+def _token(scope):
+    for nome, valor in scope["headers"]:
+        if nome == b"authorization":
+            esquema, _, token = valor.decode("latin-1").partition(" ")
+            return token if esquema.lower() == "bearer" else None
+    return None
+
+
+def _autorizado(token):
+    """Usuário ativo do token com a permissão de configurações do sistema"""
+    from app.core.database import SessionLocal
+    from app.core.security import decode_token
+    from app.models.usuario import Usuario
+    from app.api.v1.endpoints.perfis import has_permission
+
+    payload = decode_token(token) if token else None
+    if not payload or payload.get("type") != "access" or not payload.get("sub"):
+        return None
+    db = SessionLocal()
+    try:
+        usuario = db.query(Usuario).filter(Usuario.id == int(payload["sub"])).first()
+        if usuario and usuario.ativo and has_permission(db, usuario, PERMISSAO):
+            return usuario.id
+        return None
+    finally:
+        db.close()
+
+
+def _reservar():
+    """Limite por hora + um profiling por vez; True se pode executar"""
+    if not _em_andamento.acquire(blocking=False):
+        return False
+    agora = time.monotonic()
+    with _execucoes_lock:
+        while _execucoes and agora - _execucoes[0] > 3600:
+            _execucoes.popleft()
+        if len(_execucoes) >= settings.PROFILING_MAX_POR_HORA:
+            _em_andamento.release()
+            return False
+        _execucoes.append(agora)
+    return True
+
+
+class _Profiler:
+    def __init__(self, formato):
+        self.formato = formato
+        self._pyinstrument = None
+        self._cprofile = None
+        if formato != "pstats":
+            try:
+                from pyinstrument import Profiler
+                self._pyinstrument = Profiler(
+                    interval=settings.PROFILING_INTERVALO_MS / 1000, async_mode="enabled"
+                )
+            except ImportError:
+                self.formato = "pstats"
+        if self._pyinstrument is None:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+
+    def iniciar(self):
+        if self._pyinstrument:
+            self._pyinstrument.start()
+        else:
+            self._cprofile.enable()
+
+    def parar(self):
+        if self._pyinstrument:
+            self._pyinstrument.stop()
+        else:
+            self._cprofile.disable()
+
+    def salvar(self, caminho):
+        if self._cprofile:
+            self._cprofile.dump_stats(caminho)
+            return
+        if self.formato == "speedscope":
+            from pyinstrument.renderers import SpeedscopeRenderer
+            conteudo = self._pyinstrument.output(SpeedscopeRenderer())
+        else:
+            conteudo = self._pyinstrument.output_html()
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+
+
+class MiddlewareProfiling:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILING_HABILITADO:
+            return await self.app(scope, receive, send)
+        formato = _solicitado(scope)
+        if formato is None:
+            return await self.app(scope, receive, send)
+
+        usuario_id = await run_in_threadpool(_autorizado, _token(scope))
+        if usuario_id is None or not _reservar():
+            return await self.app(scope, receive, send)
+
+        try:
+            profiler = _Profiler(formato)
+            rota = scope["path"].strip("/").replace("/", "_") or "raiz"
+            nome = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{rota[:80]}_u{usuario_id}{FORMATOS[profiler.formato]}"
+
+            async def enviar(mensagem):
+                if mensagem["type"] == "http.response.start":
+                    headers = list(mensagem.get("headers", [])) + [(b"x-profile-arquivo", nome.encode("latin-1"))]
+                    mensagem = {**mensagem, "headers": headers}
+                await send(mensagem)
+
+            profiler.iniciar()
+            try:
+                await self.app(scope, receive, enviar)
+            finally:
+                profiler.parar()
+                os.makedirs(pasta(), exist_ok=True)
+                await run_in_threadpool(profiler.salvar, os.path.join(pasta(), nome))
+                print(f"Profiling de {scope['method']} {scope['path']} salvo em {nome}")
+        finally:
+            _em_andamento.release()
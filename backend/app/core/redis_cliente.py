@@ -0,0 +1,28 @@
+"""
+Cliente Redis compartilhado (opcional)
+
+Com REDIS_URL vazio, `cliente()` devolve None e quem usa cai no modo local
+(memória do processo). Timeouts curtos: Redis fora do ar não pode travar
+requisição; o chamador trata a exceção como "Redis indisponível".
+"""
+from functools import lru_cache
+
+from app.core.config import settings
+
+
+@lru_cache()
+def cliente():
+    if not settings.REDIS_URL:
+        return None
+    import redis
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.REDIS_TIMEOUT_SEGUNDOS,
+        socket_connect_timeout=settings.REDIS_TIMEOUT_SEGUNDOS,
+        health_check_interval=30,
+    )
+
+
+def chave(*partes):
+    """Chave com o prefixo do ambiente (vários ambientes no mesmo Redis)"""
+    return ":".join([settings.REDIS_PREFIXO, *map(str, partes)])
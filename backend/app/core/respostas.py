@@ -0,0 +1,81 @@
+"""
+Respostas JSON rápidas para listagens
+
+O FastAPI valida de novo o retorno contra o response_model (e os objetos
+montados na rota passam por model_dump + validação + serialização). As
+listagens devolvem a Response pronta: uma única validação pelo TypeAdapter
+do schema (direto dos objetos ORM) e o JSON gerado em Rust pelo pydantic.
+O response_model continua na rota para a documentação.
+
+?format=compact devolve os nomes dos campos uma vez e as linhas como arrays:
+    {"campos": ["id", "nome"], "linhas": [[1, "Ana"], [2, "Bruno"]]}
+
+?fields=id,nome (sparse fieldset) limita a resposta a parte do schema; as
+rotas usam `campos()` também para selecionar só essas colunas no banco.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import List
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import ConfigDict, create_model
+
+
+FORMATO_COMPACTO = "compact"
+
+
+def _padrao(valor):
+    # Mesmo formato do pydantic no modo JSON: Decimal como string
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+@lru_cache(maxsize=None)
+def adaptador(modelo):
+    from pydantic import TypeAdapter
+    return TypeAdapter(modelo)
+
+
+def campos(modelo, fields=None):
+    """Campos do schema pedidos em ?fields= (todos se vazio), na ordem do schema"""
+    if not fields:
+        return list(modelo.model_fields)
+    pedidos = {c.strip() for c in fields.split(",") if c.strip()}
+    invalidos = sorted(pedidos - set(modelo.model_fields))
+    if invalidos:
+        raise HTTPException(status_code=400, detail=f"Campos inválidos: {', '.join(invalidos)}")
+    return [c for c in modelo.model_fields if c in pedidos]
+
+
+@lru_cache(maxsize=None)
+def modelo_parcial(modelo, nomes):
+    """Schema só com os campos `nomes` (tupla), mesmos tipos e defaults"""
+    if list(nomes) == list(modelo.model_fields):
+        return modelo
+    return create_model(
+        f"{modelo.__name__}Parcial",
+        __config__=ConfigDict(from_attributes=True),
+        **{c: (modelo.model_fields[c].annotation, modelo.model_fields[c]) for c in nomes}
+    )
+
+
+def lista(modelo, itens, formato=None, validar=True, nomes=None):
+    """
+    Response JSON de uma lista de `modelo` (ou só dos campos `nomes`). Com
+    `validar=False` os itens já são instâncias do modelo e só são serializados.
+    """
+    if nomes is not None:
+        modelo = modelo_parcial(modelo, tuple(nomes))
+    adaptador_lista = adaptador(List[modelo])
+    if validar:
+        itens = adaptador_lista.validate_python(itens, from_attributes=True)
+    if formato != FORMATO_COMPACTO:
+        return Response(adaptador_lista.dump_json(itens), media_type="application/json")
+
+    # Valores lidos direto dos modelos validados; o orjson cuida de datas
+    campos = list(modelo.model_fields)
+    corpo = {"campos": campos, "linhas": [[getattr(item, c) for c in campos] for item in itens]}
+    return Response(orjson.dumps(corpo, default=_padrao), media_type="application/json")
@@ -6,7 +6,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import definir_usuario, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -85,6 +85,8 @@ async def get_current_user(
             detail="Usuário inativo"
         )
 
+    # Read-your-writes da réplica: commits desta requisição marcam o usuário
+    definir_usuario(user.id)
     return user
 
 
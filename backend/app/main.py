@@ -1,19 +1,25 @@
-from fastapi import FastAPI
+import hmac
+import ipaddress
+import time
+
+# Início do import da aplicação (tempo de cold start reportado no boot)
+INICIO_IMPORTS = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core import aquecimento, inicializacao, metricas
+from app.core.instrumentacao import MiddlewareInstrumentacao
+from app.core.profiling import MiddlewareProfiling
 from app.api.v1.router import api_router
-# Importar todos os models para garantir que sejam registrados
-from app.models import *  # noqa: F401, F403
-
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
+# Registra todos os models no Base.metadata (create_all e relacionamentos por nome).
+# Só declarações SQLAlchemy: os motores de PDF (ReportLab, WeasyPrint, pypdf) e o
+# NumPy são importados na primeira renderização/cálculo, fora do cold start.
+import app.models  # noqa: F401
 
 def seed_initial_data():
     """Cria dados iniciais no banco (perfis, permissões, admin)"""
@@ -75,9 +81,11 @@ def seed_initial_data():
             db.commit()
             print("✓ Admin criado: ivis_ribeiro@hotmail.com")
 
+        return True
     except Exception as e:
         print(f"Erro no seed: {e}")
         db.rollback()
+        return False
     finally:
         db.close()
 
@@ -85,12 +93,33 @@ def seed_initial_data():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup e shutdown events"""
-    # Startup: criar tabelas do banco
-    Base.metadata.create_all(bind=engine)
-    # Seed dados iniciais
-    seed_initial_data()
+    inicio = time.perf_counter()
+    inicializacao.registrar_etapa("imports", inicio - INICIO_IMPORTS)
+    # Startup: schema e seed só no primeiro worker (trava), pulados se já em dia
+    schema, semeado = inicializacao.inicializar(engine, Base.metadata, seed_initial_data)
+    # Workers da fila de jobs (JOB_WORKERS=0 para rodá-los separadamente;
+    # no app.servidor quem os inicia é o mestre e aqui não faz nada)
+    from app.services import job_worker
+    job_worker.iniciar()
+    # Caches e pool prontos antes de /ready (no prefork a parte em memória já veio do mestre)
+    aquecido = aquecimento.aquecer()
+    inicializacao.registrar_etapa("total", time.perf_counter() - INICIO_IMPORTS)
+    inicializacao.marcar_pronto()
+    if settings.METRICAS_HABILITADAS and not settings.METRICAS_TOKEN and not settings.DEBUG:
+        print("Aviso: METRICAS_TOKEN não definido; /metrics só responde a clientes locais")
+    etapas = inicializacao.etapas()
+    print(
+        f"Startup em {etapas['total']:.0f}ms (imports {etapas['imports']:.0f}ms, "
+        f"trava {etapas['trava']:.0f}ms, schema {etapas['schema']:.0f}ms: {schema}, "
+        f"seed {etapas['seed']:.0f}ms: {'executado' if semeado else 'já aplicado'}, "
+        f"aquecimento {aquecido:.0f}ms)"
+    )
     yield
-    # Shutdown: nada a fazer
+    # Shutdown: /ready volta a 503; encerra os workers de jobs e o pool de PDFs
+    inicializacao.marcar_pronto(False)
+    from app.services import pdf_pool
+    job_worker.encerrar()
+    pdf_pool.encerrar()
 
 
 # Cria aplicação FastAPI
@@ -100,13 +129,11 @@ app = FastAPI(
     description="Sistema CRM para gestão de consórcios",
     docs_url="/docs",
     redoc_url="/redoc",
+    # orjson no lugar do json da stdlib em todas as respostas
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # CORS - permite origens configuradas + todas em desenvolvimento
 cors_origins = settings.cors_origins_list if not settings.DEBUG else ["*"]
 app.add_middleware(
@@ -118,6 +145,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Tempo/consultas por requisição: header Server-Timing e histogramas de /metrics
+app.add_middleware(MiddlewareInstrumentacao)
+
+# Profiling de uma requisição sob demanda (X-Profile / ?_profile=, só administradores)
+app.add_middleware(MiddlewareProfiling)
+
 # Inclui rotas da API
 app.include_router(api_router)
 
@@ -138,6 +171,40 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Prontidão: 503 até o fim do startup (schema/seed) e durante o encerramento"""
+    if not inicializacao.pronto():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready", "startup_ms": inicializacao.etapas()}
+
+
+def _cliente_local(request: Request):
+    # Atrás de proxy o uvicorn (proxy_headers) já resolve o IP real do cliente
+    host = request.client.host if request.client else ""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Métricas no formato do Prometheus (por processo). Com METRICAS_TOKEN exige
+    "Authorization: Bearer <token>"; sem ele, só atende clientes locais.
+    """
+    if not settings.METRICAS_HABILITADAS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICAS_TOKEN:
+        enviado = request.headers.get("authorization", "")
+        if not hmac.compare_digest(enviado.encode(), f"Bearer {settings.METRICAS_TOKEN}".encode()):
+            raise HTTPException(status_code=401, detail="Token de métricas inválido")
+    elif not _cliente_local(request):
+        raise HTTPException(status_code=403, detail="Métricas só para clientes locais sem METRICAS_TOKEN")
+    return PlainTextResponse(metricas.exportar(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/debug/db")
 async def debug_db():
     """Debug endpoint para verificar estado do banco"""
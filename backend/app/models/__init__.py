@@ -12,6 +12,8 @@ from app.models.configuracao import Configuracao
 from app.models.representante import Representante
 from app.models.consultor import Consultor
 from app.models.permissao import Permissao, PerfilPermissao
+from app.models.job import Job
+from app.models.documento_armazenado import DocumentoArmazenado
 
 __all__ = [
     "Perfil",
@@ -29,4 +31,6 @@ __all__ = [
     "Consultor",
     "Permissao",
     "PerfilPermissao",
+    "Job",
+    "DocumentoArmazenado",
 ]
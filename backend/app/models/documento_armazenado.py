@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DocumentoArmazenado(Base):
+    """PDF gerado e persistido no armazenamento de documentos (conteúdo deduplicado por hash)"""
+    __tablename__ = "documentos_armazenados"
+    __table_args__ = (
+        UniqueConstraint("beneficio_id", "tipo", "versao", name="uq_documento_beneficio_tipo_versao"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    beneficio_id = Column(Integer, ForeignKey("beneficios.id"), nullable=False, index=True)
+    beneficio = relationship("Beneficio")
+
+    tipo = Column(String(30), nullable=False)  # contrato, termo
+    status = Column(String(30), nullable=False)  # status do benefício quando o documento foi gerado
+
+    # Hash dos dados de entrada (sem campos de workflow): muda quando o benefício muda
+    versao = Column(String(64), nullable=False)
+
+    # Hash do conteúdo: documentos idênticos compartilham o mesmo objeto no backend
+    sha256 = Column(String(64), nullable=False, index=True)
+    tamanho = Column(Integer, nullable=False)
+    nome_arquivo = Column(String(255), nullable=False)
+    media_type = Column(String(100), default="application/pdf", nullable=False)
+
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=True)
+    usuario = relationship("Usuario")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<DocumentoArmazenado {self.id} - {self.tipo} beneficio={self.beneficio_id}>"
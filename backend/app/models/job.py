@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Job(Base):
+    """Tarefa em segundo plano (fila local processada pelos workers de jobs)"""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    tipo = Column(String(50), nullable=False)  # documento, lote_documentos
+    parametros = Column(Text, nullable=True)  # JSON
+
+    # pendente, executando, concluido, erro, expirado
+    status = Column(String(20), default="pendente", nullable=False, index=True)
+
+    # Retentativas com backoff: o job só é reivindicado a partir de executar_apos
+    tentativas = Column(Integer, default=0, nullable=False)
+    max_tentativas = Column(Integer, default=3, nullable=False)
+    executar_apos = Column(DateTime(timezone=True), nullable=False, index=True)
+    worker = Column(String(100), nullable=True)
+    erro = Column(Text, nullable=True)
+
+    # Resultado em disco local
+    arquivo_path = Column(String(500), nullable=True)
+    arquivo_nome = Column(String(255), nullable=True)
+    media_type = Column(String(100), nullable=True)
+    tamanho = Column(Integer, nullable=True)
+
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=True, index=True)
+    usuario = relationship("Usuario")
+
+    iniciado_em = Column(DateTime(timezone=True), nullable=True)
+    # Renovado pelo worker durante a execução; parado há muito tempo = órfão
+    batimento_em = Column(DateTime(timezone=True), nullable=True)
+    concluido_em = Column(DateTime(timezone=True), nullable=True)
+    expira_em = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<Job {self.id} - {self.tipo} ({self.status})>"
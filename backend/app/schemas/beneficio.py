@@ -270,3 +270,36 @@ class BeneficioFaixaResponse(BeneficioFaixaBase):
 
     class Config:
         from_attributes = True
+
+
+# ==================== CRONOGRAMA ====================
+
+CenarioCorrecao = Literal["sem_correcao", "media", "ultimo_ano", "historico"]
+IndiceCorrecao = Literal["INCC", "IPCA"]
+
+
+class CronogramaParcela(BaseModel):
+    numero: int
+    fundo_comum: float
+    administracao: float
+    reserva: float
+    seguro: float
+    valor_parcela: float  # soma dos componentes
+    valor_informado: Optional[float] = None  # valor_parcela cadastrado na faixa
+    fator_correcao: float
+    total_acumulado: float
+
+
+class CronogramaResponse(BaseModel):
+    beneficio_id: int
+    prazo: int
+    indice_correcao: str
+    cenario: CenarioCorrecao
+    usa_faixas: bool
+    parcelas: list[CronogramaParcela]
+    total_fundo_comum: float
+    total_administracao: float
+    total_reserva: float
+    total_seguro: float
+    total_pago: float
+    parcelas_divergentes: list[int] = []  # valor informado difere da soma em mais de 1%
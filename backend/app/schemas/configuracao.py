@@ -56,3 +56,7 @@ class SistemaSettings(BaseModel):
     session_timeout_minutes: Optional[int] = 30
     enable_notifications: Optional[bool] = True
     default_currency: Optional[str] = "BRL"
+    # Requisições por minuto (0 = sem limite): login por IP/e-mail, demais por usuário
+    rate_limit_login_per_minute: Optional[int] = 10
+    rate_limit_reports_per_minute: Optional[int] = 30
+    rate_limit_exports_per_minute: Optional[int] = 5
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Optional, Literal
+from datetime import datetime
+
+from app.schemas.relatorio import LoteDocumentosRequest
+
+TipoJob = Literal["documento", "lote_documentos"]
+TipoDocumento = Literal["contrato", "termo", "ficha", "planejamento"]
+StatusJob = Literal["pendente", "executando", "concluido", "erro", "expirado"]
+
+
+class JobCreate(BaseModel):
+    tipo: TipoJob
+    # tipo "documento": contrato/termo usam o id do benefício; ficha/planejamento o do cliente
+    documento: Optional[TipoDocumento] = None
+    id: Optional[int] = None
+    # tipo "lote_documentos": mesmos filtros de POST /relatorios/lote
+    filtros: Optional[LoteDocumentosRequest] = None
+
+
+class JobResponse(BaseModel):
+    id: int
+    tipo: str
+    status: StatusJob
+    tentativas: int
+    max_tentativas: int
+    erro: Optional[str] = None
+    arquivo_nome: Optional[str] = None
+    media_type: Optional[str] = None
+    tamanho: Optional[int] = None
+    executar_apos: Optional[datetime] = None
+    iniciado_em: Optional[datetime] = None
+    concluido_em: Optional[datetime] = None
+    expira_em: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Literal
+from datetime import datetime
+
+from app.schemas.beneficio import StatusBeneficio
+
+TipoDocumentoLote = Literal["contrato", "termo"]
+
+
+class LoteDocumentosRequest(BaseModel):
+    # Se informado, gera exatamente estes benefícios (os filtros de status/data são ignorados)
+    beneficio_ids: Optional[list[int]] = None
+    status: list[StatusBeneficio] = ["contrato_gerado", "cadastrado"]
+    atualizado_de: Optional[datetime] = None
+    atualizado_ate: Optional[datetime] = None
+    documentos: list[TipoDocumentoLote] = ["contrato", "termo"]
+    limite: int = Field(500, ge=1, le=5000)
+
+
+class DocumentoArmazenadoResponse(BaseModel):
+    id: int
+    beneficio_id: int
+    tipo: str
+    status: str
+    versao: str
+    sha256: str
+    tamanho: int
+    nome_arquivo: str
+    media_type: str
+    usuario_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
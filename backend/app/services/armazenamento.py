@@ -0,0 +1,220 @@
+"""
+Armazenamento de documentos gerados
+Contratos e termos são persistidos uma vez por versão do benefício e servidos
+do armazenamento nas próximas requisições, sem nova renderização.
+
+- Backends plugáveis: pasta local (padrão) ou serviço compatível com S3
+- Conteúdo endereçado pelo SHA-256: PDFs idênticos ocupam um único objeto
+- Metadados em documentos_armazenados (benefício, tipo, status, versão)
+"""
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from types import SimpleNamespace
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.models.documento_armazenado import DocumentoArmazenado
+
+
+BLOCO_LEITURA = 64 * 1024
+
+# Campos que mudam com o workflow sem alterar o conteúdo do documento
+CAMPOS_IGNORADOS = {
+    "status", "observacoes", "motivo_rejeicao", "motivo_cancelamento",
+    "data_proposta", "data_aceite", "data_rejeicao", "data_contrato",
+    "data_assinatura_contrato", "data_cadastro_administradora", "data_termo",
+    "data_assinatura_termo", "data_ativacao", "data_cancelamento",
+    "created_at", "updated_at",
+    # Usuários/representantes: mudam a cada login sem mudar o que é impresso
+    "last_login", "senha_hash",
+}
+
+
+# ===================== BACKENDS =====================
+
+class BackendArmazenamento(ABC):
+    """Interface dos backends: objetos binários endereçados por chave"""
+
+    @abstractmethod
+    def existe(self, chave):
+        ...
+
+    @abstractmethod
+    def salvar(self, chave, dados):
+        ...
+
+    @abstractmethod
+    def ler(self, chave, inicio=0, fim=None):
+        """Gera os bytes de [inicio, fim] (inclusive); fim=None lê até o final"""
+
+    @abstractmethod
+    def remover(self, chave):
+        ...
+
+
+class SistemaArquivos(BackendArmazenamento):
+    def __init__(self, raiz):
+        self.raiz = os.path.abspath(raiz)
+
+    def _caminho(self, chave):
+        return os.path.join(self.raiz, chave)
+
+    def existe(self, chave):
+        return os.path.exists(self._caminho(chave))
+
+    def salvar(self, chave, dados):
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(dados)
+        os.replace(temporario, caminho)
+
+    def ler(self, chave, inicio=0, fim=None):
+        with open(self._caminho(chave), "rb") as f:
+            f.seek(inicio)
+            restante = None if fim is None else fim - inicio + 1
+            while restante is None or restante > 0:
+                bloco = f.read(BLOCO_LEITURA if restante is None else min(BLOCO_LEITURA, restante))
+                if not bloco:
+                    break
+                if restante is not None:
+                    restante -= len(bloco)
+                yield bloco
+
+    def remover(self, chave):
+        try:
+            os.remove(self._caminho(chave))
+        except FileNotFoundError:
+            pass
+
+
+class S3(BackendArmazenamento):
+    """Serviço compatível com S3 (AWS, MinIO, etc.); boto3 é importado só quando usado"""
+
+    def __init__(self, bucket, endpoint_url=None, access_key=None, secret_key=None):
+        import boto3
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+        )
+
+    def existe(self, chave):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=chave)
+            return True
+        except ClientError:
+            return False
+
+    def salvar(self, chave, dados):
+        self.client.put_object(Bucket=self.bucket, Key=chave, Body=dados, ContentType="application/pdf")
+
+    def ler(self, chave, inicio=0, fim=None):
+        intervalo = f"bytes={inicio}-{'' if fim is None else fim}"
+        corpo = self.client.get_object(Bucket=self.bucket, Key=chave, Range=intervalo)["Body"]
+        yield from corpo.iter_chunks(BLOCO_LEITURA)
+
+    def remover(self, chave):
+        self.client.delete_object(Bucket=self.bucket, Key=chave)
+
+
+@lru_cache()
+def backend():
+    if settings.DOCUMENTOS_BACKEND == "s3":
+        return S3(
+            settings.DOCUMENTOS_S3_BUCKET,
+            endpoint_url=settings.DOCUMENTOS_S3_ENDPOINT,
+            access_key=settings.DOCUMENTOS_S3_ACCESS_KEY,
+            secret_key=settings.DOCUMENTOS_S3_SECRET_KEY,
+        )
+    return SistemaArquivos(settings.DOCUMENTOS_DIR)
+
+
+# ===================== DOCUMENTOS =====================
+
+def _normalizar(valor):
+    if isinstance(valor, SimpleNamespace):
+        return sorted((k, _normalizar(v)) for k, v in vars(valor).items() if k not in CAMPOS_IGNORADOS)
+    if isinstance(valor, dict):
+        return sorted((k, _normalizar(v)) for k, v in valor.items())
+    if isinstance(valor, list):
+        return [_normalizar(v) for v in valor]
+    return valor
+
+
+def versao(tipo, dados):
+    """Versão do documento: hash dos dados de entrada sem os campos de workflow"""
+    return hashlib.sha256(f"{tipo}|{_normalizar(dados)!r}".encode("utf-8")).hexdigest()
+
+
+def chave_conteudo(sha256):
+    return f"{sha256[:2]}/{sha256}.pdf"
+
+
+def buscar(db, beneficio_id, tipo, versao_doc):
+    return db.query(DocumentoArmazenado).filter(
+        DocumentoArmazenado.beneficio_id == beneficio_id,
+        DocumentoArmazenado.tipo == tipo,
+        DocumentoArmazenado.versao == versao_doc,
+    ).first()
+
+
+def armazenar(db, beneficio_id, tipo, versao_doc, status, pdf_bytes, nome_arquivo, usuario_id=None):
+    """Grava o conteúdo (se ainda não existir) e registra os metadados"""
+    sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+    chave = chave_conteudo(sha256)
+    if not backend().existe(chave):
+        backend().salvar(chave, pdf_bytes)
+
+    documento = DocumentoArmazenado(
+        beneficio_id=beneficio_id,
+        tipo=tipo,
+        status=status,
+        versao=versao_doc,
+        sha256=sha256,
+        tamanho=len(pdf_bytes),
+        nome_arquivo=nome_arquivo,
+        usuario_id=usuario_id,
+    )
+    db.add(documento)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Outra requisição armazenou a mesma versão ao mesmo tempo
+        db.rollback()
+        return buscar(db, beneficio_id, tipo, versao_doc)
+    db.refresh(documento)
+    return documento
+
+
+def garantir(db, tipo, beneficio_id, dados, usuario_id=None, renderizar=None):
+    """
+    Documento armazenado da versão atual do benefício; renderiza (via cache de
+    PDFs, uma única vez por chave) e armazena apenas se ainda não existir.
+    """
+    from app.services import pdf_cache
+
+    versao_doc = versao(tipo, dados)
+    documento = buscar(db, beneficio_id, tipo, versao_doc)
+    if documento:
+        return documento
+
+    caminho, nome_arquivo = pdf_cache.garantir(tipo, dados, renderizar=renderizar)
+    with open(caminho, "rb") as f:
+        pdf_bytes = f.read()
+    return armazenar(
+        db, beneficio_id, tipo, versao_doc, dados["beneficio"].status,
+        pdf_bytes, nome_arquivo, usuario_id
+    )
+
+
+def ler(documento, inicio=0, fim=None):
+    return backend().ler(chave_conteudo(documento.sha256), inicio, fim)
@@ -0,0 +1,263 @@
+"""
+Calculadora de cronograma de parcelas
+Expande as faixas do benefício (BeneficioFaixa) em parcelas mês a mês usando NumPy.
+Funciona em lote: milhares de benefícios com prazo de até 240 meses por chamada.
+
+O valor de cada parcela é a soma dos componentes (percentuais × crédito), o
+que mantém total_pago igual à soma dos totais. O valor_parcela cadastrado na
+faixa vira `valor_informado`, e as parcelas em que ele diverge da soma em mais
+de TOLERANCIA_DIVERGENCIA são listadas em `parcelas_divergentes`.
+"""
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+
+COMPONENTES = ("fundo_comum", "administracao", "reserva", "seguro")
+CENARIOS = ("sem_correcao", "media", "ultimo_ano", "historico")
+PRAZO_MAXIMO = 240
+TOLERANCIA_DIVERGENCIA = 0.01  # fração do valor calculado (1%)
+
+INDICES_PATH = os.path.join(os.path.dirname(__file__), '..', 'static', 'data', 'indices_correcao.json')
+
+
+# ===================== ÍNDICES DE CORREÇÃO =====================
+
+@lru_cache()
+def carregar_indices():
+    """Carrega a série local de índices (variação anual em fração, ordenada por ano)"""
+    with open(INDICES_PATH, encoding='utf-8') as f:
+        dados = json.load(f)
+
+    indices = {}
+    for nome, serie in dados.items():
+        anos = sorted(serie["anual"])
+        indices[nome.upper()] = np.array([serie["anual"][a] for a in anos], dtype=np.float64) / 100
+    return indices
+
+
+def taxas_reajuste(indice, cenario, anos):
+    """
+    Taxa de reajuste aplicada em cada ano do plano.
+    O primeiro ano nunca é reajustado; o reajuste acontece a cada 12 parcelas.
+    """
+    taxas = np.zeros(anos, dtype=np.float64)
+    if cenario == "sem_correcao" or anos <= 1:
+        return taxas
+
+    serie = carregar_indices().get((indice or "").upper())
+    if serie is None:
+        raise ValueError(f"Índice de correção desconhecido: {indice}")
+
+    if cenario == "media":
+        taxas[1:] = np.prod(1 + serie) ** (1 / len(serie)) - 1
+    elif cenario == "ultimo_ano":
+        taxas[1:] = serie[-1]
+    elif cenario == "historico":
+        # Repete a série histórica ciclicamente a partir do primeiro ano disponível
+        taxas[1:] = np.resize(serie, anos - 1)
+    else:
+        raise ValueError(f"Cenário de correção inválido: {cenario}")
+
+    return taxas
+
+
+def fatores_correcao(indice, cenario, prazo):
+    """Fator acumulado de correção para cada parcela (1..prazo)"""
+    anos = (prazo + 11) // 12
+    fator_ano = np.cumprod(1 + taxas_reajuste(indice, cenario, anos))
+    return np.repeat(fator_ano, 12)[:prazo]
+
+
+# ===================== NÚCLEO VETORIZADO =====================
+
+def expandir_faixas(n_beneficios, prazo, beneficio_idx, inicio, fim, valores):
+    """
+    Expande faixas em formato colunar para uma matriz (n_beneficios, prazo, m).
+
+    Cada faixa soma `valores[k]` em todas as parcelas de `inicio[k]` a `fim[k]`
+    (inclusive) do benefício `beneficio_idx[k]`. Usa soma de diferenças + cumsum,
+    então o custo é O(faixas + n_beneficios * prazo) sem laços em Python.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    if valores.ndim == 1:
+        valores = valores[:, None]
+
+    inicio = np.clip(np.asarray(inicio, dtype=np.int64), 1, prazo + 1)
+    fim = np.clip(np.asarray(fim, dtype=np.int64), 0, prazo)
+    beneficio_idx = np.asarray(beneficio_idx, dtype=np.int64)
+    validas = fim >= inicio
+
+    delta = np.zeros((n_beneficios, prazo + 1, valores.shape[1]), dtype=np.float64)
+    np.add.at(delta, (beneficio_idx[validas], inicio[validas] - 1), valores[validas])
+    np.add.at(delta, (beneficio_idx[validas], fim[validas]), -valores[validas])
+
+    return np.cumsum(delta[:, :prazo], axis=1)
+
+
+def calcular_cronogramas(creditos, prazos, beneficio_idx, inicio, fim, percentuais, valores_parcela, fatores=None):
+    """
+    Calcula cronogramas de vários benefícios de uma só vez.
+
+    - creditos, prazos: arrays (n,) por benefício
+    - beneficio_idx, inicio, fim, valores_parcela: arrays (k,) por faixa
+    - percentuais: array (k, 4) com % mensais de fundo comum, administração, reserva e seguro
+    - fatores: None, (prazo,) ou (n, prazo) com o fator de correção por parcela
+
+    Retorna dict com matrizes (n, prazo): componentes em R$ (n, prazo, 4),
+    valor_parcela (soma dos componentes), valor_informado (das faixas, 0 se
+    não cadastrado), divergente, acumulado e a máscara de parcelas válidas.
+    """
+    creditos = np.asarray(creditos, dtype=np.float64)
+    prazos = np.minimum(np.asarray(prazos, dtype=np.int64), PRAZO_MAXIMO)
+    n = len(creditos)
+    prazo = int(prazos.max()) if n else 0
+
+    valores = np.column_stack([
+        np.asarray(percentuais, dtype=np.float64).reshape(-1, len(COMPONENTES)) / 100,
+        np.asarray(valores_parcela, dtype=np.float64),
+    ])
+    expandido = expandir_faixas(n, prazo, beneficio_idx, inicio, fim, valores)
+
+    mascara = np.arange(1, prazo + 1)[None, :] <= prazos[:, None]
+    if fatores is None:
+        fatores = np.ones((n, prazo), dtype=np.float64)
+    else:
+        fatores = np.broadcast_to(np.asarray(fatores, dtype=np.float64)[..., :prazo], (n, prazo))
+    fatores = np.where(mascara, fatores, 0.0)
+
+    componentes = expandido[:, :, :len(COMPONENTES)] * creditos[:, None, None] * fatores[:, :, None]
+    valor_parcela = componentes.sum(axis=2)
+    valor_informado = expandido[:, :, len(COMPONENTES)] * fatores
+    divergente = (valor_informado > 0) & (
+        np.abs(valor_informado - valor_parcela) > TOLERANCIA_DIVERGENCIA * np.abs(valor_parcela)
+    )
+
+    return {
+        "componentes": componentes,
+        "valor_parcela": valor_parcela,
+        "valor_informado": valor_informado,
+        "divergente": divergente,
+        "acumulado": np.cumsum(valor_parcela, axis=1),
+        "fatores": fatores,
+        "mascara": mascara,
+    }
+
+
+# ===================== ADAPTADORES (ORM / objetos) =====================
+
+def faixas_padrao(beneficio):
+    """
+    Faixa única equivalente aos dados do benefício quando não há faixas cadastradas:
+    fundo comum, taxa de administração e fundo de reserva distribuídos igualmente
+    pelo prazo e seguro prestamista como percentual mensal.
+    """
+    prazo = int(beneficio.prazo_grupo or 0)
+    if prazo <= 0:
+        return []
+    return [{
+        "parcela_inicio": 1,
+        "parcela_fim": prazo,
+        "perc_fundo_comum": 100 / prazo,
+        "perc_administracao": float(beneficio.taxa_administracao or 0) / prazo,
+        "perc_reserva": float(beneficio.fundo_reserva or 0) / prazo,
+        "perc_seguro": float(beneficio.seguro_prestamista or 0),
+        "valor_parcela": float(beneficio.parcela or 0),
+    }]
+
+
+def _campo(faixa, nome):
+    return faixa[nome] if isinstance(faixa, dict) else getattr(faixa, nome)
+
+
+def calcular_lote(beneficios, faixas_por_beneficio, cenario="sem_correcao", indice=None):
+    """
+    Calcula o cronograma de uma lista de benefícios.
+
+    `faixas_por_beneficio` mapeia beneficio.id -> lista de faixas (ORM ou dict);
+    benefícios sem faixas usam `faixas_padrao`. O índice de correção de cada
+    benefício é o informado ou o `indice_correcao` do próprio benefício.
+    """
+    creditos, prazos = [], []
+    beneficio_idx, inicio, fim, percentuais, valores_parcela = [], [], [], [], []
+
+    for i, beneficio in enumerate(beneficios):
+        creditos.append(float(beneficio.valor_credito or 0))
+        prazos.append(int(beneficio.prazo_grupo or 0))
+        faixas = faixas_por_beneficio.get(beneficio.id) or faixas_padrao(beneficio)
+        for faixa in faixas:
+            beneficio_idx.append(i)
+            inicio.append(int(_campo(faixa, "parcela_inicio")))
+            fim.append(int(_campo(faixa, "parcela_fim")))
+            percentuais.append([
+                float(_campo(faixa, "perc_fundo_comum") or 0),
+                float(_campo(faixa, "perc_administracao") or 0),
+                float(_campo(faixa, "perc_reserva") or 0),
+                float(_campo(faixa, "perc_seguro") or 0),
+            ])
+            valores_parcela.append(float(_campo(faixa, "valor_parcela") or 0))
+
+    prazo = min(max(prazos, default=0), PRAZO_MAXIMO)
+    fatores = None
+    if cenario != "sem_correcao" and prazo:
+        # Um vetor de fatores por índice distinto, depois replicado por benefício
+        cache = {}
+        linhas = []
+        for beneficio in beneficios:
+            nome = (indice or beneficio.indice_correcao or "INCC").upper()
+            if nome not in cache:
+                cache[nome] = fatores_correcao(nome, cenario, prazo)
+            linhas.append(cache[nome])
+        fatores = np.vstack(linhas)
+
+    return calcular_cronogramas(
+        creditos, prazos, beneficio_idx, inicio, fim,
+        np.array(percentuais, dtype=np.float64).reshape(-1, len(COMPONENTES)),
+        valores_parcela, fatores
+    )
+
+
+def montar_cronograma(beneficio, faixas, cenario="sem_correcao", indice=None):
+    """Cronograma de um benefício no formato usado pela API e pelos PDFs"""
+    resultado = calcular_lote([beneficio], {beneficio.id: faixas}, cenario=cenario, indice=indice)
+    prazo = min(int(beneficio.prazo_grupo or 0), PRAZO_MAXIMO)
+
+    componentes = np.round(resultado["componentes"][0, :prazo], 2)
+    valor_parcela = np.round(resultado["valor_parcela"][0, :prazo], 2)
+    valor_informado = np.round(resultado["valor_informado"][0, :prazo], 2)
+    divergente = resultado["divergente"][0, :prazo]
+    acumulado = np.round(resultado["acumulado"][0, :prazo], 2)
+    fatores = resultado["fatores"][0, :prazo]
+
+    parcelas = [
+        {
+            "numero": n + 1,
+            "fundo_comum": float(componentes[n, 0]),
+            "administracao": float(componentes[n, 1]),
+            "reserva": float(componentes[n, 2]),
+            "seguro": float(componentes[n, 3]),
+            "valor_parcela": float(valor_parcela[n]),
+            "valor_informado": float(valor_informado[n]) if valor_informado[n] else None,
+            "fator_correcao": round(float(fatores[n]), 6),
+            "total_acumulado": float(acumulado[n]),
+        }
+        for n in range(prazo)
+    ]
+    totais = componentes.sum(axis=0)
+
+    return {
+        "beneficio_id": beneficio.id,
+        "prazo": prazo,
+        "indice_correcao": (indice or beneficio.indice_correcao or "INCC").upper(),
+        "cenario": cenario,
+        "usa_faixas": bool(faixas),
+        "parcelas": parcelas,
+        "total_fundo_comum": round(float(totais[0]), 2),
+        "total_administracao": round(float(totais[1]), 2),
+        "total_reserva": round(float(totais[2]), 2),
+        "total_seguro": round(float(totais[3]), 2),
+        "total_pago": float(acumulado[-1]) if prazo else 0.0,
+        "parcelas_divergentes": [int(n) + 1 for n in np.flatnonzero(divergente)],
+    }
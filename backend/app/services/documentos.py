@@ -0,0 +1,276 @@
+"""
+Carregamento de dados para os documentos PDF
+Reúne as consultas feitas pelas rotas de relatórios e converte os objetos ORM
+em snapshots simples (picklable) para renderização nos processos do pool.
+"""
+from types import SimpleNamespace
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload
+
+from app.models.usuario import Usuario
+from app.models.cliente import Cliente
+from app.models.beneficio import Beneficio
+from app.models.tabela_credito import TabelaCredito
+from app.models.beneficio_faixa import BeneficioFaixa
+from app.models.representante import Representante
+
+
+TIPOS_LOTE = ("contrato", "termo")
+TIPOS_DOSSIE = ("ficha", "planejamento", "contrato", "termo")
+LOTE_BLOCO = 100
+
+
+# Colunas do usuário impressas nos documentos: login, senha e datas ficam de
+# fora do snapshot (e da versão do documento armazenado)
+CAMPOS_USUARIO = ("id", "nome", "email", "telefone")
+
+
+def snapshot(obj, campos=None, **extras):
+    """
+    Copia as colunas de um objeto ORM (ou só `campos`) para um SimpleNamespace
+    desacoplado da sessão
+    """
+    if obj is None:
+        return obj
+    if isinstance(obj, SimpleNamespace):
+        if campos is None:
+            return obj
+        return SimpleNamespace(**{k: v for k, v in vars(obj).items() if k in campos})
+    dados = {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs
+             if campos is None or attr.key in campos}
+    dados.update(extras)
+    return SimpleNamespace(**dados)
+
+
+def dados_contrato(beneficio, cliente, representante=None, empresa=None, tabela_credito=None):
+    """Argumentos do ContratoVendaPDFGenerator"""
+    return {
+        "cliente": snapshot(cliente),
+        "beneficio": snapshot(beneficio, tabela_credito=snapshot(tabela_credito)),
+        "representante": snapshot(representante),
+        "empresa": snapshot(empresa),
+    }
+
+
+def dados_termo(beneficio, cliente, usuario=None, empresa=None, representante=None, faixas=None):
+    """Argumentos do TermoAdesaoPDFGenerator"""
+    return {
+        "cliente": snapshot(cliente),
+        "beneficio": snapshot(beneficio),
+        "usuario": snapshot(usuario, CAMPOS_USUARIO),
+        "empresa": snapshot(empresa),
+        "representante": snapshot(representante),
+        "faixas": [snapshot(f) for f in faixas or []],
+    }
+
+
+def dados_ficha(cliente, representante=None):
+    """Argumentos do FichaClientePDFGenerator"""
+    return {
+        "cliente": snapshot(cliente),
+        "representante": snapshot(representante, CAMPOS_USUARIO),
+    }
+
+
+def dados_planejamento(cliente, tabelas, beneficio=None):
+    """Argumentos do ClientePDFGenerator"""
+    dados = {
+        "cliente": snapshot(cliente),
+        "tabelas_simulacao": [snapshot(t) for t in tabelas],
+    }
+    if beneficio is not None:
+        dados["beneficio"] = snapshot(beneficio)
+    return dados
+
+
+def _tabelas_planejamento(db, cliente):
+    """Tabelas da simulação do planejamento (mesma regra da rota /cliente/{id}/pdf)"""
+    query = db.query(TabelaCredito).filter(TabelaCredito.ativo == True)
+    if cliente.parcela_maxima:
+        query = query.filter(TabelaCredito.parcela <= cliente.parcela_maxima)
+    return query.order_by(TabelaCredito.valor_credito).limit(4).all()
+
+
+def _representantes_por_unidade(db, unidade_ids):
+    """Primeiro representante ativo de cada unidade + fallback (primeiro ativo geral)"""
+    por_unidade = {}
+    if unidade_ids:
+        for rep in db.query(Representante).filter(
+            Representante.unidade_id.in_(unidade_ids),
+            Representante.ativo == True
+        ).order_by(Representante.id).all():
+            por_unidade.setdefault(rep.unidade_id, rep)
+
+    fallback = None
+    if len(por_unidade) < len(unidade_ids):
+        fallback = db.query(Representante).filter(Representante.ativo == True).order_by(Representante.id).first()
+    return por_unidade, fallback
+
+
+def _faixas_por_beneficio(db, beneficio_ids):
+    faixas = {}
+    for f in db.query(BeneficioFaixa).filter(
+        BeneficioFaixa.beneficio_id.in_(beneficio_ids)
+    ).order_by(BeneficioFaixa.beneficio_id, BeneficioFaixa.parcela_inicio).all():
+        faixas.setdefault(f.beneficio_id, []).append(f)
+    return faixas
+
+
+def _ids_vendedor(beneficio):
+    """Usuários que podem assinar o termo como vendedor, em ordem de preferência"""
+    return (beneficio.representante_id, beneficio.cliente.representante_id, beneficio.consultor_id)
+
+
+def _vendedor(beneficio, usuarios):
+    """
+    Vendedor do termo resolvido pelo benefício (representante, quem atende o
+    cliente, consultor). Quem faz a requisição só entra se nenhum existir.
+    """
+    for usuario_id in _ids_vendedor(beneficio):
+        if usuario_id in usuarios:
+            return usuarios[usuario_id]
+    return None
+
+
+def carregar_beneficios(db, beneficio_ids):
+    """Benefícios com cliente, tabela, empresa e representante em uma única consulta"""
+    return db.query(Beneficio).options(
+        joinedload(Beneficio.cliente),
+        joinedload(Beneficio.tabela_credito),
+        joinedload(Beneficio.empresa),
+        joinedload(Beneficio.representante),
+    ).filter(Beneficio.id.in_(beneficio_ids)).order_by(Beneficio.id).all()
+
+
+def tarefas_lote(db, beneficio_ids, tipos, usuario_padrao=None, bloco=LOTE_BLOCO):
+    """
+    Gera (chave, tipo, dados) para cada documento do lote, carregando os
+    benefícios em blocos com poucas consultas por bloco.
+    A chave é (beneficio_id, tipo).
+    """
+    for i in range(0, len(beneficio_ids), bloco):
+        ids = beneficio_ids[i:i + bloco]
+        beneficios = [b for b in carregar_beneficios(db, ids) if b.cliente]
+
+        usuarios, representantes, fallback, faixas = {}, {}, None, {}
+        if "termo" in tipos:
+            rep_ids = {i for b in beneficios for i in _ids_vendedor(b) if i}
+            if rep_ids:
+                usuarios = {u.id: u for u in db.query(Usuario).filter(Usuario.id.in_(rep_ids)).all()}
+            representantes, fallback = _representantes_por_unidade(
+                db, {b.unidade_id for b in beneficios if b.unidade_id}
+            )
+            faixas = _faixas_por_beneficio(db, [b.id for b in beneficios])
+
+        for b in beneficios:
+            if "contrato" in tipos:
+                yield (b.id, "contrato"), "contrato", dados_contrato(
+                    b, b.cliente, b.representante, b.empresa, b.tabela_credito
+                )
+            if "termo" in tipos:
+                yield (b.id, "termo"), "termo", dados_termo(
+                    b, b.cliente,
+                    _vendedor(b, usuarios) or usuario_padrao,
+                    b.empresa,
+                    representantes.get(b.unidade_id) or fallback,
+                    faixas.get(b.id, [])
+                )
+
+
+def carregar_documento(db, tipo, id, usuario_padrao=None):
+    """
+    Dados de um único documento: `id` é o benefício (contrato, termo) ou o
+    cliente (ficha, planejamento). Retorna None se o registro não existir.
+    """
+    if tipo in TIPOS_LOTE:
+        for _, _, dados in tarefas_lote(db, [id], {tipo}, usuario_padrao):
+            return dados
+        return None
+
+    cliente = db.query(Cliente).filter(Cliente.id == id).first()
+    if not cliente:
+        return None
+    if tipo == "ficha":
+        representante = None
+        if cliente.representante_id:
+            representante = db.query(Usuario).filter(Usuario.id == cliente.representante_id).first()
+        return dados_ficha(cliente, representante or usuario_padrao)
+    return dados_planejamento(cliente, _tabelas_planejamento(db, cliente))
+
+
+def carregar_dossie(db, beneficio_id, usuario_padrao=None):
+    """
+    Dados dos quatro documentos do dossiê de um benefício, em (tipo, dados) na
+    ordem de TIPOS_DOSSIE. O benefício vem com cliente, tabela, empresa e
+    representante em uma consulta; usuários, representante da unidade, faixas e
+    tabelas do planejamento em uma consulta cada. Retorna None se não existir.
+    """
+    beneficios = carregar_beneficios(db, [beneficio_id])
+    if not beneficios or not beneficios[0].cliente:
+        return None
+    b = beneficios[0]
+    cliente = b.cliente
+
+    # Vendedor do termo e representante da ficha na mesma consulta
+    usuario_ids = {i for i in _ids_vendedor(b) if i}
+    usuarios = {}
+    if usuario_ids:
+        usuarios = {u.id: u for u in db.query(Usuario).filter(Usuario.id.in_(usuario_ids)).all()}
+    representantes, fallback = _representantes_por_unidade(db, {b.unidade_id} if b.unidade_id else set())
+    faixas = _faixas_por_beneficio(db, [b.id])
+
+    return [
+        ("ficha", dados_ficha(cliente, usuarios.get(cliente.representante_id) or usuario_padrao)),
+        ("planejamento", dados_planejamento(cliente, _tabelas_planejamento(db, cliente))),
+        ("contrato", dados_contrato(b, cliente, b.representante, b.empresa, b.tabela_credito)),
+        ("termo", dados_termo(
+            b, cliente,
+            _vendedor(b, usuarios) or usuario_padrao,
+            b.empresa,
+            representantes.get(b.unidade_id) or fallback,
+            faixas.get(b.id, [])
+        )),
+    ]
+
+
+def ids_lote(db, filtros):
+    """IDs dos benefícios selecionados por um LoteDocumentosRequest"""
+    query = db.query(Beneficio.id).filter(Beneficio.ativo == True)
+    if filtros.beneficio_ids:
+        query = query.filter(Beneficio.id.in_(filtros.beneficio_ids))
+    else:
+        query = query.filter(Beneficio.status.in_(filtros.status))
+        if filtros.atualizado_de:
+            query = query.filter(Beneficio.updated_at >= filtros.atualizado_de)
+        if filtros.atualizado_ate:
+            query = query.filter(Beneficio.updated_at <= filtros.atualizado_ate)
+    return [row.id for row in query.order_by(Beneficio.id).limit(filtros.limite).all()]
+
+
+def arquivos_lote(db, beneficio_ids, tipos, usuario_padrao=None):
+    """
+    Renderiza os documentos do lote no pool e gera (caminho no ZIP, bytes).
+    Falhas de renderização não interrompem o lote: vão para erros.txt no final.
+    """
+    from app.services import pdf_pool
+
+    erros = []
+    tarefas = tarefas_lote(db, beneficio_ids, tipos, usuario_padrao)
+    for (beneficio_id, tipo), nome, pdf_bytes, erro in pdf_pool.renderizar_em_paralelo(tarefas):
+        if erro:
+            erros.append(f"Benefício {beneficio_id} ({tipo}): {erro}")
+            continue
+        yield f"{beneficio_id}/{nome}", pdf_bytes
+    if erros:
+        yield "erros.txt", "\n".join(erros).encode("utf-8")
+
+
+def nome_arquivo(tipo, gerador, dados):
+    """Nome do arquivo gerado (mesmo padrão das rotas individuais)"""
+    if hasattr(gerador, "get_filename"):
+        return gerador.get_filename()
+    cliente = dados["cliente"]
+    if tipo == "termo":
+        return f"termo_adesao_{dados['beneficio'].id}_{cliente.nome.replace(' ', '_')}.pdf"
+    return f"{tipo}_{cliente.nome.replace(' ', '_')}_{cliente.id}.pdf"
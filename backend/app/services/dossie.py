@@ -0,0 +1,141 @@
+"""
+Dossiê do cliente: ficha, planejamento, contrato e termo em um único PDF
+Os quatro documentos são renderizados ao mesmo tempo (contrato e termo passam
+pelo cache de PDFs) e concatenados na ordem fixa, com um marcador por documento.
+
+O PDF final não é montado em memória antes do envio: o PdfWriter grava numa
+thread e cada bloco vai para a resposta assim que sai (fila limitada; se o
+cliente desconecta a gravação é interrompida). As partes renderizadas continuam
+em memória, pois o pypdf precisa ler cada uma inteira para copiar as páginas.
+"""
+import asyncio
+import queue
+import threading
+from io import BytesIO
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.services import pdf_cache, pdf_pool
+
+
+TITULOS = {
+    "ficha": "Ficha de Atendimento",
+    "planejamento": "Planejamento Financeiro",
+    "contrato": "Contrato de Venda",
+    "termo": "Termo de Adesão",
+}
+
+BLOCO_STREAM = 64 * 1024
+FILA_BLOCOS = 4  # blocos prontos aguardando o cliente, no máximo
+_FIM = object()
+
+
+class _Cancelado(Exception):
+    pass
+
+
+class _SaidaEmBlocos:
+    """Arquivo só de escrita para o PdfWriter: entrega blocos de `bloco` bytes na fila"""
+
+    def __init__(self, fila, bloco, cancelado):
+        self.fila = fila
+        self.bloco = bloco
+        self.cancelado = cancelado
+        self.buffer = bytearray()
+        self.posicao = 0
+
+    def tell(self):
+        # Offsets da tabela xref: total já escrito, inclusive o que foi enviado
+        return self.posicao
+
+    def write(self, dados):
+        self.buffer += dados
+        self.posicao += len(dados)
+        while len(self.buffer) >= self.bloco:
+            self._entregar(bytes(self.buffer[:self.bloco]))
+            del self.buffer[:self.bloco]
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def fechar(self):
+        if self.buffer:
+            self._entregar(bytes(self.buffer))
+            self.buffer.clear()
+
+    def _entregar(self, item):
+        while True:
+            if self.cancelado.is_set():
+                raise _Cancelado()
+            try:
+                self.fila.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+def _ler_cache(tipo, dados):
+    caminho, _ = pdf_cache.garantir(tipo, dados)
+    with open(caminho, "rb") as f:
+        return f.read()
+
+
+async def _renderizar(tipo, dados):
+    if tipo in pdf_cache.PRE_RENDERIZAR.values():
+        return await run_in_threadpool(_ler_cache, tipo, dados)
+    _, pdf_bytes = await pdf_pool.renderizar(tipo, dados)
+    return pdf_bytes
+
+
+async def renderizar(documentos):
+    """Renderiza os (tipo, dados) em paralelo e retorna [(tipo, bytes)] na mesma ordem"""
+    partes = await asyncio.gather(*(_renderizar(tipo, dados) for tipo, dados in documentos))
+    return [(tipo, pdf_bytes) for (tipo, _), pdf_bytes in zip(documentos, partes)]
+
+
+def juntar(partes):
+    """Concatena os PDFs com um marcador (outline) no início de cada documento"""
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for tipo, pdf_bytes in partes:
+        writer.append(PdfReader(BytesIO(pdf_bytes)), outline_item=TITULOS.get(tipo, tipo))
+    # Abre o leitor com o painel de marcadores visível
+    writer.page_mode = "/UseOutlines"
+    return writer
+
+
+def stream_pdf(writer, bloco=BLOCO_STREAM):
+    """Gera os bytes do PDF em blocos, à medida que o PdfWriter grava (para StreamingResponse)"""
+    fila = queue.Queue(maxsize=FILA_BLOCOS)
+    cancelado = threading.Event()
+    saida = _SaidaEmBlocos(fila, bloco, cancelado)
+
+    def gravar():
+        try:
+            writer.write(saida)
+            saida.fechar()
+            saida._entregar(_FIM)
+        except _Cancelado:
+            pass
+        except BaseException as e:
+            try:
+                saida._entregar(e)
+            except _Cancelado:
+                pass
+        finally:
+            writer.close()
+
+    thread = threading.Thread(target=gravar, name="dossie-stream", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = fila.get()
+            if item is _FIM:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        cancelado.set()
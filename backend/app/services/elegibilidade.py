@@ -0,0 +1,168 @@
+"""
+Elegibilidade de clientes para tabelas de crédito (campanhas)
+Aplica a regra de 30% do salário de `create_beneficio`, descontando as dívidas
+declaradas, sobre todos os clientes em blocos e cruza com as tabelas em memória.
+
+O numpy é importado dentro das funções: o módulo é carregado com o router de
+campanhas e não deve pesar no startup da API.
+"""
+import csv
+import io
+
+from sqlalchemy import select
+
+from app.models.cliente import Cliente
+from app.models.tabela_credito import TabelaCredito
+
+
+PERCENTUAL_RENDA = 0.30
+CHUNK_PADRAO = 20000
+
+# (flag, valor) de cada compromisso financeiro declarado no cadastro do cliente
+DIVIDAS = [
+    ("tem_consorcio", "consorcio_valor"),
+    ("tem_emprestimo_contracheque", "emprestimo_contracheque_valor"),
+    ("tem_emprestimo_outros", "emprestimo_outros_valor"),
+    ("tem_financiamento_estudantil", "financiamento_estudantil_valor"),
+    ("tem_financiamento_veicular", "financiamento_veicular_valor"),
+    ("tem_financiamento_habitacional", "financiamento_habitacional_valor"),
+    ("tem_aluguel", "aluguel_valor"),
+    ("tem_outras_dividas", "outras_dividas_valor"),
+]
+
+CSV_COLUNAS = [
+    "cliente_id", "cliente_nome", "cpf", "salario", "capacidade_livre",
+    "posicao", "tabela_id", "tabela_nome", "tipo_bem", "prazo", "valor_credito", "parcela",
+]
+
+
+class IndiceTabelas:
+    """
+    Tabelas de crédito ativas carregadas em arrays, ordenadas por parcela.
+
+    `top[k]` guarda os índices das N tabelas de maior crédito entre as k
+    tabelas mais baratas, então o top-N de um cliente com capacidade c é
+    `top[searchsorted(parcelas, c)]`, sem laço por cliente.
+    """
+
+    def __init__(self, tabelas, top_n):
+        import numpy as np
+        tabelas = sorted(tabelas, key=lambda t: float(t.parcela))
+        self.tabelas = tabelas
+        self.top_n = top_n
+        self.parcelas = np.array([float(t.parcela) for t in tabelas], dtype=np.float64)
+        creditos = np.array([float(t.valor_credito) for t in tabelas], dtype=np.float64)
+
+        self.top = np.full((len(tabelas) + 1, top_n), -1, dtype=np.int64)
+        for k in range(1, len(tabelas) + 1):
+            ordem = np.argsort(-creditos[:k], kind="stable")[:top_n]
+            self.top[k, :len(ordem)] = ordem
+
+    def melhores(self, capacidades):
+        """Matriz (clientes, top_n) com índices das tabelas elegíveis (-1 = nenhuma)"""
+        import numpy as np
+        k = np.searchsorted(self.parcelas, capacidades, side="right")
+        return self.top[k]
+
+
+def carregar_indice_tabelas(db, top_n=3, tipo_bem=None):
+    query = db.query(TabelaCredito).filter(TabelaCredito.ativo == True)
+    if tipo_bem:
+        query = query.filter(TabelaCredito.tipo_bem == tipo_bem)
+    return IndiceTabelas(query.all(), top_n)
+
+
+def calcular_capacidade(salarios, dividas):
+    """
+    Capacidade livre de parcela: 30% do salário menos as dívidas declaradas.
+    `salarios` (n,) e `dividas` (n, d); salário nulo resulta em NaN (não avaliado).
+    """
+    import numpy as np
+    return salarios * PERCENTUAL_RENDA - np.nansum(dividas, axis=1)
+
+
+def _colunas_consulta():
+    colunas = [Cliente.id, Cliente.nome, Cliente.cpf, Cliente.salario]
+    for flag, valor in DIVIDAS:
+        colunas.append(getattr(Cliente, flag))
+        colunas.append(getattr(Cliente, valor))
+    return colunas
+
+
+def iterar_blocos_clientes(db, chunk=CHUNK_PADRAO, unidade_id=None, apenas_ativos=True):
+    """
+    Percorre os clientes com salário informado em blocos (paginação por id),
+    carregando só as colunas usadas pela regra.
+    """
+    ultimo_id = 0
+    while True:
+        stmt = select(*_colunas_consulta()).where(
+            Cliente.id > ultimo_id,
+            Cliente.salario.isnot(None)
+        )
+        if apenas_ativos:
+            stmt = stmt.where(Cliente.ativo == True)
+        if unidade_id:
+            stmt = stmt.where(Cliente.unidade_id == unidade_id)
+        linhas = db.execute(stmt.order_by(Cliente.id).limit(chunk)).all()
+        if not linhas:
+            break
+        yield linhas
+        ultimo_id = linhas[-1][0]
+
+
+def _arrays_bloco(linhas):
+    import numpy as np
+    n_dividas = len(DIVIDAS)
+    dados = np.array(
+        [[l[3]] + [l[5 + 2 * i] if l[4 + 2 * i] else None for i in range(n_dividas)] for l in linhas],
+        dtype=np.float64
+    )
+    return dados[:, 0], dados[:, 1:]
+
+
+def casar_bloco(linhas, indice):
+    """Retorna (capacidades, melhores) para um bloco de clientes"""
+    import numpy as np
+    salarios, dividas = _arrays_bloco(linhas)
+    capacidades = calcular_capacidade(salarios, dividas)
+    capacidades = np.where(np.isnan(capacidades), -np.inf, capacidades)
+    return capacidades, indice.melhores(capacidades)
+
+
+def gerar_linhas(db, indice, chunk=CHUNK_PADRAO, unidade_id=None, apenas_ativos=True):
+    """Gera uma linha (lista) por par cliente x tabela elegível"""
+    import numpy as np
+    for linhas in iterar_blocos_clientes(db, chunk, unidade_id, apenas_ativos):
+        capacidades, melhores = casar_bloco(linhas, indice)
+        elegiveis = np.nonzero(melhores[:, 0] >= 0)[0]
+        for i in elegiveis:
+            cliente = linhas[i]
+            for posicao, idx in enumerate(melhores[i], start=1):
+                if idx < 0:
+                    break
+                tabela = indice.tabelas[idx]
+                yield [
+                    cliente[0], cliente[1], cliente[2], f"{float(cliente[3]):.2f}",
+                    f"{capacidades[i]:.2f}", posicao, tabela.id, tabela.nome, tabela.tipo_bem,
+                    tabela.prazo, f"{float(tabela.valor_credito):.2f}", f"{float(tabela.parcela):.2f}",
+                ]
+
+
+def gerar_csv(db, indice, chunk=CHUNK_PADRAO, unidade_id=None, apenas_ativos=True, linhas_por_parte=5000):
+    """Gera o CSV em pedaços de texto (para StreamingResponse ou arquivo)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(CSV_COLUNAS)
+
+    pendentes = 0
+    for linha in gerar_linhas(db, indice, chunk, unidade_id, apenas_ativos):
+        writer.writerow(linha)
+        pendentes += 1
+        if pendentes >= linhas_por_parte:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pendentes = 0
+
+    yield buffer.getvalue()
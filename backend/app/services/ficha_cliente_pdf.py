@@ -4,27 +4,28 @@ HM Capital - Documento profissional de 3 páginas
 """
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import cm, mm
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    PageBreak, Image, KeepTogether
+    PageBreak, KeepTogether
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
 from reportlab.pdfgen import canvas
 from io import BytesIO
 from datetime import datetime
-import os
+
+from app.services import pdf_assets, pdf_otimizacao
 
 
 class FichaClientePDFGenerator:
     """Gera PDF profissional da Ficha de Atendimento do Cliente"""
+    LOGO = 'logo-hm-capital.png'
 
     def __init__(self, cliente, representante=None):
         self.cliente = cliente
         self.representante = representante
         self.width, self.height = A4
-        self.styles = getSampleStyleSheet()
 
         # Cores do tema HM Capital (verde e dourado)
         self.cor_verde = colors.HexColor('#1B5E20')
@@ -35,21 +36,17 @@ class FichaClientePDFGenerator:
         self.cor_cinza_claro = colors.HexColor('#F5F5F5')
         self.cor_cinza = colors.HexColor('#E0E0E0')
 
-        # Caminho do logo
-        self.logo_path = os.path.join(
-            os.path.dirname(__file__), '..', 'static', 'images', 'logo-hm-capital.png'
-        )
-
         # Data atual
         self.data_atual = datetime.now()
         self.data_formatada = self.data_atual.strftime("%d/%m/%Y")
 
-        self._setup_styles()
+        # Estilos compartilhados entre documentos (montados uma vez por processo)
+        self.styles = pdf_assets.folha_estilos("ficha", self._setup_styles)
 
-    def _setup_styles(self):
+    def _setup_styles(self, styles):
         """Configura estilos customizados"""
         # Título da capa
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CoverTitle',
             fontSize=28,
             alignment=TA_CENTER,
@@ -60,7 +57,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Subtítulo da capa
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CoverSubtitle',
             fontSize=16,
             alignment=TA_CENTER,
@@ -70,7 +67,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Nome do cliente na capa
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ClienteName',
             fontSize=24,
             alignment=TA_CENTER,
@@ -80,7 +77,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Texto motivacional
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MotivationalText',
             fontSize=12,
             alignment=TA_CENTER,
@@ -90,7 +87,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Header de seção (fundo dourado)
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
             fontSize=9,
             alignment=TA_CENTER,
@@ -99,7 +96,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Header principal da página
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='PageHeader',
             fontSize=14,
             alignment=TA_CENTER,
@@ -108,7 +105,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Labels dos campos
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='FieldLabel',
             fontSize=6,
             alignment=TA_LEFT,
@@ -117,7 +114,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Valores dos campos
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='FieldValue',
             fontSize=8,
             alignment=TA_LEFT,
@@ -126,7 +123,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Texto do rodapé
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='FooterText',
             fontSize=8,
             alignment=TA_CENTER,
@@ -135,7 +132,7 @@ class FichaClientePDFGenerator:
         ))
 
         # Texto de proposta
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='PropostaTitle',
             fontSize=12,
             alignment=TA_LEFT,
@@ -143,7 +140,7 @@ class FichaClientePDFGenerator:
             fontName='Helvetica-Bold'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='PropostaContent',
             fontSize=10,
             alignment=TA_LEFT,
@@ -240,11 +237,10 @@ class FichaClientePDFGenerator:
 
     def _add_logo(self, elements, width_cm=5):
         """Adiciona logo centralizado mantendo proporção"""
-        if os.path.exists(self.logo_path):
+        if pdf_assets.existe(self.LOGO):
             # Proporção da logo HM Capital (1536x737 = 2.08:1)
             height_cm = width_cm / 2.08
-            logo = Image(self.logo_path, width=width_cm*cm, height=height_cm*cm)
-            logo.hAlign = 'CENTER'
+            logo = pdf_assets.imagem_flowable(self.LOGO, width_cm*cm, height_cm*cm)
             elements.append(logo)
             return True
         return False
@@ -259,11 +255,10 @@ class FichaClientePDFGenerator:
         elements.append(Spacer(1, 2.5*cm))
 
         # Logo grande centralizado (proporção correta da imagem HM Capital 2.08:1)
-        if os.path.exists(self.logo_path):
+        if pdf_assets.existe(self.LOGO):
             logo_width = 8*cm
             logo_height = logo_width / 2.08
-            logo = Image(self.logo_path, width=logo_width, height=logo_height)
-            logo.hAlign = 'CENTER'
+            logo = pdf_assets.imagem_flowable(self.LOGO, logo_width, logo_height)
             elements.append(logo)
 
         elements.append(Spacer(1, 1.5*cm))
@@ -335,10 +330,9 @@ class FichaClientePDFGenerator:
         page_width = self.width - 3*cm
 
         # Logo pequeno no topo
-        if os.path.exists(self.logo_path):
+        if pdf_assets.existe(self.LOGO):
             logo_width = 3*cm
-            logo = Image(self.logo_path, width=logo_width, height=logo_width/2.08)
-            logo.hAlign = 'CENTER'
+            logo = pdf_assets.imagem_flowable(self.LOGO, logo_width, logo_width/2.08)
             elements.append(logo)
             elements.append(Spacer(1, 0.2*cm))
 
@@ -578,10 +572,9 @@ class FichaClientePDFGenerator:
         page_width = self.width - 3*cm
 
         # Logo pequeno no topo
-        if os.path.exists(self.logo_path):
+        if pdf_assets.existe(self.LOGO):
             logo_width = 3.5*cm
-            logo = Image(self.logo_path, width=logo_width, height=logo_width/2.08)
-            logo.hAlign = 'CENTER'
+            logo = pdf_assets.imagem_flowable(self.LOGO, logo_width, logo_width/2.08)
             elements.append(logo)
             elements.append(Spacer(1, 0.3*cm))
 
@@ -699,10 +692,9 @@ class FichaClientePDFGenerator:
         page_width = self.width - 3*cm
 
         # Logo pequeno no topo
-        if os.path.exists(self.logo_path):
+        if pdf_assets.existe(self.LOGO):
             logo_width = 4*cm
-            logo = Image(self.logo_path, width=logo_width, height=logo_width/2.08)
-            logo.hAlign = 'CENTER'
+            logo = pdf_assets.imagem_flowable(self.LOGO, logo_width, logo_width/2.08)
             elements.append(logo)
             elements.append(Spacer(1, 0.3*cm))
 
@@ -857,7 +849,8 @@ class FichaClientePDFGenerator:
             rightMargin=1.5*cm,
             leftMargin=1.5*cm,
             topMargin=1.5*cm,
-            bottomMargin=1.5*cm
+            bottomMargin=1.5*cm,
+            **pdf_otimizacao.OPCOES_REPORTLAB
         )
 
         elements = []
@@ -883,8 +876,7 @@ class FichaClientePDFGenerator:
                 self._draw_cover_border(canvas_obj, doc)
 
         doc.build(elements, onFirstPage=on_page, onLaterPages=lambda c, d: None)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_otimizacao.otimizar(buffer.getvalue(), "ficha")
 
     def get_filename(self):
         """Retorna o nome do arquivo sugerido"""
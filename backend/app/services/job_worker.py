@@ -0,0 +1,199 @@
+"""
+Workers da fila de jobs
+Processos iniciados uma única vez por instância (JOB_WORKERS): pelo mestre de
+`python -m app.servidor`, ou pelo lifespan com `uvicorn app.main:app`. Também
+podem rodar de forma independente (JOB_WORKERS=0 no servidor):
+
+    python -m app.services.job_worker --workers 2
+
+Os handlers registrados aqui são os primeiros consumidores da fila:
+documentos PDF individuais e lotes de contratos/termos em ZIP.
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import traceback
+
+from app.core import aquecimento
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.usuario import Usuario
+from app.schemas.relatorio import LoteDocumentosRequest
+from app.services import armazenamento, documentos, jobs, pdf_cache, pdf_pool
+from app.utils.zip_stream import stream_zip
+
+
+INTERVALO_POLLING = 1.0
+INTERVALO_MANUTENCAO = 60.0
+
+_processos = []
+_parar = None
+_no_mestre = [False]  # workers do servidor: os jobs são do mestre
+
+
+# ===================== HANDLERS =====================
+
+def _usuario_padrao(db, parametros):
+    usuario_id = parametros.get("usuario_id")
+    if not usuario_id:
+        return None
+    return documentos.snapshot(db.query(Usuario).filter(Usuario.id == usuario_id).first())
+
+
+@jobs.tarefa("documento")
+def gerar_documento(db, parametros, pasta):
+    """PDF individual: {"documento": contrato|termo|ficha|planejamento, "id": ...}"""
+    tipo = parametros["documento"]
+    dados = documentos.carregar_documento(db, tipo, parametros["id"], _usuario_padrao(db, parametros))
+    if dados is None:
+        raise LookupError(f"Registro {parametros['id']} não encontrado para o documento {tipo}")
+
+    # O worker já é um processo separado: renderiza aqui mesmo
+    nome, pdf_bytes = pdf_pool.renderizar_documento(tipo, dados)
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, "wb") as f:
+        f.write(pdf_bytes)
+    return caminho, nome, "application/pdf"
+
+
+@jobs.tarefa("pre_renderizar")
+def pre_renderizar(db, parametros, pasta):
+    """Renderiza e armazena contrato/termo (agendado nas transições do workflow)"""
+    tipo = parametros["documento"]
+    dados = documentos.carregar_documento(db, tipo, parametros["id"], _usuario_padrao(db, parametros))
+    if dados is None:
+        raise LookupError(f"Benefício {parametros['id']} não encontrado")
+
+    documento = armazenamento.garantir(
+        db, tipo, parametros["id"], dados, parametros.get("usuario_id"),
+        renderizar=pdf_pool.renderizar_documento
+    )
+    caminho = os.path.join(pasta, documento.nome_arquivo)
+    with open(caminho, "wb") as f:
+        for bloco in armazenamento.ler(documento):
+            f.write(bloco)
+    return caminho, documento.nome_arquivo, documento.media_type
+
+
+@jobs.tarefa("lote_documentos")
+def gerar_lote(db, parametros, pasta):
+    """ZIP de contratos/termos com os mesmos filtros de POST /relatorios/lote"""
+    filtros = LoteDocumentosRequest(**parametros.get("filtros", {}))
+    beneficio_ids = documentos.ids_lote(db, filtros)
+    if not beneficio_ids:
+        raise LookupError("Nenhum benefício encontrado para os filtros informados")
+
+    arquivos = documentos.arquivos_lote(
+        db, beneficio_ids, set(filtros.documentos), _usuario_padrao(db, parametros)
+    )
+    nome = f"documentos_job_{os.path.basename(pasta)}.zip"
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, "wb") as f:
+        for parte in stream_zip(arquivos):
+            f.write(parte)
+            # Lotes longos: mostra que o worker segue vivo entre os documentos
+            jobs.pulsar()
+    return caminho, nome, "application/zip"
+
+
+# ===================== LAÇO DO WORKER =====================
+
+def executar_worker(parar=None, intervalo=INTERVALO_POLLING):
+    """Consome a fila até `parar` (multiprocessing.Event) ser sinalizado"""
+    parar = parar or multiprocessing.Event()
+    nome = f"{socket.gethostname()}:{os.getpid()}"
+    pai = os.getppid()
+    ultima_manutencao = 0.0
+
+    # Também para se o processo que iniciou o worker morrer sem chamar encerrar()
+    while not parar.is_set() and os.getppid() == pai:
+        db = SessionLocal()
+        try:
+            if time.monotonic() - ultima_manutencao > INTERVALO_MANUTENCAO:
+                jobs.recuperar_orfaos(db)
+                jobs.limpar_expirados(db)
+                pdf_cache.limpar()
+                ultima_manutencao = time.monotonic()
+
+            job = jobs.reivindicar(db, nome)
+            if job:
+                jobs.executar(db, job)
+                continue
+        except Exception:
+            traceback.print_exc()
+            db.rollback()
+        finally:
+            db.close()
+        # Sem parar.wait(): um worker morto esperando no Event travaria o set() de quem encerra
+        time.sleep(intervalo)
+
+    pdf_pool.encerrar()
+
+
+def _alvo_worker(parar, irmaos):
+    # Ctrl+C e SIGTERM no grupo são tratados pelo processo principal, que
+    # sinaliza `parar` e espera o job atual terminar
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    pdf_pool.dividir_entre(irmaos)
+    # Documentos individuais renderizam no próprio worker
+    aquecimento.aquecer_render()
+    executar_worker(parar)
+
+
+def delegar_ao_mestre():
+    """No worker do servidor (após o fork): iniciar/encerrar ficam com o mestre"""
+    _no_mestre[0] = True
+    _processos.clear()
+
+
+def iniciar(quantidade=None):
+    """Inicia os processos worker (chamado no startup da aplicação)"""
+    global _parar
+    quantidade = settings.JOB_WORKERS if quantidade is None else quantidade
+    if quantidade <= 0 or _processos or _no_mestre[0]:
+        return
+
+    contexto = multiprocessing.get_context("spawn")
+    _parar = contexto.Event()
+    for i in range(quantidade):
+        # Não-daemon: o worker precisa criar o pool de PDFs para os lotes
+        processo = contexto.Process(target=_alvo_worker, args=(_parar, quantidade), name=f"job-worker-{i}")
+        processo.start()
+        _processos.append(processo)
+    print(f"✓ {quantidade} worker(s) de jobs iniciados")
+
+
+def encerrar(timeout=10):
+    """Pede para os workers pararem após o job atual e aguarda"""
+    if _no_mestre[0]:
+        return
+    if _parar is not None:
+        _parar.set()
+    for processo in _processos:
+        processo.join(timeout)
+        if processo.is_alive():
+            processo.kill()
+    _processos.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workers da fila de jobs")
+    parser.add_argument("--workers", type=int, default=max(settings.JOB_WORKERS, 1))
+    args = parser.parse_args()
+
+    iniciar(args.workers)
+    try:
+        while any(p.is_alive() for p in _processos):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        encerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Fila de jobs em segundo plano
+A fila é a própria tabela `jobs` (PostgreSQL ou SQLite): não há broker externo.
+Os workers (app.services.job_worker) reivindicam jobs com um UPDATE condicional,
+então vários processos podem consumir a mesma fila sem processar um job duas vezes.
+Durante a execução o worker renova `batimento_em` (`pulsar()`); só jobs sem
+batimento há mais de JOBS_TIMEOUT_SEGUNDOS são tratados como órfãos.
+"""
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import Job
+
+
+BACKOFF_MAXIMO = 3600
+
+# tipo -> função(db, parametros, pasta_destino) -> (caminho, nome, media_type)
+HANDLERS = {}
+
+# Job em execução neste processo (o worker executa um por vez)
+_em_execucao = {"id": None, "ultimo": 0.0}
+
+
+def tarefa(tipo):
+    """Registra o handler de um tipo de job"""
+    def decorator(func):
+        HANDLERS[tipo] = func
+        return func
+    return decorator
+
+
+def agora():
+    return datetime.now(timezone.utc)
+
+
+def como_utc(data):
+    """SQLite devolve datas sem fuso; todas são gravadas em UTC"""
+    if data is not None and data.tzinfo is None:
+        return data.replace(tzinfo=timezone.utc)
+    return data
+
+
+def pasta_job(job_id):
+    return os.path.abspath(os.path.join(settings.JOBS_DIR, str(job_id)))
+
+
+# ===================== PRODUTOR =====================
+
+def enfileirar(db, tipo, parametros=None, usuario_id=None, max_tentativas=None, executar_apos=None):
+    """Cria um job pendente e retorna o registro"""
+    job = Job(
+        tipo=tipo,
+        parametros=json.dumps(parametros or {}, default=str),
+        status="pendente",
+        tentativas=0,
+        max_tentativas=max_tentativas or settings.JOBS_MAX_TENTATIVAS,
+        executar_apos=executar_apos or agora(),
+        usuario_id=usuario_id,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def parametros(job):
+    return json.loads(job.parametros or "{}")
+
+
+def expirado(job):
+    return job.status == "expirado" or (
+        job.expira_em is not None and como_utc(job.expira_em) <= agora()
+    )
+
+
+# ===================== CONSUMIDOR =====================
+
+def reivindicar(db, worker):
+    """
+    Reivindica o próximo job pronto para execução.
+    O UPDATE só afeta a linha se ela ainda estiver pendente; se outro worker
+    ganhou a disputa, tenta o candidato seguinte.
+    """
+    for _ in range(5):
+        candidato = db.query(Job.id).filter(
+            Job.status == "pendente",
+            Job.executar_apos <= agora()
+        ).order_by(Job.executar_apos, Job.id).first()
+        if not candidato:
+            return None
+
+        atualizados = db.query(Job).filter(
+            Job.id == candidato.id,
+            Job.status == "pendente"
+        ).update({
+            Job.status: "executando",
+            Job.worker: worker,
+            Job.tentativas: Job.tentativas + 1,
+            Job.iniciado_em: agora(),
+            Job.batimento_em: agora(),
+        }, synchronize_session=False)
+        db.commit()
+        if atualizados:
+            return db.query(Job).filter(Job.id == candidato.id).first()
+    return None
+
+
+def concluir(db, job, caminho, nome, media_type):
+    job.status = "concluido"
+    job.erro = None
+    job.arquivo_path = caminho
+    job.arquivo_nome = nome
+    job.media_type = media_type
+    job.tamanho = os.path.getsize(caminho)
+    job.concluido_em = agora()
+    job.expira_em = job.concluido_em + timedelta(hours=settings.JOBS_RETENCAO_HORAS)
+    db.commit()
+
+
+def falhar(db, job, erro):
+    """Reagenda com backoff exponencial ou marca como erro após a última tentativa"""
+    job.erro = str(erro)[:2000]
+    job.worker = None
+    if job.tentativas < job.max_tentativas:
+        espera = min(settings.JOBS_BACKOFF_SEGUNDOS * 2 ** (job.tentativas - 1), BACKOFF_MAXIMO)
+        job.status = "pendente"
+        job.executar_apos = agora() + timedelta(seconds=espera)
+    else:
+        job.status = "erro"
+        job.concluido_em = agora()
+        job.expira_em = job.concluido_em + timedelta(hours=settings.JOBS_RETENCAO_HORAS)
+        shutil.rmtree(pasta_job(job.id), ignore_errors=True)
+    db.commit()
+
+
+def pulsar():
+    """
+    Renova o batimento do job em execução (chamado pelos handlers entre
+    documentos). Grava no máximo a cada JOBS_BATIMENTO_SEGUNDOS, numa sessão
+    própria para não fazer commit no meio do trabalho do handler.
+    """
+    job_id = _em_execucao["id"]
+    if job_id is None or time.monotonic() - _em_execucao["ultimo"] < settings.JOBS_BATIMENTO_SEGUNDOS:
+        return
+    _em_execucao["ultimo"] = time.monotonic()
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == job_id, Job.status == "executando").update(
+            {Job.batimento_em: agora()}, synchronize_session=False
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Falha ao renovar o batimento do job {job_id}: {e}")
+    finally:
+        db.close()
+
+
+def executar(db, job):
+    """Executa o handler do job e grava o resultado (ou a falha)"""
+    handler = HANDLERS.get(job.tipo)
+    if handler is None:
+        job.tentativas = job.max_tentativas
+        falhar(db, job, f"Tipo de job desconhecido: {job.tipo}")
+        return
+
+    pasta = pasta_job(job.id)
+    os.makedirs(pasta, exist_ok=True)
+    _em_execucao.update(id=job.id, ultimo=time.monotonic())
+    try:
+        caminho, nome, media_type = handler(db, parametros(job), pasta)
+    except LookupError as e:
+        # Registro inexistente: repetir não adianta
+        db.rollback()
+        job.tentativas = job.max_tentativas
+        falhar(db, job, e)
+        return
+    except Exception as e:
+        db.rollback()
+        falhar(db, job, e)
+        return
+    finally:
+        _em_execucao["id"] = None
+    concluir(db, job, caminho, nome, media_type)
+
+
+# ===================== MANUTENÇÃO =====================
+
+def recuperar_orfaos(db):
+    """Jobs 'executando' sem batimento além do timeout (worker morreu) voltam para a fila"""
+    limite = agora() - timedelta(seconds=settings.JOBS_TIMEOUT_SEGUNDOS)
+    orfaos = db.query(Job).filter(
+        Job.status == "executando",
+        func.coalesce(Job.batimento_em, Job.iniciado_em) < limite
+    ).all()
+    for job in orfaos:
+        falhar(db, job, "Worker sem batimento além do tempo limite")
+    return len(orfaos)
+
+
+def limpar_expirados(db):
+    """Remove do disco os resultados vencidos; o registro fica como 'expirado'"""
+    expirados = db.query(Job).filter(
+        Job.status.in_(["concluido", "erro"]),
+        Job.expira_em <= agora()
+    ).all()
+    for job in expirados:
+        shutil.rmtree(pasta_job(job.id), ignore_errors=True)
+        job.status = "expirado"
+        job.arquivo_path = None
+    db.commit()
+    return len(expirados)
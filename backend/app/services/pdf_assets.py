@@ -0,0 +1,210 @@
+"""
+Registro de assets dos geradores de PDF (por processo)
+Logos são decodificados e reduzidos uma única vez para o maior tamanho em que
+são desenhados (TAMANHOS_RENDER), e ficam prontos como ImageReader (ReportLab)
+e data URI (WeasyPrint). Uma única variante por arquivo faz o ReportLab embutir
+a imagem uma vez só por documento, mesmo quando ela aparece em vários tamanhos. As folhas de estilo de cada gerador são montadas uma vez e
+compartilhadas (somente leitura) entre os documentos.
+
+Alterações nos arquivos de imagem são detectadas pelo mtime (verificado no
+máximo a cada RECARGA_SEGUNDOS) e o asset é recarregado.
+"""
+import base64
+import os
+import threading
+import time
+from io import BytesIO
+
+from PIL import Image as PILImage
+from reportlab.lib.styles import StyleSheet1, getSampleStyleSheet
+from reportlab.lib.units import inch, cm
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image
+
+
+IMAGENS_DIR = os.path.join(os.path.dirname(__file__), '..', 'static', 'images')
+
+# Resolução das imagens reduzidas (pontos -> pixels)
+DPI_IMAGENS = 300
+RECARGA_SEGUNDOS = 5.0
+
+# Maior largura (pontos) em que cada logo é desenhado pelos geradores
+TAMANHOS_RENDER = {
+    'logo-hm-capital.png': 8 * cm,       # capa da ficha
+    'logo-white-bg.jpg': 6 * cm,         # capa do planejamento
+    'logo-capital-brasil.png': 3.5 * cm, # termo (o contrato usa 30mm)
+}
+
+_lock = threading.Lock()
+_arquivos = {}   # nome -> _Arquivo
+_variantes = {}  # nome -> AssetImagem
+_folhas = {}     # nome -> FolhaEstilos
+
+
+class _Arquivo:
+    """Imagem original decodificada + controle de recarga"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.mtime = os.path.getmtime(caminho)
+        self.verificado_em = time.monotonic()
+        with PILImage.open(caminho) as img:
+            img.load()
+            self.formato = img.format
+            self.imagem = img.copy()
+
+
+class AssetImagem:
+    """Imagem reduzida pronta para os dois motores de PDF"""
+
+    def __init__(self, arquivo, largura_px, altura_px):
+        imagem = arquivo.imagem
+        if imagem.mode == "P":
+            imagem = imagem.convert("RGBA")
+        if (largura_px, altura_px) != imagem.size:
+            imagem = imagem.resize((largura_px, altura_px), PILImage.LANCZOS)
+
+        # JPEG continua JPEG (o ReportLab embute sem recomprimir); o resto vira PNG
+        buffer = BytesIO()
+        if arquivo.formato == "JPEG":
+            imagem.convert("RGB").save(buffer, format="JPEG", quality=90)
+            mime = "image/jpeg"
+        else:
+            imagem.save(buffer, format="PNG", optimize=True)
+            mime = "image/png"
+
+        self.largura_px = largura_px
+        self.altura_px = altura_px
+        self.bytes = buffer.getvalue()
+        self.leitor = ImageReader(BytesIO(self.bytes))
+        self.data_uri = f"data:{mime};base64,{base64.b64encode(self.bytes).decode('ascii')}"
+
+
+class ImagemRegistrada(Image):
+    """Flowable de imagem que reutiliza o ImageReader do registro"""
+
+    def __init__(self, asset, width, height, hAlign='CENTER'):
+        self._img = asset.leitor
+        self._file = None
+        self._drawing = None
+        self._mask = "auto"
+        self._dpi = False
+        self.filename = repr(asset.leitor)
+        self.hAlign = hAlign
+        self._setup(width, height, 'direct', 0)
+
+
+class FolhaEstilos(StyleSheet1):
+    """StyleSheet compartilhada entre documentos: somente leitura depois de montada"""
+
+    _congelada = False
+
+    @classmethod
+    def de_amostra(cls):
+        folha = cls()
+        amostra = getSampleStyleSheet()
+        folha.byName = dict(amostra.byName)
+        folha.byAlias = dict(amostra.byAlias)
+        return folha
+
+    def add(self, style, alias=None):
+        if self._congelada:
+            raise TypeError("Folha de estilos compartilhada é somente leitura")
+        super().add(style, alias)
+
+    def congelar(self):
+        self._congelada = True
+        return self
+
+
+# ===================== IMAGENS =====================
+
+def caminho_imagem(nome):
+    return os.path.join(IMAGENS_DIR, nome)
+
+
+def _arquivo(nome):
+    """Arquivo decodificado (recarregado se mudou em disco) ou None se não existir"""
+    agora = time.monotonic()
+    arquivo = _arquivos.get(nome)
+    if arquivo is not None and agora - arquivo.verificado_em < RECARGA_SEGUNDOS:
+        return arquivo
+
+    with _lock:
+        arquivo = _arquivos.get(nome)
+        caminho = caminho_imagem(nome)
+        try:
+            mtime = os.path.getmtime(caminho)
+        except OSError:
+            _arquivos.pop(nome, None)
+            return None
+
+        if arquivo is not None and arquivo.mtime == mtime:
+            arquivo.verificado_em = agora
+            return arquivo
+
+        arquivo = _Arquivo(caminho)
+        _arquivos[nome] = arquivo
+        _variantes.pop(nome, None)
+        return arquivo
+
+
+def existe(nome):
+    return _arquivo(nome) is not None
+
+
+def imagem(nome):
+    """AssetImagem de `nome` reduzido para TAMANHOS_RENDER, ou None se o arquivo não existir"""
+    arquivo = _arquivo(nome)
+    if arquivo is None:
+        return None
+
+    asset = _variantes.get(nome)
+    if asset is None:
+        with _lock:
+            asset = _variantes.get(nome)
+            if asset is None:
+                largura, altura = arquivo.imagem.size
+                largura_render = TAMANHOS_RENDER.get(nome)
+                if largura_render:
+                    # Nunca amplia: acima da resolução original mantém o tamanho do arquivo
+                    largura_px = min(largura, max(1, round(largura_render / inch * DPI_IMAGENS)))
+                    altura = max(1, round(altura * largura_px / largura))
+                    largura = largura_px
+                asset = AssetImagem(arquivo, largura, altura)
+                _variantes[nome] = asset
+    return asset
+
+
+def imagem_flowable(nome, largura, altura=None, hAlign='CENTER'):
+    """Flowable (platypus) da imagem registrada, ou None se o arquivo não existir"""
+    asset = imagem(nome)
+    if asset is None:
+        return None
+    if altura is None:
+        altura = largura * asset.altura_px / asset.largura_px
+    return ImagemRegistrada(asset, largura, altura, hAlign=hAlign)
+
+
+def data_uri(nome):
+    """data: URI da imagem reduzida (para HTML/WeasyPrint) ou '' se não existir"""
+    asset = imagem(nome)
+    return asset.data_uri if asset else ''
+
+
+# ===================== ESTILOS =====================
+
+def folha_estilos(nome, montar):
+    """
+    Folha de estilos compartilhada `nome`: na primeira chamada do processo parte
+    do getSampleStyleSheet(), aplica `montar(folha)` e congela.
+    """
+    folha = _folhas.get(nome)
+    if folha is None:
+        with _lock:
+            folha = _folhas.get(nome)
+            if folha is None:
+                folha = FolhaEstilos.de_amostra()
+                montar(folha)
+                _folhas[nome] = folha.congelar()
+    return folha
@@ -0,0 +1,145 @@
+"""
+Cache em disco de PDFs renderizados (contrato e termo)
+A chave é o hash dos dados de entrada do gerador mais a data do dia (os
+documentos imprimem a data atual): qualquer alteração no benefício, cliente,
+faixas etc. resulta em outra chave, sem invalidação explícita.
+
+Um lock por chave (thread + arquivo) garante uma única renderização quando
+várias pessoas abrem o mesmo documento ao mesmo tempo.
+"""
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:  # Windows: só o lock entre threads
+    fcntl = None
+
+from app.core.config import settings
+from app.core.instrumentacao import medir_pdf
+
+
+# status do workflow -> documento pré-renderizado ao entrar nele
+PRE_RENDERIZAR = {
+    "contrato_gerado": "contrato",
+    "termo_gerado": "termo",
+}
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def chave(tipo, dados):
+    conteudo = f"{tipo}|{date.today().isoformat()}|{sorted(dados.items())!r}"
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def _caminhos(tipo, chave_doc):
+    pasta = os.path.abspath(os.path.join(settings.PDF_CACHE_DIR, tipo))
+    base = os.path.join(pasta, chave_doc)
+    return pasta, base + ".pdf", base + ".nome"
+
+
+def obter(tipo, dados):
+    """(caminho, nome) do PDF em cache ou None"""
+    _, pdf, nome = _caminhos(tipo, chave(tipo, dados))
+    try:
+        with open(nome, encoding="utf-8") as f:
+            nome_arquivo = f.read()
+    except FileNotFoundError:
+        return None
+    return (pdf, nome_arquivo) if os.path.exists(pdf) else None
+
+
+@contextmanager
+def _lock(pasta, chave_doc):
+    with _locks_guard:
+        lock = _locks.setdefault(chave_doc, threading.Lock())
+    with lock:
+        try:
+            if fcntl is None:
+                yield
+            else:
+                # Lock de arquivo: exclui também outros workers do uvicorn e da fila de jobs
+                with open(os.path.join(pasta, chave_doc + ".lock"), "w") as f:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    try:
+                        yield
+                    finally:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+        finally:
+            with _locks_guard:
+                _locks.pop(chave_doc, None)
+
+
+def _renderizar_no_pool(tipo, dados):
+    from app.services import pdf_pool
+    return pdf_pool.get_executor().submit(pdf_pool.renderizar_documento, tipo, dados).result()
+
+
+def garantir(tipo, dados, renderizar=None):
+    """
+    Retorna (caminho, nome) do PDF, renderizando apenas se ainda não estiver em cache.
+    Por padrão renderiza no pool de processos; os workers de jobs passam
+    `renderizar=pdf_pool.renderizar_documento` para renderizar no próprio processo.
+    """
+    encontrado = obter(tipo, dados)
+    if encontrado:
+        return encontrado
+
+    chave_doc = chave(tipo, dados)
+    pasta, pdf, nome = _caminhos(tipo, chave_doc)
+    os.makedirs(pasta, exist_ok=True)
+
+    with _lock(pasta, chave_doc):
+        # Outro processo pode ter renderizado enquanto esperávamos o lock
+        encontrado = obter(tipo, dados)
+        if encontrado:
+            return encontrado
+
+        with medir_pdf():
+            nome_arquivo, pdf_bytes = (renderizar or _renderizar_no_pool)(tipo, dados)
+        temporario = f"{pdf}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(temporario, pdf)
+        with open(nome, "w", encoding="utf-8") as f:
+            f.write(nome_arquivo)
+
+    return pdf, nome_arquivo
+
+
+def agendar_pre_renderizacao(db, beneficio_id, status, usuario_id=None):
+    """Enfileira a renderização do documento da nova etapa do workflow (se houver)"""
+    tipo = PRE_RENDERIZAR.get(status)
+    if not tipo:
+        return None
+    from app.services import jobs
+    return jobs.enfileirar(
+        db, "pre_renderizar",
+        {"documento": tipo, "id": beneficio_id, "usuario_id": usuario_id},
+        usuario_id=usuario_id
+    )
+
+
+def limpar(retencao_horas=None):
+    """Remove entradas mais antigas que a retenção configurada"""
+    if retencao_horas is None:
+        retencao_horas = settings.PDF_CACHE_RETENCAO_HORAS
+    limite = time.time() - retencao_horas * 3600
+    raiz = os.path.abspath(settings.PDF_CACHE_DIR)
+    removidos = 0
+    for pasta, _, arquivos in os.walk(raiz):
+        for arquivo in arquivos:
+            caminho = os.path.join(pasta, arquivo)
+            try:
+                if os.path.getmtime(caminho) < limite:
+                    os.remove(caminho)
+                    removidos += arquivo.endswith(".pdf")
+            except FileNotFoundError:
+                pass
+    return removidos
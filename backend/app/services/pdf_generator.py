@@ -4,35 +4,36 @@ Baseado no modelo Siprov/Uni+
 """
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import cm, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
 from io import BytesIO
 from datetime import datetime
-import os
+
+from app.services import pdf_assets, pdf_otimizacao
 
 
 class ClientePDFGenerator:
+    LOGO = 'logo-white-bg.jpg'
+
     def __init__(self, cliente, beneficio=None, tabelas_simulacao=None):
         self.cliente = cliente
         self.beneficio = beneficio
         self.tabelas_simulacao = tabelas_simulacao or []
         self.width, self.height = A4
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
 
         # Cores do tema
         self.cor_dourada = colors.HexColor('#C4A962')
         self.cor_header = colors.HexColor('#3D3D3D')
         self.cor_cinza_claro = colors.HexColor('#F5F5F5')
 
-        # Caminho do logo
-        self.logo_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'images', 'logo-white-bg.jpg')
+        # Estilos compartilhados entre documentos (montados uma vez por processo)
+        self.styles = pdf_assets.folha_estilos("planejamento", self._setup_styles)
 
-    def _setup_styles(self):
+    def _setup_styles(self, styles):
         """Configura estilos customizados"""
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ClienteName',
             fontSize=22,
             alignment=TA_CENTER,
@@ -42,7 +43,7 @@ class ClientePDFGenerator:
             fontName='Helvetica-Bold'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MainTitle',
             fontSize=18,
             alignment=TA_CENTER,
@@ -51,7 +52,7 @@ class ClientePDFGenerator:
             fontName='Helvetica-Bold'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SubTitle',
             fontSize=14,
             alignment=TA_CENTER,
@@ -60,7 +61,7 @@ class ClientePDFGenerator:
             fontName='Helvetica-Bold'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CenterText',
             fontSize=11,
             alignment=TA_CENTER,
@@ -68,7 +69,7 @@ class ClientePDFGenerator:
             fontName='Helvetica'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CenterTextBold',
             fontSize=11,
             alignment=TA_CENTER,
@@ -76,7 +77,7 @@ class ClientePDFGenerator:
             fontName='Helvetica-Bold'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SmallCenter',
             fontSize=9,
             alignment=TA_CENTER,
@@ -84,7 +85,7 @@ class ClientePDFGenerator:
             fontName='Helvetica'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='JustifyText',
             fontSize=9,
             alignment=TA_JUSTIFY,
@@ -93,7 +94,7 @@ class ClientePDFGenerator:
             fontName='Helvetica'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
             fontSize=10,
             alignment=TA_CENTER,
@@ -101,7 +102,7 @@ class ClientePDFGenerator:
             fontName='Helvetica-Bold'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableLabel',
             fontSize=7,
             alignment=TA_LEFT,
@@ -109,7 +110,7 @@ class ClientePDFGenerator:
             fontName='Helvetica-Bold'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableValue',
             fontSize=8,
             alignment=TA_LEFT,
@@ -171,9 +172,8 @@ class ClientePDFGenerator:
         elements.append(Spacer(1, 2*cm))
 
         # Logo ou nome da empresa
-        if os.path.exists(self.logo_path):
-            logo = Image(self.logo_path, width=6*cm, height=2.25*cm)
-            logo.hAlign = 'CENTER'
+        if pdf_assets.existe(self.LOGO):
+            logo = pdf_assets.imagem_flowable(self.LOGO, 6*cm, 2.25*cm)
             elements.append(logo)
         else:
             elements.append(Paragraph("HM CAPITAL", self.styles['ClienteName']))
@@ -226,9 +226,8 @@ class ClientePDFGenerator:
         page_width = self.width - 3*cm
 
         # Logo no topo
-        if os.path.exists(self.logo_path):
-            logo = Image(self.logo_path, width=3*cm, height=1.1*cm)
-            logo.hAlign = 'CENTER'
+        if pdf_assets.existe(self.LOGO):
+            logo = pdf_assets.imagem_flowable(self.LOGO, 3*cm, 1.1*cm)
             elements.append(logo)
             elements.append(Spacer(1, 0.2*cm))
 
@@ -602,9 +601,8 @@ class ClientePDFGenerator:
         page_width = self.width - 3*cm
 
         # Logo no topo da página de proposta
-        if os.path.exists(self.logo_path):
-            logo = Image(self.logo_path, width=4*cm, height=1.5*cm)
-            logo.hAlign = 'CENTER'
+        if pdf_assets.existe(self.LOGO):
+            logo = pdf_assets.imagem_flowable(self.LOGO, 4*cm, 1.5*cm)
             elements.append(logo)
             elements.append(Spacer(1, 0.3*cm))
 
@@ -731,7 +729,8 @@ class ClientePDFGenerator:
             rightMargin=1.5*cm,
             leftMargin=1.5*cm,
             topMargin=1.5*cm,
-            bottomMargin=1.5*cm
+            bottomMargin=1.5*cm,
+            **pdf_otimizacao.OPCOES_REPORTLAB
         )
 
         elements = []
@@ -749,5 +748,4 @@ class ClientePDFGenerator:
         self._create_proposal_page(elements)
 
         doc.build(elements)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_otimizacao.otimizar(buffer.getvalue(), "planejamento")
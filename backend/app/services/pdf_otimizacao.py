@@ -0,0 +1,110 @@
+"""
+Otimização dos PDFs gerados (ReportLab e WeasyPrint)
+
+Duas etapas:
+- na escrita: compressão de streams no ReportLab (OPCOES_REPORTLAB) e, no
+  WeasyPrint, subconjunto de fontes sem hinting, imagens otimizadas e cache de
+  imagens compartilhado entre documentos (opcoes_weasyprint);
+- depois da escrita (otimizar): passada com pypdf que reduz imagens acima de
+  PDF_IMAGEM_LADO_MAX, recomprime os content streams e remove objetos
+  idênticos (XObjects de imagem repetidos, fontes duplicadas).
+
+As fontes padrão do ReportLab (Helvetica) não são embutidas; fontes TTF
+registradas no ReportLab já saem em subconjunto.
+
+Tamanho e tempo antes/depois por documento: scripts/benchmark_pdfs.py (com
+DEBUG, cada otimização também é impressa no log do processo que renderiza).
+"""
+import time
+from io import BytesIO
+
+from app.core.config import settings
+
+
+# Repassadas ao SimpleDocTemplate dos geradores ReportLab
+OPCOES_REPORTLAB = {"pageCompression": 1}
+
+# Cache de imagens do WeasyPrint: cada imagem é decodificada uma vez por processo
+_cache_imagens = {}
+
+
+def opcoes_weasyprint():
+    """Opções de write_pdf do WeasyPrint"""
+    return {
+        "full_fonts": False,
+        "hinting": False,
+        "optimize_images": True,
+        "jpeg_quality": 85,
+        "dpi": 300,
+        "uncompressed_pdf": False,
+        "cache": _cache_imagens,
+    }
+
+
+def _reduzir_imagens(pagina, lado_max):
+    """Reduz as imagens da página maiores que `lado_max` px (lidas pelo dicionário, sem decodificar)"""
+    recursos = pagina.get("/Resources")
+    xobjects = recursos.get_object().get("/XObject") if recursos else None
+    if not xobjects:
+        return 0
+
+    reduzidas = 0
+    for nome, ref in xobjects.get_object().items():
+        xobj = ref.get_object()
+        if xobj.get("/Subtype") != "/Image" or max(xobj.get("/Width", 0), xobj.get("/Height", 0)) <= lado_max:
+            continue
+        # Imagens com transparência (SMask) ficam como estão: a troca perderia o canal alfa
+        if "/SMask" in xobj:
+            continue
+        try:
+            imagem = pagina.images[nome]
+            pil = imagem.image
+            if pil.mode not in ("RGB", "L", "CMYK"):
+                continue
+            from PIL import Image
+
+            nova = pil.copy()
+            nova.thumbnail((lado_max, lado_max), Image.LANCZOS)
+            imagem.replace(nova, quality=85)
+            reduzidas += 1
+        except Exception:
+            continue
+    return reduzidas
+
+
+def _otimizar(pdf_bytes, lado_max, nivel):
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter(clone_from=PdfReader(BytesIO(pdf_bytes)))
+    for pagina in writer.pages:
+        _reduzir_imagens(pagina, lado_max)
+        pagina.compress_content_streams(level=nivel)
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+
+    saida = BytesIO()
+    writer.write(saida)
+    return saida.getvalue()
+
+
+def otimizar(pdf_bytes, origem="pdf"):
+    """
+    Aplica a passada de otimização e retorna os bytes finais.
+    Se a otimização falhar ou não reduzir o arquivo, devolve o PDF original.
+    """
+    if not settings.PDF_OTIMIZAR:
+        return pdf_bytes
+
+    inicio = time.perf_counter()
+    try:
+        otimizado = _otimizar(pdf_bytes, settings.PDF_IMAGEM_LADO_MAX, settings.PDF_COMPRESSAO_NIVEL)
+    except Exception as e:
+        print(f"Otimização do PDF ({origem}) ignorada: {e}")
+        otimizado = pdf_bytes
+    if len(otimizado) >= len(pdf_bytes):
+        otimizado = pdf_bytes
+    ms = (time.perf_counter() - inicio) * 1000
+
+    if settings.DEBUG:
+        print(f"PDF {origem}: {len(pdf_bytes) / 1024:.0f}KB -> {len(otimizado) / 1024:.0f}KB ({ms:.0f}ms)")
+    return otimizado
+
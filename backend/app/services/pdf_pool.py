@@ -0,0 +1,115 @@
+"""
+Pool de processos para renderização de PDFs
+ReportLab e WeasyPrint são CPU-bound; renderizar fora do processo do servidor
+libera o event loop e permite gerar vários documentos em paralelo.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from app.core import aquecimento, cpus
+from app.core.config import settings
+from app.core.instrumentacao import medir_pdf
+
+
+# tipo -> (módulo, classe do gerador)
+GERADORES = {
+    "contrato": ("app.services.contrato_venda_pdf", "ContratoVendaPDFGenerator"),
+    "termo": ("app.services.termo_adesao_pdf_generator", "TermoAdesaoPDFGenerator"),
+    "ficha": ("app.services.ficha_cliente_pdf", "FichaClientePDFGenerator"),
+    "planejamento": ("app.services.pdf_generator", "ClientePDFGenerator"),
+}
+
+_executor = None
+_lock = threading.Lock()
+_processos_irmaos = [1]  # processos que dividem as CPUs, cada um com o próprio pool
+
+
+def _classe_gerador(tipo):
+    import importlib
+    modulo, classe = GERADORES[tipo]
+    return getattr(importlib.import_module(modulo), classe)
+
+
+def renderizar_documento(tipo, dados):
+    """Renderiza no processo atual (usado pelos workers do pool e de jobs): retorna (nome, bytes)"""
+    from app.services.documentos import nome_arquivo
+
+    gerador = _classe_gerador(tipo)(**dados)
+    pdf_bytes = gerador.generate()
+    return nome_arquivo(tipo, gerador, dados), pdf_bytes
+
+
+def dividir_entre(processos):
+    """Chamado antes do fork/spawn: o pool de cada um dos `processos` fica com a sua parte das CPUs"""
+    _processos_irmaos[0] = max(1, processos)
+
+
+def num_workers():
+    """PDF_WORKERS por processo; 0 = CPUs disponíveis divididas entre os processos irmãos"""
+    return settings.PDF_WORKERS or max(1, cpus.disponiveis() // _processos_irmaos[0])
+
+
+def get_executor():
+    """Pool criado sob demanda (um por processo do servidor); recriado se um worker morrer"""
+    global _executor
+    with _lock:
+        if _executor is None or getattr(_executor, "_broken", False):
+            _executor = ProcessPoolExecutor(
+                max_workers=num_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+                # Templates e assets prontos no processo que vai renderizar
+                initializer=aquecimento.aquecer_render
+            )
+        return _executor
+
+
+def encerrar():
+    """Finaliza o pool (chamado no shutdown da aplicação)"""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def renderizar(tipo, dados):
+    """Renderiza um documento no pool sem bloquear o event loop"""
+    loop = asyncio.get_running_loop()
+    with medir_pdf():
+        return await loop.run_in_executor(get_executor(), renderizar_documento, tipo, dados)
+
+
+def renderizar_em_paralelo(tarefas, max_pendentes=None):
+    """
+    Renderiza as tarefas (chave, tipo, dados) no pool e gera
+    (chave, nome, pdf_bytes, erro) na ordem em que terminam.
+
+    No máximo `max_pendentes` documentos ficam em voo ao mesmo tempo, o que
+    limita a memória mesmo para lotes grandes.
+    """
+    executor = get_executor()
+    limite = max_pendentes or num_workers() * 2
+    tarefas = iter(tarefas)
+    pendentes = {}
+
+    def enviar():
+        while len(pendentes) < limite:
+            try:
+                chave, tipo, dados = next(tarefas)
+            except StopIteration:
+                return
+            pendentes[executor.submit(renderizar_documento, tipo, dados)] = chave
+
+    enviar()
+    while pendentes:
+        concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+        for futuro in concluidos:
+            chave = pendentes.pop(futuro)
+            try:
+                nome, pdf_bytes = futuro.result()
+                yield chave, nome, pdf_bytes, None
+            except Exception as e:
+                yield chave, None, None, e
+        enviar()
@@ -4,16 +4,19 @@ Baseado no modelo Unifin - 3 páginas
 """
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import cm, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
 from io import BytesIO
 from datetime import datetime
-import os
+
+from app.services import pdf_assets, pdf_otimizacao
 
 
 class TermoAdesaoPDFGenerator:
+    LOGO = 'logo-capital-brasil.png'
+
     def __init__(self, cliente, beneficio, usuario=None, empresa=None, representante=None, faixas=None):
         self.cliente = cliente
         self.beneficio = beneficio
@@ -22,8 +25,6 @@ class TermoAdesaoPDFGenerator:
         self.representante = representante
         self.faixas = faixas or []
         self.width, self.height = A4
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
 
         # Dados da empresa
         self.empresa_nome = "HM CAPITAL"
@@ -34,15 +35,15 @@ class TermoAdesaoPDFGenerator:
         self.cor_header = colors.HexColor('#1a1a1a')
         self.cor_section_bg = colors.HexColor('#f5f5f5')
 
-        # Caminho do logo (Capital Brasil - mesmo do contrato de venda)
-        self.logo_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'images', 'logo-capital-brasil.png')
+        # Estilos compartilhados entre documentos (montados uma vez por processo)
+        self.styles = pdf_assets.folha_estilos("termo", self._setup_styles)
 
         # Data atual
         self.data_atual = datetime.now()
         self.data_formatada = self.data_atual.strftime("%d/%m/%Y")
 
-    def _setup_styles(self):
-        self.styles.add(ParagraphStyle(
+    def _setup_styles(self, styles):
+        styles.add(ParagraphStyle(
             name='TermoDocTitle',
             fontSize=12,
             alignment=TA_CENTER,
@@ -51,7 +52,7 @@ class TermoAdesaoPDFGenerator:
             spaceAfter=10
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TermoCompanyHeader',
             fontSize=11,
             alignment=TA_CENTER,
@@ -59,7 +60,7 @@ class TermoAdesaoPDFGenerator:
             leading=13
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TermoCompanySubHeader',
             fontSize=9,
             alignment=TA_CENTER,
@@ -67,7 +68,7 @@ class TermoAdesaoPDFGenerator:
             leading=11
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TermoSectionTitle',
             fontSize=9,
             alignment=TA_CENTER,
@@ -76,7 +77,7 @@ class TermoAdesaoPDFGenerator:
             spaceAfter=3
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TermoBodyText',
             fontSize=8,
             alignment=TA_JUSTIFY,
@@ -85,7 +86,7 @@ class TermoAdesaoPDFGenerator:
             spaceAfter=4
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TermoSmallText',
             fontSize=7,
             alignment=TA_JUSTIFY,
@@ -94,14 +95,14 @@ class TermoAdesaoPDFGenerator:
             spaceAfter=3
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TermoFooter',
             fontSize=8,
             alignment=TA_CENTER,
             fontName='Helvetica'
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TermoWarning',
             fontSize=10,
             alignment=TA_CENTER,
@@ -141,11 +142,10 @@ class TermoAdesaoPDFGenerator:
     def _create_header(self, elements):
         """Cabeçalho do documento"""
         # Logo Capital Brasil (proporção 1.44:1)
-        if os.path.exists(self.logo_path):
+        if pdf_assets.existe(self.LOGO):
             logo_width = 3.5*cm
             logo_height = logo_width / 1.44
-            logo = Image(self.logo_path, width=logo_width, height=logo_height)
-            logo.hAlign = 'CENTER'
+            logo = pdf_assets.imagem_flowable(self.LOGO, logo_width, logo_height)
             elements.append(logo)
             elements.append(Spacer(1, 0.1*cm))
         else:
@@ -603,7 +603,8 @@ class TermoAdesaoPDFGenerator:
             rightMargin=1.5*cm,
             leftMargin=1.5*cm,
             topMargin=1.5*cm,
-            bottomMargin=2*cm
+            bottomMargin=2*cm,
+            **pdf_otimizacao.OPCOES_REPORTLAB
         )
 
         elements = []
@@ -614,5 +615,4 @@ class TermoAdesaoPDFGenerator:
         self._create_page3(elements)
 
         doc.build(elements, onFirstPage=self._add_footer, onLaterPages=self._add_footer)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_otimizacao.otimizar(buffer.getvalue(), "termo")
@@ -0,0 +1,218 @@
+"""
+Servidor de produção: uvicorn com prefork
+
+    python -m app.servidor --workers 4
+
+O processo mestre abre o socket, importa a aplicação e roda o aquecimento
+compartilhado (app.core.aquecimento) uma única vez; depois faz fork dos
+workers, que herdam o app já carregado (copy-on-write) e só abrem as próprias
+conexões antes de responder /ready. Os workers da fila de jobs também são
+do mestre (um conjunto por instância, não um por worker HTTP).
+
+- Workers: SERVIDOR_WORKERS ou, com 0, as CPUs do container (afinidade e
+  cota do cgroup) limitadas a MAX_WORKERS_PADRAO; o pool de PDFs de cada
+  worker fica com a sua parte dessas CPUs (app.services.pdf_pool)
+
+- Worker que morre é substituído (com pausa se morrer logo após subir)
+- SIGTERM/SIGINT no mestre: drenagem dos workers. Cada um responde /ready
+  com 503 por SERVIDOR_ATRASO_DRENAGEM segundos ainda atendendo, para de
+  aceitar conexões e espera as requisições em andamento por até
+  SERVIDOR_DRENAGEM_SEGUNDOS; quem passar disso recebe SIGKILL
+- Em desenvolvimento continue com `uvicorn app.main:app --reload`
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from app.core import cpus
+from app.core.config import settings
+
+
+MAX_WORKERS_PADRAO = 4
+PAUSA_REINICIO = 1.0  # worker que morre em menos que isso espera antes de voltar
+SINAIS_PARADA = (signal.SIGTERM, signal.SIGINT)
+
+
+def abrir_socket(host, porta, backlog):
+    """Socket de escuta compartilhado por todos os workers"""
+    familia = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(familia, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, porta))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class ServidorWorker(uvicorn.Server):
+    """uvicorn.Server que sai de /ready antes de parar de aceitar conexões"""
+
+    def __init__(self, config, atraso_drenagem):
+        super().__init__(config)
+        self.atraso_drenagem = atraso_drenagem
+        self.fim_atraso = None
+
+    def handle_exit(self, sig, frame):
+        if self.atraso_drenagem > 0 and self.fim_atraso is None and not self.should_exit:
+            from app.core import inicializacao
+            inicializacao.marcar_pronto(False)
+            self.fim_atraso = time.monotonic() + self.atraso_drenagem
+            return
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter):
+        if self.fim_atraso is not None and time.monotonic() >= self.fim_atraso:
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+def _rodar_worker(app, sock, args):
+    """Corpo do processo filho (nunca retorna)"""
+    codigo = 0
+    try:
+        for sinal in SINAIS_PARADA:
+            signal.signal(sinal, signal.SIG_DFL)
+        # Conexões herdadas do mestre não podem ser usadas pelos dois processos
+        from app.core.database import engine
+        engine.dispose(close=False)
+        from app.services import job_worker
+        job_worker.delegar_ao_mestre()
+        # Imports já pagos no mestre: o cold start do worker conta a partir do fork
+        sys.modules["app.main"].INICIO_IMPORTS = time.perf_counter()
+
+        config = uvicorn.Config(
+            app,
+            lifespan="on",
+            timeout_keep_alive=args.keepalive,
+            backlog=args.backlog,
+            timeout_graceful_shutdown=args.drenagem,
+            proxy_headers=True,
+        )
+        ServidorWorker(config, args.atraso_drenagem).run(sockets=[sock])
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        codigo = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(codigo)
+
+
+class Mestre:
+    def __init__(self, app, sock, args):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers = {}  # pid -> instante do fork
+        self.parando = False
+
+    def _fork(self):
+        pid = os.fork()
+        if pid == 0:
+            _rodar_worker(self.app, self.sock, self.args)
+        self.workers[pid] = time.monotonic()
+
+    def _parar(self, sinal, frame):
+        if self.parando:
+            return
+        self.parando = True
+        print(f"Encerrando {len(self.workers)} worker(s) (drenagem até {self.args.drenagem}s)...")
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _coletar(self):
+        """Recolhe workers encerrados; devolve os que morreram cedo demais"""
+        precoces = 0
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                break
+            if pid == 0:
+                break
+            inicio = self.workers.pop(pid, None)
+            if inicio is None or self.parando:
+                continue
+            print(f"Worker {pid} terminou (status {os.waitstatus_to_exitcode(status)}), iniciando outro")
+            precoces += time.monotonic() - inicio < PAUSA_REINICIO
+        return precoces
+
+    def rodar(self):
+        for sinal in SINAIS_PARADA:
+            signal.signal(sinal, self._parar)
+        for _ in range(self.args.workers):
+            self._fork()
+        print(f"Mestre {os.getpid()}: {self.args.workers} worker(s) em {self.args.host}:{self.args.porta}")
+
+        while not self.parando:
+            if self._coletar():
+                time.sleep(PAUSA_REINICIO)
+            while not self.parando and len(self.workers) < self.args.workers:
+                self._fork()
+            time.sleep(0.2)
+
+        limite = time.monotonic() + self.args.atraso_drenagem + self.args.drenagem + 5
+        while self.workers and time.monotonic() < limite:
+            self._coletar()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            print(f"Worker {pid} não terminou a drenagem, enviando SIGKILL")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de produção (uvicorn com prefork)")
+    parser.add_argument("--host", default=settings.SERVIDOR_HOST)
+    parser.add_argument("--porta", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVIDOR_WORKERS, help=f"0 = CPUs do container, até {MAX_WORKERS_PADRAO}")
+    parser.add_argument("--keepalive", type=int, default=settings.SERVIDOR_KEEPALIVE,
+                        help="Segundos de keep-alive ocioso")
+    parser.add_argument("--backlog", type=int, default=settings.SERVIDOR_BACKLOG)
+    parser.add_argument("--drenagem", type=int, default=settings.SERVIDOR_DRENAGEM_SEGUNDOS,
+                        help="Espera máxima pelas requisições em andamento no shutdown")
+    parser.add_argument("--atraso-drenagem", type=float, default=settings.SERVIDOR_ATRASO_DRENAGEM,
+                        help="Segundos com /ready em 503 antes de fechar o socket")
+    args = parser.parse_args(argv)
+    args.workers = args.workers or min(cpus.disponiveis(), MAX_WORKERS_PADRAO)
+
+    sock = abrir_socket(args.host, args.porta, args.backlog)
+
+    # Preload: import e aquecimento em memória uma vez, herdados pelos workers
+    inicio = time.perf_counter()
+    from app.core import aquecimento
+    from app.main import app
+    aquecimento.aquecer(apenas_compartilhadas=True)
+    # Objetos do preload fora do coletor: o GC não reescreve as páginas
+    # compartilhadas (o que desfaria o copy-on-write)
+    gc.collect()
+    gc.freeze()
+    print(f"Aplicação carregada em {(time.perf_counter() - inicio) * 1000:.0f}ms")
+
+    from app.services import job_worker, pdf_pool
+    pdf_pool.dividir_entre(args.workers)
+    job_worker.iniciar()
+    try:
+        Mestre(app, sock, args).rodar()
+    finally:
+        job_worker.encerrar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
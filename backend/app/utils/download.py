@@ -0,0 +1,13 @@
+"""
+Header Content-Disposition para downloads com nomes acentuados
+(nomes de clientes): `filename` ASCII para clientes antigos e `filename*`
+em UTF-8 (RFC 6266/5987). Headers HTTP só aceitam latin-1.
+"""
+import unicodedata
+from urllib.parse import quote
+
+
+def content_disposition(filename, tipo="attachment"):
+    ascii_nome = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+    ascii_nome = ascii_nome.replace('"', "").replace("\\", "")
+    return f"{tipo}; filename=\"{ascii_nome}\"; filename*=UTF-8''{quote(filename)}"
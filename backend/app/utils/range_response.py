@@ -0,0 +1,67 @@
+"""
+Respostas com suporte a Range (download parcial/retomada)
+Aceita um único intervalo `bytes=inicio-fim`, `bytes=inicio-` ou `bytes=-sufixo`;
+vários intervalos recebem o arquivo inteiro (permitido pela RFC 9110).
+"""
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from app.utils.download import content_disposition
+
+
+def intervalo(cabecalho, tamanho):
+    """
+    Converte o cabeçalho Range em (inicio, fim) inclusivos.
+    Retorna None para servir o arquivo inteiro e levanta ValueError se o
+    intervalo não puder ser atendido.
+    """
+    if not cabecalho or not cabecalho.startswith("bytes=") or "," in cabecalho:
+        return None
+    inicio_txt, _, fim_txt = cabecalho[len("bytes="):].strip().partition("-")
+    try:
+        if not inicio_txt:
+            sufixo = int(fim_txt)
+            if sufixo <= 0:
+                raise ValueError
+            return max(tamanho - sufixo, 0), tamanho - 1
+        inicio = int(inicio_txt)
+        fim = int(fim_txt) if fim_txt else tamanho - 1
+    except ValueError:
+        raise ValueError("Range inválido")
+    if inicio >= tamanho or fim < inicio:
+        raise ValueError("Range fora do arquivo")
+    return inicio, min(fim, tamanho - 1)
+
+
+def resposta_com_range(request, ler, tamanho, media_type, filename, etag=None):
+    """
+    `ler(inicio, fim)` gera os bytes do intervalo (inclusive).
+    Com ETag, If-None-Match responde 304 e If-Range diferente ignora o Range.
+    """
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": content_disposition(filename),
+    }
+    if etag:
+        headers["ETag"] = f'"{etag}"'
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+
+    cabecalho = request.headers.get("range")
+    if etag and request.headers.get("if-range") not in (None, headers["ETag"]):
+        cabecalho = None
+
+    try:
+        faixa = intervalo(cabecalho, tamanho)
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{tamanho}"
+        return Response(status_code=416, headers=headers)
+
+    if faixa is None:
+        headers["Content-Length"] = str(tamanho)
+        return StreamingResponse(ler(0, None), media_type=media_type, headers=headers)
+
+    inicio, fim = faixa
+    headers["Content-Range"] = f"bytes {inicio}-{fim}/{tamanho}"
+    headers["Content-Length"] = str(fim - inicio + 1)
+    return StreamingResponse(ler(inicio, fim), status_code=206, media_type=media_type, headers=headers)
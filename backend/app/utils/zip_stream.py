@@ -0,0 +1,36 @@
+"""
+ZIP em streaming: cada arquivo é emitido assim que é adicionado,
+sem montar o ZIP inteiro em memória.
+"""
+import zipfile
+
+
+class _SaidaZip:
+    """Destino não-posicionável: o zipfile grava data descriptors e não faz seek"""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def extrair(self):
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def stream_zip(arquivos, compression=zipfile.ZIP_DEFLATED):
+    """Recebe um iterável de (nome, bytes) e gera os bytes do ZIP"""
+    saida = _SaidaZip()
+    with zipfile.ZipFile(saida, mode="w", compression=compression) as zf:
+        for nome, conteudo in arquivos:
+            zf.writestr(nome, conteudo)
+            parte = saida.extrair()
+            if parte:
+                yield parte
+    yield saida.extrair()
@@ -0,0 +1,113 @@
+"""
+Benchmark da geração do contrato de venda (WeasyPrint).
+
+Compara, por contrato, o fluxo antigo (CSS embutido no HTML, analisado a cada
+documento, com configuração de fontes nova) com o atual (templates Jinja2
+compilados, CSS e fontes reaproveitados), separando análise do CSS, layout e
+escrita do PDF.
+
+Uso:
+    python scripts/benchmark_contrato.py --contratos 20
+"""
+import sys
+import os
+import argparse
+import statistics
+import time
+from datetime import date
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import weasyprint
+from weasyprint.text.fonts import FontConfiguration
+
+from app.services import contrato_venda_pdf
+from app.services.contrato_venda_pdf import ContratoVendaPDFGenerator
+
+
+def dados_exemplo(i):
+    cliente = SimpleNamespace(
+        id=i, nome=f"Cliente Exemplo {i}", cpf="52998224725", identidade="12.345.678-9",
+        data_nascimento=date(1985, 5, 20), sexo="feminino", cidade="Sao Paulo", estado="SP",
+        logradouro="Avenida Paulista", numero="1636", bairro="Bela Vista", cep="01310-200",
+        telefone="(11) 99999-0000", email=f"cliente{i}@exemplo.com", banco="001",
+        agencia="1234", conta="56789-0", chave_pix="52998224725",
+    )
+    beneficio = SimpleNamespace(
+        id=i, tipo_bem="imovel", valor_credito=250000, parcela=1850.75, prazo_grupo=200,
+        grupo="1020", cota=str(i), fundo_reserva=2, seguro_prestamista=0.04,
+        taxa_administracao=18, indice_correcao="INCC",
+        tabela_credito=SimpleNamespace(valor_intermediacao=3500),
+    )
+    representante = SimpleNamespace(nome="Preposto Exemplo", razao_social="Representacoes Exemplo LTDA")
+    return cliente, beneficio, representante
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+def fluxo_antigo(gerador, css_texto):
+    """CSS no <style> do documento: analisado de novo a cada contrato"""
+    html_texto = gerador.render_html().replace("<head>", f"<head><style>{css_texto}</style>", 1)
+    tempos = {}
+    css, tempos["css"] = medir(lambda: weasyprint.CSS(string=css_texto, font_config=FontConfiguration()))
+    documento, tempos["layout"] = medir(lambda: weasyprint.HTML(string=html_texto).render())
+    pdf, tempos["pdf"] = medir(documento.write_pdf)
+    return pdf, tempos
+
+
+def fluxo_atual(gerador):
+    tempos = {}
+    html_texto, tempos["template"] = medir(gerador.render_html)
+    css, tempos["css"] = medir(contrato_venda_pdf.folha_css)
+    documento, tempos["layout"] = medir(lambda: weasyprint.HTML(string=html_texto).render(
+        stylesheets=[css], font_config=contrato_venda_pdf.font_config()
+    ))
+    pdf, tempos["pdf"] = medir(documento.write_pdf)
+    return pdf, tempos
+
+
+def resumo(nome, execucoes):
+    etapas = execucoes[0].keys()
+    partes = [f"{etapa} {statistics.median(t[etapa] for t in execucoes):.1f}ms" for etapa in etapas]
+    total = statistics.median(sum(t.values()) for t in execucoes)
+    print(f"{nome:<8} total {total:.1f}ms | " + " | ".join(partes))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do contrato de venda (WeasyPrint)")
+    parser.add_argument("--contratos", type=int, default=20, help="Contratos gerados em cada fluxo")
+    args = parser.parse_args()
+
+    with open(contrato_venda_pdf.CSS_PATH, encoding="utf-8") as f:
+        css_texto = f.read()
+
+    # Aquece imports, fontconfig e o registro de assets antes de medir
+    fluxo_atual(ContratoVendaPDFGenerator(*dados_exemplo(0)))
+
+    antigo, atual = [], []
+    tamanho_antigo = tamanho_atual = 0
+    for i in range(1, args.contratos + 1):
+        gerador = ContratoVendaPDFGenerator(*dados_exemplo(i))
+        pdf, tempos = fluxo_antigo(gerador, css_texto)
+        antigo.append(tempos)
+        tamanho_antigo = len(pdf)
+        pdf, tempos = fluxo_atual(gerador)
+        atual.append(tempos)
+        tamanho_atual = len(pdf)
+
+    print(f"{args.contratos} contratos (mediana por contrato)")
+    total_antigo = resumo("antigo", antigo)
+    total_atual = resumo("atual", atual)
+    print(f"economia por contrato: {total_antigo - total_atual:.1f}ms "
+          f"({(1 - total_atual / total_antigo) * 100:.0f}%)")
+    print(f"tamanho do PDF: {tamanho_antigo / 1024:.0f}KB -> {tamanho_atual / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
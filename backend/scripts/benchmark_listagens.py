@@ -0,0 +1,91 @@
+"""
+Linha inteira no ORM contra projeção das colunas da resposta nas listagens
+de clientes e benefícios: tempo e pico de memória por página.
+
+Uso (banco de DATABASE_URL já populado, ex. por scripts/gerar_dados.py):
+    python scripts/benchmark_listagens.py --pagina 100 --repeticoes 20
+"""
+import sys
+import os
+import argparse
+import statistics
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import respostas
+from app.core.database import SessionLocal
+from app.models import *  # noqa: F401, F403
+from app.models.beneficio import Beneficio
+from app.models.cliente import Cliente
+from app.schemas.beneficio import BeneficioListResponse
+from app.schemas.cliente import ClienteListResponse
+
+
+def clientes_inteiros(db, pagina):
+    linhas = db.query(Cliente).order_by(Cliente.created_at.desc()).limit(pagina).all()
+    return respostas.lista(ClienteListResponse, linhas).body
+
+
+def clientes_projetados(db, pagina):
+    campos = respostas.campos(ClienteListResponse)
+    linhas = db.query(*(getattr(Cliente, c) for c in campos)).order_by(Cliente.created_at.desc()).limit(pagina).all()
+    return respostas.lista(ClienteListResponse, linhas, nomes=campos).body
+
+
+def beneficios_inteiros(db, pagina):
+    linhas = db.query(Beneficio, Cliente.nome).outerjoin(Cliente, Cliente.id == Beneficio.cliente_id) \
+        .order_by(Beneficio.created_at.desc()).limit(pagina).all()
+    itens = [
+        BeneficioListResponse(cliente_nome=nome, **{c: getattr(b, c) for c in BeneficioListResponse.model_fields
+                                                    if c != "cliente_nome"})
+        for b, nome in linhas
+    ]
+    return respostas.lista(BeneficioListResponse, itens, validar=False).body
+
+
+def beneficios_projetados(db, pagina):
+    campos = respostas.campos(BeneficioListResponse)
+    colunas = [(Cliente.nome if c == "cliente_nome" else getattr(Beneficio, c)).label(c) for c in campos]
+    linhas = db.query(*colunas).select_from(Beneficio).outerjoin(Cliente, Cliente.id == Beneficio.cliente_id) \
+        .order_by(Beneficio.created_at.desc()).limit(pagina).all()
+    return respostas.lista(BeneficioListResponse, linhas, nomes=campos).body
+
+
+def medir(funcao, pagina, repeticoes):
+    tempos, picos = [], []
+    for _ in range(repeticoes):
+        db = SessionLocal()
+        try:
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            funcao(db, pagina)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+            picos.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        finally:
+            db.close()
+    return statistics.median(tempos), statistics.median(picos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Linha inteira x projeção nas listagens")
+    parser.add_argument("--pagina", type=int, default=100)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    # tracemalloc deixa tudo mais lento: compare as linhas entre si, não com produção
+    print(f"{'listagem':<12}{'consulta':<12}{'ms/página':>11}{'pico KB':>10}")
+    for nome, inteiros, projetados in [
+        ("clientes", clientes_inteiros, clientes_projetados),
+        ("beneficios", beneficios_inteiros, beneficios_projetados),
+    ]:
+        for consulta, funcao in [("inteira", inteiros), ("projetada", projetados)]:
+            funcao(SessionLocal(), args.pagina)  # aquece mapeadores e caches de SQL
+            ms, pico = medir(funcao, args.pagina, args.repeticoes)
+            print(f"{nome:<12}{consulta:<12}{ms:>11.2f}{pico / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
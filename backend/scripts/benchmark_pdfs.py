@@ -0,0 +1,67 @@
+"""
+Relatório da otimização de PDFs: tamanho e tempo antes/depois para cada
+documento do dossiê de um benefício (ficha, planejamento, contrato e termo).
+
+Uso:
+    python scripts/benchmark_pdfs.py --beneficio-id 1 --repeticoes 5
+"""
+import sys
+import os
+import argparse
+import statistics
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import *  # noqa: F401, F403
+from app.services import documentos, pdf_otimizacao
+from app.services.pdf_pool import renderizar_documento
+
+
+def medir(tipo, dados, repeticoes):
+    brutos, otimizados = [], []
+    for _ in range(repeticoes):
+        settings.PDF_OTIMIZAR = False
+        inicio = time.perf_counter()
+        _, pdf_bytes = renderizar_documento(tipo, dados)
+        brutos.append((time.perf_counter() - inicio) * 1000)
+
+        settings.PDF_OTIMIZAR = True
+        inicio = time.perf_counter()
+        otimizado = pdf_otimizacao.otimizar(pdf_bytes, tipo)
+        otimizados.append((time.perf_counter() - inicio) * 1000)
+    return len(pdf_bytes), len(otimizado), statistics.median(brutos), statistics.median(otimizados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tamanho e tempo dos PDFs antes/depois da otimização")
+    parser.add_argument("--beneficio-id", type=int, required=True)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        dossie = documentos.carregar_dossie(db, args.beneficio_id)
+    finally:
+        db.close()
+    if dossie is None:
+        print(f"Benefício {args.beneficio_id} não encontrado")
+        return
+
+    print(f"{'documento':<14}{'antes':>10}{'depois':>10}{'redução':>10}{'render':>12}{'otimização':>12}")
+    for tipo, dados in dossie:
+        try:
+            antes, depois, ms_render, ms_otimizacao = medir(tipo, dados, args.repeticoes)
+        except (ImportError, OSError) as e:
+            # WeasyPrint sem as bibliotecas do sistema (pango)
+            print(f"{tipo:<14}indisponível: {e}")
+            continue
+        reducao = (1 - depois / antes) * 100 if antes else 0
+        print(f"{tipo:<14}{antes / 1024:>8.0f}KB{depois / 1024:>8.0f}KB{reducao:>9.0f}%"
+              f"{ms_render:>10.0f}ms{ms_otimizacao:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Custo de serialização das listagens por 1000 linhas: caminho padrão do
+FastAPI (validação do response_model + json) contra as respostas prontas de
+app.core.respostas (JSON e ?format=compact). Não usa banco: as linhas são
+objetos ORM transitórios.
+
+Uso:
+    python scripts/benchmark_serializacao.py --linhas 1000 --repeticoes 20
+"""
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core import respostas
+from app.models import *  # noqa: F401, F403
+from app.models.cliente import Cliente
+from app.schemas.beneficio import BeneficioListResponse
+from app.schemas.cliente import ClienteListResponse
+
+
+def clientes(n):
+    inicio = datetime(2025, 1, 1)
+    return [
+        Cliente(id=i, nome=f"Cliente {i} da Silva", cpf=f"{i:03d}.000.000-00", telefone="(11) 90000-0000",
+                email=f"cliente{i}@exemplo.com.br", cidade="São Paulo", estado="SP",
+                salario=Decimal("8500.00") + i, ativo=True, created_at=inicio + timedelta(minutes=i))
+        for i in range(n)
+    ]
+
+
+def beneficios(n):
+    inicio = datetime(2025, 1, 1)
+    return [
+        BeneficioListResponse(id=i, cliente_id=i, cliente_nome=f"Cliente {i} da Silva", tipo_bem="imovel",
+                              valor_credito=Decimal("250000.00"), parcela=Decimal("1850.75"), prazo_grupo=180,
+                              status="proposto", grupo="1234", cota=str(i), created_at=inicio + timedelta(minutes=i))
+        for i in range(n)
+    ]
+
+
+def padrao_fastapi(modelo, classe_resposta):
+    """O que a rota faz ao devolver objetos com response_model=List[modelo]"""
+    campo = create_response_field(name="resposta", type_=List[modelo])
+
+    def serializar(itens):
+        conteudo = asyncio.run(serialize_response(field=campo, response_content=itens))
+        return classe_resposta(conteudo).body
+    return serializar
+
+
+def medir(serializar, itens, repeticoes):
+    serializar(itens)  # aquece caches do pydantic
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        corpo = serializar(itens)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), len(corpo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Custo de serialização das listagens por 1000 linhas")
+    parser.add_argument("--linhas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    casos = [
+        ("clientes", ClienteListResponse, clientes(args.linhas), True),
+        ("beneficios", BeneficioListResponse, beneficios(args.linhas), False),
+    ]
+    escala = 1000 / args.linhas
+    print(f"{'listagem':<12}{'caminho':<26}{'ms/1000':>10}{'KB/1000':>10}{'ganho':>8}")
+    for nome, modelo, itens, validar in casos:
+        caminhos = [
+            ("response_model + json", padrao_fastapi(modelo, JSONResponse)),
+            ("response_model + orjson", padrao_fastapi(modelo, ORJSONResponse)),
+            ("respostas.lista", lambda x: respostas.lista(modelo, x, validar=validar).body),
+            ("respostas.lista compact", lambda x: respostas.lista(modelo, x, "compact", validar=validar).body),
+        ]
+        base = None
+        for caminho, serializar in caminhos:
+            ms, tamanho = medir(serializar, itens, args.repeticoes)
+            base = base or ms
+            print(f"{nome:<12}{caminho:<26}{ms * escala:>10.2f}{tamanho * escala / 1024:>10.1f}{base / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Job de elegibilidade para campanhas: grava em CSV as top-N tabelas de crédito
+para as quais cada cliente ativo se qualifica.
+
+Uso:
+    python scripts/elegibilidade_campanha.py --saida elegibilidade.csv --top-n 3 --tipo-bem imovel
+"""
+import sys
+import os
+import argparse
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.models import *  # noqa: F401, F403
+from app.services.elegibilidade import carregar_indice_tabelas, gerar_csv, CHUNK_PADRAO
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Elegibilidade de clientes x tabelas de crédito")
+    parser.add_argument("--saida", default="elegibilidade.csv", help="Arquivo CSV de saída")
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--tipo-bem", choices=["imovel", "carro", "moto"])
+    parser.add_argument("--unidade-id", type=int)
+    parser.add_argument("--chunk", type=int, default=CHUNK_PADRAO)
+    parser.add_argument("--incluir-inativos", action="store_true")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        indice = carregar_indice_tabelas(db, top_n=args.top_n, tipo_bem=args.tipo_bem)
+        print(f"{len(indice.tabelas)} tabelas ativas carregadas")
+        with open(args.saida, "w", encoding="utf-8", newline="") as f:
+            for parte in gerar_csv(db, indice, chunk=args.chunk, unidade_id=args.unidade_id,
+                                   apenas_ativos=not args.incluir_inativos):
+                f.write(parte)
+    finally:
+        db.close()
+
+    print(f"Arquivo gerado: {args.saida} ({time.perf_counter() - inicio:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+"""
+Gerador de dados sintéticos em volume (testes de desempenho)
+
+Cria clientes com CPF válido, benefícios distribuídos entre todos os status
+com datas coerentes com o workflow, histórico de cada transição, faixas de
+parcelas, tabelas de crédito e unidades. A mesma --seed com os mesmos
+parâmetros (e o mesmo banco de partida) gera exatamente os mesmos dados.
+
+- PostgreSQL: COPY ... FROM STDIN em CSV, um lote por transação
+- Outros bancos: INSERT em lote (executemany)
+- Os IDs são atribuídos pelo gerador (a partir do MAX(id) atual) e as
+  sequences do PostgreSQL são ajustadas ao final
+
+Uso:
+    python scripts/gerar_dados.py --clientes 1000000 --seed 42
+    python scripts/gerar_dados.py --clientes 50000 --status "ativo=50,cancelado=10,rascunho=40"
+"""
+import sys
+import os
+import argparse
+import csv
+import io
+import random
+import time
+from datetime import datetime, timedelta, date
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, text
+
+from app.core.database import engine
+from app.models import *  # noqa: F401, F403
+from app.models.administradora import Administradora
+from app.models.beneficio import Beneficio
+from app.models.beneficio_faixa import BeneficioFaixa
+from app.models.beneficio_historico import BeneficioHistorico
+from app.models.cliente import Cliente
+from app.models.empresa import Empresa
+from app.models.tabela_credito import TabelaCredito
+from app.models.unidade import Unidade
+from app.models.usuario import Usuario
+
+
+# Mesma ordem do workflow em PATCH /beneficios/{id}/status
+STATUS_FLUXO = [
+    "rascunho", "proposto", "aceito", "contrato_gerado", "contrato_assinado",
+    "aguardando_cadastro", "cadastrado", "termo_gerado", "ativo",
+]
+DATA_POR_STATUS = {
+    "proposto": ("data_proposta",),
+    "aceito": ("data_aceite",),
+    "rejeitado": ("data_rejeicao",),
+    "contrato_gerado": ("data_contrato",),
+    "contrato_assinado": ("data_assinatura_contrato",),
+    "cadastrado": ("data_cadastro_administradora",),
+    "termo_gerado": ("data_termo",),
+    "ativo": ("data_ativacao", "data_assinatura_termo"),
+    "cancelado": ("data_cancelamento",),
+}
+DISTRIBUICAO_STATUS = (
+    "rascunho=8,proposto=10,aceito=6,contrato_gerado=5,contrato_assinado=5,"
+    "aguardando_cadastro=6,cadastrado=5,termo_gerado=5,ativo=35,rejeitado=7,cancelado=8"
+)
+DISTRIBUICAO_BENEFICIOS = "0=15,1=60,2=20,3=5"
+
+TABELAS_BASE = {
+    # tipo_bem: (créditos, prazos, fundo de reserva)
+    "imovel": ((50000, 75000, 100000, 150000, 200000, 300000, 400000), (120, 150, 180, 200), Decimal("2.5")),
+    "carro": ((30000, 50000, 70000, 90000, 120000), (60, 72, 80, 100), Decimal("3.0")),
+    "moto": ((10000, 15000, 20000, 30000), (48, 60, 72), Decimal("3.5")),
+}
+PESO_TIPO_BEM = {"imovel": 5, "carro": 3, "moto": 2}
+
+NOMES_F = ["Maria", "Ana", "Francisca", "Antônia", "Adriana", "Juliana", "Márcia", "Fernanda",
+           "Patrícia", "Aline", "Sandra", "Camila", "Amanda", "Bruna", "Jéssica", "Letícia"]
+NOMES_M = ["José", "João", "Antônio", "Francisco", "Carlos", "Paulo", "Pedro", "Lucas",
+           "Luiz", "Marcos", "Luís", "Gabriel", "Rafael", "Daniel", "Marcelo", "Bruno"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira",
+              "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes",
+              "Soares", "Fernandes", "Vieira", "Barbosa", "Rocha", "Dias", "Nascimento", "Andrade"]
+CIDADES = [("São Paulo", "SP", "011"), ("Rio de Janeiro", "RJ", "021"), ("Belo Horizonte", "MG", "031"),
+           ("Salvador", "BA", "071"), ("Fortaleza", "CE", "085"), ("Brasília", "DF", "061"),
+           ("Curitiba", "PR", "041"), ("Recife", "PE", "081"), ("Porto Alegre", "RS", "051"),
+           ("Goiânia", "GO", "062"), ("Manaus", "AM", "092"), ("Belém", "PA", "091")]
+ESTADOS_CIVIS = ["solteiro", "casado", "divorciado", "viuvo", "uniao_estavel"]
+CARGOS = ["Auxiliar administrativo", "Vendedor", "Professor", "Enfermeiro", "Motorista",
+          "Analista", "Técnico", "Servidor público", "Autônomo", "Comerciante"]
+MOTIVOS_REJEICAO = ["Parcela acima do orçamento", "Desistiu da proposta", "Prefere outra administradora"]
+MOTIVOS_CANCELAMENTO = ["Solicitação do cliente", "Restrição cadastral", "Falta de pagamento da adesão"]
+
+# Passo coprimo com 10^9: i -> (inicio + i * passo) mod 10^9 não repete bases de CPF
+PASSO_CPF = 387_420_489
+
+
+# ===================== AUXILIARES =====================
+
+def distribuicao(texto):
+    """"a=1,b=2" -> (valores, pesos)"""
+    valores, pesos = [], []
+    for item in texto.split(","):
+        chave, _, peso = item.partition("=")
+        valores.append(chave.strip())
+        pesos.append(float(peso))
+    return valores, pesos
+
+
+def digitos_cpf(base):
+    numeros = [int(d) for d in base]
+    for tamanho in (9, 10):
+        soma = sum(n * (tamanho + 1 - i) for i, n in enumerate(numeros[:tamanho]))
+        resto = soma * 10 % 11
+        numeros.append(0 if resto == 10 else resto)
+    return "".join(str(n) for n in numeros)
+
+
+def cpf(indice, inicio):
+    base = f"{(inicio + indice * PASSO_CPF) % 1_000_000_000:09d}"
+    if len(set(base)) == 1:
+        # 000.000.000-00, 111.111.111-11... são inválidos; usa uma base do fim do intervalo
+        base = f"{(inicio + (999_999_999 - int(base[0])) * PASSO_CPF) % 1_000_000_000:09d}"
+    d = digitos_cpf(base)
+    return f"{d[:3]}.{d[3:6]}.{d[6:9]}-{d[9:]}"
+
+
+def proximo_id(conn, modelo):
+    return (conn.execute(select(func.max(modelo.id))).scalar() or 0) + 1
+
+
+def inserir(conn, modelo, linhas, copy):
+    if not linhas:
+        return
+    tabela = modelo.__table__
+    colunas = list(linhas[0].keys())
+    if not copy:
+        conn.execute(tabela.insert(), linhas)
+        return
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    for linha in linhas:
+        escritor.writerow(linha[c] for c in colunas)
+    buffer.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {tabela.name} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
+
+
+# ===================== CADASTROS BASE =====================
+
+def garantir_unidades(conn, quantidade):
+    ids = list(conn.execute(select(Unidade.id).where(Unidade.ativo == True).order_by(Unidade.id)).scalars())
+    faltam = quantidade - len(ids)
+    if faltam > 0:
+        inicio = proximo_id(conn, Unidade)
+        linhas = []
+        for i in range(faltam):
+            cidade, estado, _ = CIDADES[(len(ids) + i) % len(CIDADES)]
+            linhas.append({
+                "id": inicio + i, "nome": f"Unidade {cidade} {inicio + i}", "codigo": f"GEN{inicio + i:05d}",
+                "cidade": cidade, "estado": estado, "ativo": True,
+            })
+        conn.execute(Unidade.__table__.insert(), linhas)
+        ids += [l["id"] for l in linhas]
+        print(f"Unidades criadas: {faltam}")
+    return ids
+
+
+def garantir_tabelas(conn, quantidade, rng):
+    administradoras = list(conn.execute(select(Administradora.id).order_by(Administradora.id)).scalars())
+    if not administradoras:
+        inicio = proximo_id(conn, Administradora)
+        conn.execute(Administradora.__table__.insert(), [
+            {"id": inicio, "nome": "Administradora Sintética A", "cnpj": "00.000.001/0001-00", "ativo": True},
+            {"id": inicio + 1, "nome": "Administradora Sintética B", "cnpj": "00.000.002/0001-00", "ativo": True},
+        ])
+        administradoras = [inicio, inicio + 1]
+
+    tabelas = conn.execute(
+        select(TabelaCredito).where(TabelaCredito.ativo == True).order_by(TabelaCredito.id)
+    ).all()
+    faltam = quantidade - len(tabelas)
+    if faltam > 0:
+        inicio = proximo_id(conn, TabelaCredito)
+        tipos = list(PESO_TIPO_BEM)
+        linhas = []
+        for i in range(faltam):
+            tipo = tipos[i % len(tipos)]
+            creditos, prazos, fundo = TABELAS_BASE[tipo]
+            credito = rng.choice(creditos)
+            prazo = rng.choice(prazos)
+            taxa = Decimal(rng.choice(("18.0", "22.0", "26.0")))
+            parcela = (Decimal(credito) * (1 + taxa / 100 + fundo / 100) / prazo).quantize(Decimal("0.01"))
+            linhas.append({
+                "id": inicio + i, "nome": f"{tipo.capitalize()} {credito // 1000}K - {prazo}m #{inicio + i}",
+                "tipo_bem": tipo, "prazo": prazo, "valor_credito": Decimal(credito), "parcela": parcela,
+                "fundo_reserva": fundo, "taxa_administracao": taxa, "seguro_prestamista": Decimal("0.0"),
+                "valor_intermediacao": Decimal("0"), "indice_correcao": "INCC" if tipo == "imovel" else "IPCA",
+                "qtd_participantes": 4076, "tipo_plano": "Normal", "ativo": True,
+                "administradora_id": administradoras[i % len(administradoras)],
+            })
+        conn.execute(TabelaCredito.__table__.insert(), linhas)
+        print(f"Tabelas de crédito criadas: {faltam}")
+        tabelas = conn.execute(
+            select(TabelaCredito).where(TabelaCredito.ativo == True).order_by(TabelaCredito.id)
+        ).all()
+    return tabelas
+
+
+# ===================== GERAÇÃO =====================
+
+class Gerador:
+    def __init__(self, args, rng, unidades, empresas, usuarios, tabelas, ids):
+        self.args = args
+        self.rng = rng
+        self.unidades = unidades
+        self.empresas = empresas
+        self.usuarios = usuarios
+        self.tabelas = tabelas
+        self.tabelas_por_tipo = {
+            tipo: [t for t in tabelas if t.tipo_bem == tipo] or tabelas for tipo in PESO_TIPO_BEM
+        }
+        self.ids = ids
+        self.status, self.pesos_status = distribuicao(args.status)
+        qtds, pesos = distribuicao(args.beneficios_por_cliente)
+        self.qtds_beneficios, self.pesos_beneficios = [int(q) for q in qtds], pesos
+        self.fim = datetime.combine(args.ate, datetime.min.time())
+        self.janela = args.dias * 86400
+        self.inicio_cpf = rng.randrange(1_000_000_000)
+
+    def _novo_id(self, tabela):
+        valor = self.ids[tabela]
+        self.ids[tabela] += 1
+        return valor
+
+    def cliente(self, indice):
+        rng = self.rng
+        feminino = rng.random() < 0.52
+        nome = f"{rng.choice(NOMES_F if feminino else NOMES_M)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+        cidade, estado, ddd = rng.choice(CIDADES)
+        criado = self.fim - timedelta(seconds=rng.randrange(self.janela))
+        salario = Decimal(rng.randrange(1500, 25000))
+        estado_civil = rng.choice(ESTADOS_CIVIS)
+        return {
+            "id": self._novo_id("clientes"),
+            "natureza": "fisica",
+            "nome": nome,
+            "cpf": cpf(indice, self.inicio_cpf),
+            "sexo": "feminino" if feminino else "masculino",
+            "data_nascimento": date(rng.randint(1950, 2003), rng.randint(1, 12), rng.randint(1, 28)),
+            "nacionalidade": "Brasileira",
+            "naturalidade": cidade,
+            "estado_civil": estado_civil,
+            "telefone": f"({ddd[1:]}) 9{rng.randrange(10000000, 99999999)}",
+            "email": f"{nome.split()[0].lower()}.{indice}@exemplo.com.br",
+            "cep": f"{rng.randrange(10000, 99999)}-{rng.randrange(1000):03d}",
+            "logradouro": f"Rua {rng.choice(SOBRENOMES)}",
+            "numero": str(rng.randint(1, 3000)),
+            "bairro": "Centro",
+            "cidade": cidade,
+            "estado": estado,
+            "cargo": rng.choice(CARGOS),
+            "salario": salario,
+            "parcela_maxima": (salario * Decimal("0.3")).quantize(Decimal("0.01")),
+            "possui_restricao": rng.random() < 0.1,
+            "unidade_id": rng.choice(self.unidades),
+            "empresa_id": rng.choice(self.empresas) if self.empresas else None,
+            "representante_id": rng.choice(self.usuarios),
+            "ativo": True,
+            "created_at": criado,
+            "updated_at": criado,
+        }
+
+    def _trilha(self, status):
+        """Sequência de transições (status_anterior, status_novo, acao) até o status final"""
+        if status == "rejeitado":
+            caminho = ["rascunho", "proposto"]
+        elif status == "cancelado":
+            # Cancelamento acontece em qualquer etapa que permite cancelar
+            caminho = STATUS_FLUXO[:self.rng.choice((1, 3, 4, 5, 6, 7, 8))]
+        else:
+            caminho = STATUS_FLUXO[:STATUS_FLUXO.index(status) + 1]
+        trilha = [(a, b, "avancou") for a, b in zip(caminho, caminho[1:])]
+        if status == "rejeitado":
+            trilha.append(("proposto", "rejeitado", "rejeitou"))
+        elif status == "cancelado":
+            trilha.append((caminho[-1], "cancelado", "cancelou"))
+        # Algumas idas e vindas (ação "voltou") no meio do fluxo
+        if len(trilha) > 2 and self.rng.random() < 0.05:
+            anterior, novo, _ = trilha[1]
+            trilha[2:2] = [(novo, anterior, "voltou"), (anterior, novo, "avancou")]
+        return trilha
+
+    def beneficio(self, cliente):
+        rng = self.rng
+        status = rng.choices(self.status, self.pesos_status)[0]
+        tipo = rng.choices(list(PESO_TIPO_BEM), list(PESO_TIPO_BEM.values()))[0]
+        tabela = rng.choice(self.tabelas_por_tipo[tipo])
+        usuario_id = rng.choice(self.usuarios)
+
+        momento = cliente["created_at"] + timedelta(minutes=rng.randrange(5, 60 * 24 * 7))
+        beneficio = {
+            "id": self._novo_id("beneficios"),
+            "cliente_id": cliente["id"],
+            "unidade_id": cliente["unidade_id"],
+            "empresa_id": cliente["empresa_id"],
+            "tabela_credito_id": tabela.id,
+            "administradora_id": tabela.administradora_id,
+            "tipo_bem": tabela.tipo_bem,
+            "prazo_grupo": tabela.prazo,
+            "valor_credito": tabela.valor_credito,
+            "parcela": tabela.parcela,
+            "fundo_reserva": tabela.fundo_reserva,
+            "taxa_administracao": tabela.taxa_administracao,
+            "seguro_prestamista": tabela.seguro_prestamista,
+            "indice_correcao": tabela.indice_correcao,
+            "valor_demais_parcelas": tabela.parcela,
+            "qtd_participantes": tabela.qtd_participantes,
+            "tipo_plano": tabela.tipo_plano,
+            "grupo": None,
+            "cota": None,
+            "status": status,
+            "motivo_rejeicao": None,
+            "motivo_cancelamento": None,
+            "ativo": True,
+            "created_at": momento,
+        }
+        for campos in DATA_POR_STATUS.values():
+            for campo in campos:
+                beneficio[campo] = None
+
+        historicos = []
+        for anterior, novo, acao in self._trilha(status):
+            # Intervalos de horas a poucos dias entre as etapas, sem passar da data final
+            momento = min(momento + timedelta(minutes=rng.randrange(30, 60 * 24 * 5)), self.fim)
+            for campo in DATA_POR_STATUS.get(novo, ()):
+                beneficio[campo] = momento
+            observacao = None
+            if novo == "rejeitado":
+                observacao = beneficio["motivo_rejeicao"] = rng.choice(MOTIVOS_REJEICAO)
+            elif novo == "cancelado":
+                observacao = beneficio["motivo_cancelamento"] = rng.choice(MOTIVOS_CANCELAMENTO)
+            elif novo == "cadastrado":
+                beneficio["grupo"] = f"{rng.randrange(1000, 9999)}"
+                beneficio["cota"] = f"{rng.randrange(1, 4076):04d}"
+            historicos.append({
+                "id": self._novo_id("beneficio_historicos"),
+                "beneficio_id": beneficio["id"],
+                "usuario_id": usuario_id,
+                "status_anterior": anterior,
+                "status_novo": novo,
+                "acao": acao,
+                "observacao": observacao,
+                "created_at": momento,
+            })
+        beneficio["updated_at"] = momento
+        return beneficio, historicos
+
+    def faixas(self, beneficio):
+        """
+        Faixas contíguas cobrindo o prazo do grupo (parcelas reduzidas no início).
+        Percentuais mensais derivados do prazo: somando todas as parcelas, o fundo
+        comum dá 100% do crédito e administração e reserva dão as taxas do
+        benefício; valor_parcela = crédito × percentuais da faixa.
+        """
+        quantidade = self.rng.randint(0, self.args.faixas_por_beneficio)
+        if quantidade == 0:
+            return []
+        prazo = beneficio["prazo_grupo"]
+        cortes = sorted(self.rng.sample(range(2, prazo), min(quantidade - 1, prazo - 3)))
+        limites = list(zip([1] + cortes, cortes + [prazo + 1]))
+        fatores = [Decimal("0.5") + Decimal("0.5") * (i + 1) / len(limites) for i in range(len(limites))]
+        # Parcelas "cheias" equivalentes: cada mês da faixa i pesa fatores[i]
+        meses_equivalentes = sum((fim - inicio) * fator for (inicio, fim), fator in zip(limites, fatores))
+        totais = {
+            "perc_fundo_comum": Decimal(100),
+            "perc_administracao": Decimal(beneficio["taxa_administracao"] or 0),
+            "perc_reserva": Decimal(beneficio["fundo_reserva"] or 0),
+        }
+        quatro_casas = Decimal("0.0001")
+        linhas = []
+        for (inicio, fim), fator in zip(limites, fatores):
+            percentuais = {campo: (total * fator / meses_equivalentes).quantize(quatro_casas)
+                           for campo, total in totais.items()}
+            percentuais["perc_seguro"] = Decimal(beneficio["seguro_prestamista"] or 0).quantize(quatro_casas)
+            linhas.append({
+                "id": self._novo_id("beneficio_faixas"),
+                "beneficio_id": beneficio["id"],
+                "parcela_inicio": inicio,
+                "parcela_fim": fim - 1,
+                **percentuais,
+                "valor_parcela": (beneficio["valor_credito"] * sum(percentuais.values()) / 100).quantize(Decimal("0.01")),
+                "created_at": beneficio["created_at"],
+            })
+        return linhas
+
+    def lote(self, inicio, quantidade):
+        clientes, beneficios, historicos, faixas = [], [], [], []
+        for indice in range(inicio, inicio + quantidade):
+            cliente = self.cliente(indice)
+            clientes.append(cliente)
+            for _ in range(self.rng.choices(self.qtds_beneficios, self.pesos_beneficios)[0]):
+                beneficio, trilha = self.beneficio(cliente)
+                beneficios.append(beneficio)
+                historicos.extend(trilha)
+                faixas.extend(self.faixas(beneficio))
+        return clientes, beneficios, historicos, faixas
+
+
+def ajustar_sequences(conn):
+    for tabela in ("unidades", "administradoras", "tabelas_credito", "clientes",
+                   "beneficios", "beneficio_historicos", "beneficio_faixas"):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {tabela}), 0) + 1, false)"
+        ))
+        conn.execute(text(f"ANALYZE {tabela}"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos em volume para testes de desempenho")
+    parser.add_argument("--clientes", type=int, default=10000)
+    parser.add_argument("--beneficios-por-cliente", default=DISTRIBUICAO_BENEFICIOS,
+                        help=f"Quantidade=peso (padrão {DISTRIBUICAO_BENEFICIOS})")
+    parser.add_argument("--status", default=DISTRIBUICAO_STATUS, help="Status=peso dos benefícios")
+    parser.add_argument("--faixas-por-beneficio", type=int, default=3, help="Máximo de faixas por benefício")
+    parser.add_argument("--unidades", type=int, default=10, help="Mínimo de unidades ativas")
+    parser.add_argument("--tabelas", type=int, default=30, help="Mínimo de tabelas de crédito ativas")
+    parser.add_argument("--dias", type=int, default=730, help="Janela de criação dos clientes")
+    parser.add_argument("--ate", type=date.fromisoformat, default=date(2025, 12, 31),
+                        help="Data final da janela (fixa para a geração ser reproduzível)")
+    parser.add_argument("--lote", type=int, default=5000, help="Clientes por transação")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sem-copy", action="store_true", help="Usa INSERT em lote mesmo no PostgreSQL")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    copy = engine.dialect.name == "postgresql" and not args.sem_copy
+
+    with engine.begin() as conn:
+        usuarios = list(conn.execute(
+            select(Usuario.id).where(Usuario.ativo == True).order_by(Usuario.id)
+        ).scalars())
+        if not usuarios:
+            print("Nenhum usuário ativo: inicie a aplicação (seed inicial) antes de gerar dados")
+            return
+        unidades = garantir_unidades(conn, args.unidades)
+        tabelas = garantir_tabelas(conn, args.tabelas, rng)
+        empresas = list(conn.execute(select(Empresa.id).order_by(Empresa.id)).scalars())
+        ids = {
+            "clientes": proximo_id(conn, Cliente),
+            "beneficios": proximo_id(conn, Beneficio),
+            "beneficio_historicos": proximo_id(conn, BeneficioHistorico),
+            "beneficio_faixas": proximo_id(conn, BeneficioFaixa),
+        }
+
+    gerador = Gerador(args, rng, unidades, empresas, usuarios, tabelas, ids)
+    # O índice do CPF parte do primeiro ID livre: execuções seguidas não repetem CPFs
+    primeiro = ids["clientes"]
+    totais = {"clientes": 0, "beneficios": 0, "historicos": 0, "faixas": 0}
+    inicio = time.perf_counter()
+
+    print(f"Gerando {args.clientes} clientes ({'COPY' if copy else 'INSERT em lote'}, seed {args.seed})...")
+    for deslocamento in range(0, args.clientes, args.lote):
+        quantidade = min(args.lote, args.clientes - deslocamento)
+        clientes, beneficios, historicos, faixas = gerador.lote(primeiro + deslocamento, quantidade)
+        with engine.begin() as conn:
+            inserir(conn, Cliente, clientes, copy)
+            inserir(conn, Beneficio, beneficios, copy)
+            inserir(conn, BeneficioHistorico, historicos, copy)
+            inserir(conn, BeneficioFaixa, faixas, copy)
+        totais["clientes"] += len(clientes)
+        totais["beneficios"] += len(beneficios)
+        totais["historicos"] += len(historicos)
+        totais["faixas"] += len(faixas)
+        decorrido = time.perf_counter() - inicio
+        print(f"  {totais['clientes']}/{args.clientes} clientes "
+              f"({totais['clientes'] / decorrido:.0f}/s, {decorrido:.1f}s)")
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            ajustar_sequences(conn)
+
+    print("=" * 50)
+    for nome, total in totais.items():
+        print(f"  {nome}: {total}")
+    print(f"Concluído em {time.perf_counter() - inicio:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,5 +13,5 @@ alembic upgrade head 2>&1 || {
     echo "=== Alembic failed, but continuing anyway ==="
 }
 
-echo "=== Starting uvicorn server ==="
-exec uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000}
+echo "=== Starting server (prefork) ==="
+exec python -m app.servidor --porta ${PORT:-8000}
@@ -0,0 +1,312 @@
+"""
+Benchmark de carga dos endpoints mais usados
+
+Sobe a API (uvicorn) contra um banco SQLite ou PostgreSQL populado pelo
+gerador sintético (scripts/gerar_dados.py) e dispara clientes assíncronos
+concorrentes em cada cenário: login, listagens, dashboard, simulação e
+cada rota de PDF. Reporta p50/p95/p99 e requisições por segundo (só das
+respostas bem-sucedidas) e a taxa de erros, e compara com um baseline salvo;
+regressões acima do limite, ou erros acima de --erros-max (ou do baseline),
+retornam código 1.
+
+Uso (na pasta backend):
+    python -m tests.benchmark.carga --clientes 20000 --salvar-baseline
+    python -m tests.benchmark.carga --baseline tests/benchmark/baseline.json --limite 0.2
+    python -m tests.benchmark.carga --url http://localhost:8000 --cenarios list_clientes,dashboard
+
+O baseline depende da máquina: gere-o no mesmo ambiente em que a
+comparação vai rodar.
+
+A API medida precisa estar sem limite de requisições: com ele (padrão
+RATE_LIMIT_HABILITADO=true, login 10/min, relatórios 30/min) quase tudo vira
+429 e o benchmark mede a recusa. A API que o script sobe já roda com
+RATE_LIMIT_HABILITADO=false; com --url, suba a API assim também.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+
+import httpx
+from sqlalchemy import create_engine, text
+
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASELINE_PADRAO = os.path.join(BACKEND, "tests", "benchmark", "baseline.json")
+
+EMAIL_PADRAO = "ivis_ribeiro@hotmail.com"
+SENHA_PADRAO = "admin@123"
+
+
+# ===================== CENÁRIOS =====================
+# Cada cenário devolve (método, caminho, kwargs do httpx) a partir do contexto
+
+def _login(ctx, rng):
+    return "POST", "/api/v1/auth/login", {"data": {"username": ctx["email"], "password": ctx["senha"]}}
+
+
+def _list_clientes(ctx, rng):
+    return "GET", f"/api/v1/clientes/?skip={rng.randrange(0, 200) * 20}&limit=20", {}
+
+
+def _list_beneficios(ctx, rng):
+    return "GET", f"/api/v1/beneficios/?skip={rng.randrange(0, 200) * 20}&limit=20", {}
+
+
+def _dashboard(ctx, rng):
+    return "GET", "/api/v1/dashboard/metricas", {}
+
+
+def _simular(ctx, rng):
+    corpo = {"tipo_bem": rng.choice(("imovel", "carro", "moto")), "parcela_max": rng.choice((800, 1500, 3000))}
+    return "POST", "/api/v1/beneficios/simular", {"json": corpo}
+
+
+def _pdf(caminho, chave):
+    def cenario(ctx, rng):
+        return "GET", caminho.format(id=rng.choice(ctx[chave])), {}
+    return cenario
+
+
+CENARIOS = {
+    "login": _login,
+    "list_clientes": _list_clientes,
+    "list_beneficios": _list_beneficios,
+    "dashboard": _dashboard,
+    "simular": _simular,
+    "pdf_cliente": _pdf("/api/v1/relatorios/cliente/{id}/pdf", "clientes"),
+    "pdf_ficha": _pdf("/api/v1/relatorios/ficha-atendimento/{id}/pdf", "clientes"),
+    "pdf_beneficio": _pdf("/api/v1/relatorios/beneficio/{id}/pdf", "beneficios"),
+    "pdf_termo": _pdf("/api/v1/relatorios/termo-adesao/{id}/pdf", "beneficios"),
+    "pdf_contrato": _pdf("/api/v1/relatorios/contrato/{id}/pdf", "beneficios"),
+    "pdf_dossie": _pdf("/api/v1/relatorios/dossie/{id}", "beneficios"),
+}
+
+
+# ===================== AMBIENTE =====================
+
+def popular(database_url, clientes, seed):
+    """Roda o gerador sintético se o banco tiver menos clientes que o pedido"""
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            existentes = conn.execute(text("SELECT COUNT(*) FROM clientes")).scalar()
+    finally:
+        engine.dispose()
+    faltam = clientes - existentes
+    if faltam <= 0:
+        print(f"Banco com {existentes} clientes, sem geração")
+        return
+    print(f"Gerando {faltam} clientes sintéticos (seed {seed})...")
+    subprocess.run(
+        [sys.executable, os.path.join("scripts", "gerar_dados.py"), "--clientes", str(faltam), "--seed", str(seed)],
+        cwd=BACKEND, env={**os.environ, "DATABASE_URL": database_url}, check=True,
+    )
+
+
+def subir_api(database_url, porta, workers):
+    env = {**os.environ, "DATABASE_URL": database_url, "RATE_LIMIT_HABILITADO": "false"}
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(porta),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND, env=env,
+    )
+    url = f"http://127.0.0.1:{porta}"
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("A API terminou durante a inicialização")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return processo, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    processo.terminate()
+    raise RuntimeError("A API não respondeu /health em 60s")
+
+
+async def preparar(client, email, senha):
+    resposta = await client.post("/api/v1/auth/login", data={"username": email, "password": senha})
+    resposta.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {resposta.json()['access_token']}"
+    clientes = (await client.get("/api/v1/clientes/?limit=100")).json()
+    beneficios = (await client.get("/api/v1/beneficios/?limit=100")).json()
+    if not clientes or not beneficios:
+        raise RuntimeError("Banco sem clientes/benefícios: use --clientes para gerar dados")
+    return {
+        "email": email,
+        "senha": senha,
+        "clientes": [c["id"] for c in clientes],
+        "beneficios": [b["id"] for b in beneficios],
+    }
+
+
+# ===================== EXECUÇÃO =====================
+
+def percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+async def rodar_cenario(client, ctx, nome, concorrencia, duracao, aquecimento, seed):
+    cenario = CENARIOS[nome]
+    latencias, erros = [], 0  # latências só das respostas bem-sucedidas
+
+    async def trabalhador(indice, fim, registrar):
+        nonlocal erros
+        rng = random.Random(f"{seed}-{nome}-{indice}")
+        while time.perf_counter() < fim:
+            metodo, caminho, kwargs = cenario(ctx, rng)
+            inicio = time.perf_counter()
+            try:
+                resposta = await client.request(metodo, caminho, **kwargs)
+                ok = resposta.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if not registrar:
+                continue
+            if ok:
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            else:
+                erros += 1
+
+    if aquecimento > 0:
+        fim = time.perf_counter() + aquecimento
+        await asyncio.gather(*(trabalhador(i, fim, False) for i in range(concorrencia)))
+
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    await asyncio.gather(*(trabalhador(i, fim, True) for i in range(concorrencia)))
+    decorrido = time.perf_counter() - inicio
+
+    ordenados = sorted(latencias)
+    total = len(latencias) + erros
+    return {
+        "requisicoes": total,
+        "erros": erros,
+        "taxa_erros": round(erros / total, 4) if total else 0.0,
+        "rps": round(len(latencias) / decorrido, 2),
+        "p50": round(percentil(ordenados, 50), 2),
+        "p95": round(percentil(ordenados, 95), 2),
+        "p99": round(percentil(ordenados, 99), 2),
+    }
+
+
+def comparar(resultados, baseline, limite, erros_max=0.01):
+    """
+    Cenários com taxa de erros acima de `erros_max` (ou da do baseline, se maior),
+    p95 acima ou RPS abaixo do baseline além do limite (fração)
+    """
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = baseline.get(nome) or {}
+        tolerado = max(erros_max, base.get("taxa_erros", 0.0))
+        if atual["taxa_erros"] > tolerado:
+            regressoes.append(f"{nome}: {atual['taxa_erros']:.1%} de erros > {tolerado:.1%} "
+                              f"({atual['erros']} de {atual['requisicoes']})")
+        if not base:
+            continue
+        if base["p95"] and atual["p95"] > base["p95"] * (1 + limite):
+            regressoes.append(f"{nome}: p95 {atual['p95']}ms > baseline {base['p95']}ms (+{limite:.0%})")
+        if base["rps"] and atual["rps"] < base["rps"] * (1 - limite):
+            regressoes.append(f"{nome}: {atual['rps']} req/s < baseline {base['rps']} req/s (-{limite:.0%})")
+    return regressoes
+
+
+def imprimir(resultados, baseline):
+    print(f"{'cenário':<16}{'req':>8}{'erros':>7}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'p95 base':>10}")
+    for nome, r in resultados.items():
+        base = baseline.get(nome, {}).get("p95", "-")
+        print(f"{nome:<16}{r['requisicoes']:>8}{r['erros']:>7}{r['rps']:>10}"
+              f"{r['p50']:>10}{r['p95']:>10}{r['p99']:>10}{base:>10}")
+
+
+async def executar(url, args):
+    limites = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limites) as client:
+        ctx = await preparar(client, args.email, args.senha)
+        resultados = {}
+        for nome in args.cenarios.split(","):
+            print(f"Cenário {nome}...")
+            resultados[nome] = await rodar_cenario(
+                client, ctx, nome, args.concorrencia, args.duracao, args.aquecimento, args.seed
+            )
+        return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de carga dos endpoints")
+    parser.add_argument("--url", help="API já em execução (não sobe o uvicorn nem gera dados); "
+                                      "precisa de RATE_LIMIT_HABILITADO=false")
+    parser.add_argument("--database-url", default=f"sqlite:///{os.path.join(BACKEND, 'benchmark.db')}")
+    parser.add_argument("--clientes", type=int, default=5000, help="Mínimo de clientes no banco")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn")
+    parser.add_argument("--cenarios", default=",".join(CENARIOS))
+    parser.add_argument("--concorrencia", type=int, default=10)
+    parser.add_argument("--duracao", type=float, default=10.0, help="Segundos medidos por cenário")
+    parser.add_argument("--aquecimento", type=float, default=2.0, help="Segundos descartados por cenário")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--email", default=EMAIL_PADRAO)
+    parser.add_argument("--senha", default=SENHA_PADRAO)
+    parser.add_argument("--baseline", default=BASELINE_PADRAO)
+    parser.add_argument("--limite", type=float, default=0.2, help="Regressão tolerada (0.2 = 20%%)")
+    parser.add_argument("--erros-max", type=float, default=0.01,
+                        help="Taxa de erros tolerada (0.01 = 1%%) quando o baseline tem menos")
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--saida", help="Grava os resultados em JSON")
+    args = parser.parse_args(argv)
+
+    for nome in args.cenarios.split(","):
+        if nome not in CENARIOS:
+            parser.error(f"Cenário desconhecido: {nome} (disponíveis: {', '.join(CENARIOS)})")
+
+    processo = None
+    url = args.url
+    try:
+        if url is None:
+            # A API cria as tabelas e o admin no startup; o gerador roda depois
+            processo, url = subir_api(args.database_url, args.porta, args.workers)
+            popular(args.database_url, args.clientes, args.seed)
+        resultados = asyncio.run(executar(url, args))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait(timeout=30)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print("=" * 81)
+    imprimir(resultados, baseline)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+    if args.salvar_baseline:
+        com_erros = [nome for nome, r in resultados.items() if r["taxa_erros"] > args.erros_max]
+        if com_erros:
+            print(f"Aviso: baseline com erros acima de {args.erros_max:.0%} em {', '.join(com_erros)}")
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **resultados}, f, indent=2)
+        print(f"Baseline salvo em {args.baseline}")
+        return 0
+
+    regressoes = comparar(resultados, baseline, args.limite, args.erros_max)
+    for regressao in regressoes:
+        print(f"REGRESSÃO {regressao}")
+    if not baseline:
+        print("Sem baseline para comparar (use --salvar-baseline)")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Regressão de desempenho: roda o benchmark de carga e compara com o baseline.
+Lento e dependente da máquina, por isso só roda com BENCHMARK=1:
+
+    BENCHMARK=1 pytest tests/benchmark -s
+
+A comparação com o baseline (carga.comparar) é testada sempre.
+"""
+import os
+
+import pytest
+
+from tests.benchmark import carga
+
+
+@pytest.mark.skipif(not os.getenv("BENCHMARK"), reason="defina BENCHMARK=1 para rodar o benchmark de carga")
+def test_sem_regressao_de_desempenho():
+    if not os.path.exists(carga.BASELINE_PADRAO):
+        pytest.skip("sem baseline: rode python -m tests.benchmark.carga --salvar-baseline")
+    argumentos = ["--limite", os.getenv("BENCHMARK_LIMITE", "0.2")]
+    if os.getenv("BENCHMARK_URL"):
+        argumentos += ["--url", os.getenv("BENCHMARK_URL")]
+    assert carga.main(argumentos) == 0
+
+
+def _resultado(p95=100.0, rps=50.0, erros=0, requisicoes=500):
+    return {"requisicoes": requisicoes, "erros": erros, "taxa_erros": erros / requisicoes,
+            "rps": rps, "p50": p95 / 2, "p95": p95, "p99": p95 * 2}
+
+
+def test_erros_rapidos_nao_passam_por_ganho_de_desempenho():
+    baseline = {"pdf_termo": _resultado()}
+    # 429/500 rápidos: latência e RPS "melhores", mas metade das respostas falhou
+    atual = {"pdf_termo": _resultado(p95=5.0, rps=400.0, erros=250)}
+    regressoes = carga.comparar(atual, baseline, 0.2)
+    assert len(regressoes) == 1 and "erros" in regressoes[0]
+
+
+def test_taxa_de_erros_tolerada_e_a_do_baseline_quando_maior():
+    baseline = {"login": _resultado(erros=25)}  # 5%
+    assert carga.comparar({"login": _resultado(erros=20)}, baseline, 0.2) == []
+    assert carga.comparar({"login": _resultado(erros=40)}, baseline, 0.2) != []
+    # Sem baseline do cenário vale só o limite de erros
+    assert carga.comparar({"novo": _resultado(erros=10)}, {}, 0.2, erros_max=0.01) != []
+    assert carga.comparar({"novo": _resultado(erros=2)}, {}, 0.2, erros_max=0.01) == []
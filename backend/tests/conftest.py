@@ -0,0 +1,84 @@
+"""
+Fixtures da API: banco SQLite temporário populado pelo gerador sintético
+(TEST_DATABASE_URL aponta para outro banco, ex.: PostgreSQL descartável).
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Antes de importar o app: o engine é criado a partir de DATABASE_URL
+_pasta = tempfile.mkdtemp(prefix="hm_testes_")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{_pasta}/testes.db")
+os.environ["JOB_WORKERS"] = "0"
+os.environ["PDF_CACHE_DIR"] = os.path.join(_pasta, "pdf_cache")
+os.environ["DOCUMENTOS_DIR"] = os.path.join(_pasta, "documentos")
+os.environ["JOBS_DIR"] = os.path.join(_pasta, "jobs")
+# Testes de consultas e da réplica precisam ir ao banco; test_cache liga por teste
+os.environ["CACHE_HABILITADO"] = "false"
+# Limites de requisição também (test_limite_taxa liga)
+os.environ["RATE_LIMIT_HABILITADO"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.models.consultor import Consultor
+from app.models.representante import Representante
+from app.models.unidade import Unidade
+from app.models.usuario import Usuario
+from scripts import gerar_dados
+
+
+EMAIL_ADMIN = "ivis_ribeiro@hotmail.com"
+SENHA_ADMIN = "admin@123"
+
+
+@contextmanager
+def contar_consultas():
+    """Lista dos SQLs executados no engine durante o bloco"""
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+def _cadastros_extras(db):
+    """Usuários, representantes e consultores que o gerador não cria"""
+    admin = db.query(Usuario).filter(Usuario.email == EMAIL_ADMIN).first()
+    unidades = [u.id for u in db.query(Unidade).order_by(Unidade.id)]
+    for i in range(30):
+        db.add(Usuario(nome=f"Usuário {i}", email=f"usuario{i}@teste.com.br", senha_hash=admin.senha_hash,
+                       perfil_id=3, unidade_id=unidades[i % len(unidades)], ativo=True))
+    for i in range(30):
+        representante = Representante(
+            nome=f"Representante {i}", cpf=f"000.000.{i:03d}-00", telefone="(11) 90000-0000",
+            cnpj=f"00.000.{i:03d}/0001-00", razao_social=f"Representações {i} Ltda", unidade_id=unidades[i % len(unidades)],
+        )
+        db.add(representante)
+        db.flush()
+        db.add(Consultor(nome=f"Consultor {i}", cpf=f"111.111.{i:03d}-11", telefone="(11) 91111-1111",
+                         representante_id=representante.id))
+    db.commit()
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        gerar_dados.main(["--clientes", "80", "--lote", "80", "--unidades", "3", "--tabelas", "12", "--seed", "1"])
+        db = SessionLocal()
+        try:
+            _cadastros_extras(db)
+        finally:
+            db.close()
+
+        resposta = client.post("/api/v1/auth/login", data={"username": EMAIL_ADMIN, "password": SENHA_ADMIN})
+        client.headers["Authorization"] = f"Bearer {resposta.json()['access_token']}"
+        yield client
@@ -0,0 +1,99 @@
+"""
+Cache de aplicação (app.core.cache) no modo local, sem Redis
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.core import cache, database
+from app.core.config import settings
+
+
+URL_METRICAS = "/api/v1/dashboard/metricas"
+
+
+@pytest.fixture
+def cache_ligado(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_HABILITADO", True)
+    monkeypatch.setattr(settings, "CACHE_TTL_LOCAL_MAX", 3600)
+    cache.limpar_local()
+    yield
+    cache.limpar_local()
+
+
+def _calcular(contador, valor):
+    def calcular():
+        contador.append(1)
+        return valor
+    return calcular
+
+
+def test_segunda_leitura_vem_do_cache(cache_ligado):
+    chamadas = []
+    assert asyncio.run(cache.obter_ou_calcular("teste:a", _calcular(chamadas, {"x": 1}), ttl=60)) == {"x": 1}
+    assert asyncio.run(cache.obter_ou_calcular("teste:a", _calcular(chamadas, {"x": 2}), ttl=60)) == {"x": 1}
+    assert len(chamadas) == 1
+
+
+def test_vencido_servido_enquanto_outro_recalcula(cache_ligado, monkeypatch):
+    cache.definir("teste:b", "antigo", ttl=60)
+    agora = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: agora + 61)  # vencido, ainda dentro do stale
+
+    assert cache._travar("teste:b")  # outra requisição recalculando
+    chamadas = []
+    assert asyncio.run(cache.obter_ou_calcular("teste:b", _calcular(chamadas, "novo"), ttl=60)) == "antigo"
+    assert chamadas == []
+
+    cache._destravar("teste:b")
+    assert asyncio.run(cache.obter_ou_calcular("teste:b", _calcular(chamadas, "novo"), ttl=60)) == "novo"
+    assert chamadas == [1]
+
+
+def test_invalidacao_durante_o_calculo_descarta_o_valor(cache_ligado):
+    def calcular():
+        cache.invalidar("clientes")  # commit concorrente enquanto calcula
+        return "antigo"
+
+    assert asyncio.run(cache.obter_ou_calcular("teste:d", calcular, ttl=60, tags=("clientes",))) == "antigo"
+    assert cache.obter("teste:d") is None
+    assert asyncio.run(cache.obter_ou_calcular("teste:d", lambda: "novo", ttl=60, tags=("clientes",))) == "novo"
+    assert cache.obter("teste:d") == "novo"
+
+
+def test_ttl_limitado_sem_redis(cache_ligado, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_TTL_LOCAL_MAX", 5)
+    cache.definir("teste:c", "valor", ttl=300)
+    agora = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: agora + 6)
+    assert cache.obter("teste:c") == "valor"  # vencido, ainda na janela (também limitada)
+    monkeypatch.setattr(cache.time, "time", lambda: agora + 11)
+    assert cache.obter("teste:c") is None
+
+
+def test_lru_local_limitado(cache_ligado, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_LOCAL_MAX_ITENS", 3)
+    for i in range(5):
+        cache.definir(f"teste:{i}", i, ttl=60)
+    assert cache.obter("teste:0") is None
+    assert [cache.obter(f"teste:{i}") for i in range(2, 5)] == [2, 3, 4]
+
+
+def test_commit_invalida_as_tabelas_alteradas(client, cache_ligado):
+    total = client.get(URL_METRICAS).json()["total_clientes"]
+    cliente = client.get("/api/v1/clientes/?limit=1").json()[0]
+
+    # Escrita fora da sessão do ORM não invalida: o dashboard segue em cache
+    with database.engine.begin() as conn:
+        conn.execute(text("UPDATE clientes SET ativo = 0 WHERE id = :id"), {"id": cliente["id"]})
+    try:
+        assert client.get(URL_METRICAS).json()["total_clientes"] == total
+
+        # Commit pelo ORM em "clientes" invalida a tag
+        resposta = client.put(f"/api/v1/clientes/{cliente['id']}", json={"naturalidade": "Cache/SP"})
+        assert resposta.status_code == 200
+        assert client.get(URL_METRICAS).json()["total_clientes"] == total - 1
+    finally:
+        with database.engine.begin() as conn:
+            conn.execute(text("UPDATE clientes SET ativo = 1 WHERE id = :id"), {"id": cliente["id"]})
@@ -0,0 +1,55 @@
+"""
+Coalescência de requisições simultâneas (app.core.coalescencia), sem Redis
+"""
+import asyncio
+
+import pytest
+
+from app.core import coalescencia
+
+
+def _calculo_lento(chamadas, valor):
+    async def calcular():
+        chamadas.append(1)
+        await asyncio.sleep(0.05)
+        if isinstance(valor, Exception):
+            raise valor
+        return valor
+    return calcular
+
+
+async def _simultaneas(*pedidos):
+    return await asyncio.gather(*(coalescencia.executar(c, calcular) for c, calcular in pedidos),
+                                return_exceptions=True)
+
+
+def test_pedidos_iguais_compartilham_um_calculo():
+    chamadas = []
+    calcular = _calculo_lento(chamadas, {"total": 3})
+    resultados = asyncio.run(_simultaneas(*[("teste:a", calcular)] * 5))
+    assert resultados == [{"total": 3}] * 5
+    assert len(chamadas) == 1
+    assert coalescencia._em_andamento == {}
+
+
+def test_chaves_diferentes_calculam_separado():
+    chamadas = []
+    resultados = asyncio.run(_simultaneas(
+        ("teste:a", _calculo_lento(chamadas, 1)),
+        ("teste:b", _calculo_lento(chamadas, 2)),
+    ))
+    assert resultados == [1, 2]
+    assert len(chamadas) == 2
+
+
+def test_excecao_chega_a_todos():
+    chamadas = []
+    calcular = _calculo_lento(chamadas, ValueError("falhou"))
+    resultados = asyncio.run(_simultaneas(*[("teste:c", calcular)] * 3))
+    assert all(isinstance(r, ValueError) for r in resultados)
+    assert len(chamadas) == 1
+
+    # Terminado o voo, a próxima chamada calcula de novo
+    with pytest.raises(ValueError):
+        asyncio.run(coalescencia.executar("teste:c", calcular))
+    assert len(chamadas) == 2
@@ -0,0 +1,43 @@
+"""
+CPUs do container (app.core.cpus) e orçamento do pool de PDFs
+"""
+from app.core import cpus
+from app.core.config import settings
+from app.services import pdf_pool
+
+
+def _cgroup(monkeypatch, tmp_path, v2=None, v1=None):
+    tmp_path = tmp_path / str(len(list(tmp_path.iterdir())))
+    tmp_path.mkdir()
+    caminhos = {"CPU_MAX_V2": v2, "COTA_V1": v1 and v1[0], "PERIODO_V1": v1 and v1[1]}
+    for nome, conteudo in caminhos.items():
+        arquivo = tmp_path / nome
+        if conteudo is not None:
+            arquivo.write_text(conteudo)
+        monkeypatch.setattr(cpus, nome, str(arquivo))
+
+
+def test_cota_do_cgroup(monkeypatch, tmp_path):
+    _cgroup(monkeypatch, tmp_path, v2="150000 100000\n")
+    assert cpus._cota_cgroup() == 2
+    _cgroup(monkeypatch, tmp_path, v2="max 100000\n")
+    assert cpus._cota_cgroup() is None
+    _cgroup(monkeypatch, tmp_path, v1=("50000", "100000"))
+    assert cpus._cota_cgroup() == 1
+    _cgroup(monkeypatch, tmp_path, v1=("-1", "100000"))
+    assert cpus._cota_cgroup() is None
+    _cgroup(monkeypatch, tmp_path)
+    assert cpus._cota_cgroup() is None
+
+
+def test_pool_de_pdfs_divide_as_cpus_entre_os_workers(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_WORKERS", 0)
+    monkeypatch.setattr(cpus, "disponiveis", lambda: 8)
+    monkeypatch.setattr(pdf_pool, "_processos_irmaos", [1])
+    assert pdf_pool.num_workers() == 8
+    pdf_pool.dividir_entre(3)
+    assert pdf_pool.num_workers() == 2
+    pdf_pool.dividir_entre(16)
+    assert pdf_pool.num_workers() == 1
+    monkeypatch.setattr(settings, "PDF_WORKERS", 5)
+    assert pdf_pool.num_workers() == 5
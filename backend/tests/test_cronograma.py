@@ -0,0 +1,100 @@
+"""
+Calculadora de cronograma (app.services.cronograma) contra um laço mês a mês
+"""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import cronograma
+
+
+def _beneficio(id, prazo, credito=100000.0, **campos):
+    padrao = dict(parcela=0, taxa_administracao=18, fundo_reserva=2, seguro_prestamista=0.03,
+                  indice_correcao="INCC")
+    return SimpleNamespace(id=id, prazo_grupo=prazo, valor_credito=credito, **{**padrao, **campos})
+
+
+def _faixa(inicio, fim, fundo=0.0, adm=0.0, reserva=0.0, seguro=0.0, valor=0.0):
+    return {"parcela_inicio": inicio, "parcela_fim": fim, "perc_fundo_comum": fundo, "perc_administracao": adm,
+            "perc_reserva": reserva, "perc_seguro": seguro, "valor_parcela": valor}
+
+
+def _ingenuo(beneficio, faixas, fatores=None):
+    """Mesmo cálculo com um laço por mês e por faixa"""
+    faixas = faixas or cronograma.faixas_padrao(beneficio)
+    prazo = min(int(beneficio.prazo_grupo), cronograma.PRAZO_MAXIMO)
+    componentes = np.zeros((prazo, len(cronograma.COMPONENTES)))
+    for mes in range(1, prazo + 1):
+        fator = 1.0 if fatores is None else fatores[mes - 1]
+        for f in faixas:
+            if f["parcela_inicio"] <= mes <= f["parcela_fim"]:
+                percentuais = [f["perc_fundo_comum"], f["perc_administracao"], f["perc_reserva"], f["perc_seguro"]]
+                componentes[mes - 1] += np.array(percentuais) / 100 * beneficio.valor_credito * fator
+    return componentes
+
+
+def test_faixas_sobrepostas_somam_e_lacunas_ficam_zeradas():
+    # Benefício 0: faixas 1-4 e 3-6 (sobrepostas em 3-4), lacuna em 7-8, faixa 9-10
+    # Benefício 1: faixa que passa do prazo e outra invertida (ignorada)
+    resultado = cronograma.expandir_faixas(
+        2, 10, [0, 0, 0, 1, 1], [1, 3, 9, 5, 8], [4, 6, 10, 99, 2], [1.0, 10.0, 100.0, 5.0, 7.0]
+    )
+    assert resultado.shape == (2, 10, 1)
+    assert resultado[0, :, 0].tolist() == [1, 1, 11, 11, 10, 10, 0, 0, 100, 100]
+    assert resultado[1, :, 0].tolist() == [0, 0, 0, 0, 5, 5, 5, 5, 5, 5]
+
+
+@pytest.mark.parametrize("prazo", [0, 1])
+def test_prazos_minimos(prazo):
+    beneficio = _beneficio(1, prazo, parcela=1000)
+    resultado = cronograma.montar_cronograma(beneficio, [])
+    assert resultado["prazo"] == prazo
+    assert len(resultado["parcelas"]) == prazo
+    if prazo == 0:
+        assert resultado["total_pago"] == 0.0
+    else:
+        # Prazo 1: o fundo comum inteiro na única parcela
+        assert resultado["parcelas"][0]["fundo_comum"] == 100000.0
+        assert resultado["total_pago"] == resultado["parcelas"][0]["valor_parcela"]
+
+
+def test_lote_igual_ao_laco_mes_a_mes():
+    rng = random.Random(7)
+    beneficios, faixas = [], {}
+    for i in range(40):
+        prazo = rng.choice([1, 2, 12, 50, 180, 240, 300])
+        beneficio = _beneficio(i, prazo, credito=rng.uniform(30000, 500000))
+        beneficios.append(beneficio)
+        if rng.random() < 0.2:
+            continue  # sem faixas: faixas_padrao
+        faixas[i] = []
+        for _ in range(rng.randint(1, 5)):
+            inicio = rng.randint(1, prazo + 2)
+            fim = rng.randint(inicio - 1, prazo + 5)  # inclui faixa vazia e além do prazo
+            faixas[i].append(_faixa(inicio, fim, *(rng.uniform(0, 2) for _ in range(4))))
+
+    for cenario in ("sem_correcao", "media"):
+        resultado = cronograma.calcular_lote(beneficios, faixas, cenario=cenario)
+        for i, beneficio in enumerate(beneficios):
+            prazo = min(beneficio.prazo_grupo, cronograma.PRAZO_MAXIMO)
+            fatores = None if cenario == "sem_correcao" else cronograma.fatores_correcao("INCC", cenario, prazo)
+            esperado = _ingenuo(beneficio, faixas.get(i), fatores)
+            np.testing.assert_allclose(resultado["componentes"][i, :prazo], esperado, rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(resultado["valor_parcela"][i, :prazo], esperado.sum(axis=1),
+                                       rtol=1e-9, atol=1e-6)
+            assert not resultado["componentes"][i, prazo:].any()
+
+
+def test_total_pago_bate_com_os_componentes_e_divergencia_sinalizada():
+    beneficio = _beneficio(1, 12)
+    faixas = [
+        _faixa(1, 6, fundo=100 / 12, adm=1.5, valor=round(100000 * (100 / 12 + 1.5) / 100, 2)),
+        _faixa(7, 12, fundo=100 / 12, adm=1.5, valor=5000.0),  # cadastrado errado
+    ]
+    resultado = cronograma.montar_cronograma(beneficio, faixas)
+    totais = sum(resultado[f"total_{c}"] for c in cronograma.COMPONENTES)
+    assert resultado["total_pago"] == pytest.approx(totais, abs=0.05)
+    assert resultado["parcelas"][0]["valor_parcela"] == resultado["parcelas"][0]["valor_informado"]
+    assert resultado["parcelas_divergentes"] == list(range(7, 13))
@@ -0,0 +1,62 @@
+"""
+Versão dos documentos armazenados (app.services.armazenamento.versao)
+"""
+from app.core.database import SessionLocal
+from app.models.beneficio import Beneficio
+from app.models.cliente import Cliente
+from app.models.usuario import Usuario
+from app.services import armazenamento, documentos
+from tests.conftest import EMAIL_ADMIN, SENHA_ADMIN
+
+
+def _versao_termo(beneficio_id):
+    db = SessionLocal()
+    try:
+        admin = db.query(Usuario).filter(Usuario.email == EMAIL_ADMIN).first()
+        dados = documentos.carregar_documento(db, "termo", beneficio_id, documentos.snapshot(admin))
+        return armazenamento.versao("termo", dados), dados["usuario"]
+    finally:
+        db.close()
+
+
+def test_novo_login_mantem_a_versao_do_termo(client):
+    db = SessionLocal()
+    try:
+        beneficio = db.query(Beneficio).order_by(Beneficio.id).first()
+        cliente = db.get(Cliente, beneficio.cliente_id)
+        originais = beneficio.representante_id, beneficio.consultor_id, cliente.representante_id
+        # Sem vendedor no benefício: o termo sai em nome de quem pede
+        beneficio.representante_id = beneficio.consultor_id = cliente.representante_id = None
+        db.commit()
+        try:
+            antes, usuario = _versao_termo(beneficio.id)
+            assert usuario.email == EMAIL_ADMIN
+            assert not hasattr(usuario, "senha_hash") and not hasattr(usuario, "last_login")
+
+            resposta = client.post("/api/v1/auth/login", data={"username": EMAIL_ADMIN, "password": SENHA_ADMIN})
+            assert resposta.status_code == 200
+            assert _versao_termo(beneficio.id)[0] == antes
+        finally:
+            beneficio.representante_id, beneficio.consultor_id, cliente.representante_id = originais
+            db.commit()
+    finally:
+        db.close()
+
+
+def test_vendedor_vem_do_beneficio_e_nao_de_quem_pede(client):
+    db = SessionLocal()
+    try:
+        beneficio = db.query(Beneficio).order_by(Beneficio.id.desc()).first()
+        cliente = db.get(Cliente, beneficio.cliente_id)
+        vendedor = db.query(Usuario).filter(Usuario.email != EMAIL_ADMIN).first()
+        originais = beneficio.representante_id, beneficio.consultor_id, cliente.representante_id
+        beneficio.representante_id = beneficio.consultor_id = None
+        cliente.representante_id = vendedor.id
+        db.commit()
+        try:
+            assert _versao_termo(beneficio.id)[1].id == vendedor.id
+        finally:
+            beneficio.representante_id, beneficio.consultor_id, cliente.representante_id = originais
+            db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,48 @@
+"""
+Envio do dossiê em blocos (app.services.dossie.stream_pdf)
+"""
+import threading
+import time
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+
+from app.services import dossie
+
+
+def _pdf(paginas):
+    writer = PdfWriter()
+    for _ in range(paginas):
+        writer.add_blank_page(width=595, height=842)
+    saida = BytesIO()
+    writer.write(saida)
+    return saida.getvalue()
+
+
+def _partes():
+    return [("ficha", _pdf(2)), ("planejamento", _pdf(30)), ("termo", _pdf(3))]
+
+
+def test_stream_igual_ao_pdf_gravado_de_uma_vez():
+    inteiro = BytesIO()
+    dossie.juntar(_partes()).write(inteiro)
+
+    blocos = list(dossie.stream_pdf(dossie.juntar(_partes()), bloco=1024))
+    assert all(len(b) == 1024 for b in blocos[:-1])
+    corpo = b"".join(blocos)
+    assert len(corpo) == len(inteiro.getvalue())
+    leitor = PdfReader(BytesIO(corpo))
+    assert len(leitor.pages) == 35
+    assert [item.title for item in leitor.outline] == ["Ficha de Atendimento", "Planejamento Financeiro",
+                                                        "Termo de Adesão"]
+
+
+def test_cliente_que_desconecta_interrompe_a_gravacao():
+    antes = threading.active_count()
+    blocos = dossie.stream_pdf(dossie.juntar(_partes()), bloco=256)
+    next(blocos)
+    blocos.close()
+    limite = time.monotonic() + 5
+    while threading.active_count() > antes and time.monotonic() < limite:
+        time.sleep(0.05)
+    assert threading.active_count() == antes
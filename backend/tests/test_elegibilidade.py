@@ -0,0 +1,87 @@
+"""
+Elegibilidade para campanhas (app.services.elegibilidade) contra filtro e
+ordenação por força bruta
+"""
+import csv
+import io
+import math
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.cliente import Cliente
+from app.models.tabela_credito import TabelaCredito
+from app.services import elegibilidade
+
+
+def _forca_bruta(tabelas, capacidade, top_n, tipo_bem=None):
+    """Tabelas com parcela <= capacidade, maior crédito primeiro (empate: parcela menor, ordem original)"""
+    candidatas = [t for t in sorted(tabelas, key=lambda t: float(t.parcela))
+                  if (tipo_bem is None or t.tipo_bem == tipo_bem) and float(t.parcela) <= capacidade]
+    return [t.id for t in sorted(candidatas, key=lambda t: -float(t.valor_credito))][:top_n]
+
+
+def _tabelas(rng, n):
+    # Poucos valores distintos: muitos empates de parcela e de crédito
+    return [
+        SimpleNamespace(id=i, parcela=rng.choice([500, 750, 750, 1000, 1500, 2000]),
+                        valor_credito=rng.choice([50000, 80000, 80000, 120000]),
+                        tipo_bem=rng.choice(["imovel", "automovel"]))
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_indice_igual_a_forca_bruta(semente):
+    rng = random.Random(semente)
+    tabelas = _tabelas(rng, rng.randint(0, 12))
+    top_n = rng.randint(1, 4)
+    tipo_bem = rng.choice([None, "imovel", "automovel"])
+    capacidades = np.array([rng.choice([-300, 0, 499.99, 500, 750, 1200, 2000, 10000, float("-inf")])
+                            for _ in range(50)])
+
+    filtradas = [t for t in tabelas if tipo_bem is None or t.tipo_bem == tipo_bem]
+    indice = elegibilidade.IndiceTabelas(filtradas, top_n)
+    melhores = indice.melhores(capacidades)
+    for capacidade, linha in zip(capacidades, melhores):
+        obtido = [indice.tabelas[i].id for i in linha if i >= 0]
+        assert obtido == _forca_bruta(tabelas, capacidade, top_n, tipo_bem)
+
+
+def test_capacidade_desconta_dividas_e_salario_nulo_fica_nan():
+    salarios = np.array([10000.0, 1000.0, np.nan, 0.0])
+    dividas = np.array([[500.0, np.nan], [300.0, 200.0], [np.nan, np.nan], [np.nan, np.nan]])
+    capacidades = elegibilidade.calcular_capacidade(salarios, dividas)
+    assert capacidades[0] == pytest.approx(2500.0)
+    assert capacidades[1] == pytest.approx(-200.0)
+    assert math.isnan(capacidades[2])
+    assert capacidades[3] == 0.0
+
+
+def test_csv_do_endpoint_igual_a_forca_bruta(client):
+    resposta = client.get("/api/v1/campanhas/elegibilidade", params={"top_n": 2, "tipo_bem": "imovel"})
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("text/csv")
+    linhas = list(csv.reader(io.StringIO(resposta.text), delimiter=";"))
+    assert linhas[0] == elegibilidade.CSV_COLUNAS
+    obtido = [(int(l[0]), int(l[5]), int(l[6])) for l in linhas[1:]]
+
+    db = SessionLocal()
+    try:
+        tabelas = db.query(TabelaCredito).filter(TabelaCredito.ativo == True).all()
+        clientes = db.query(Cliente).filter(Cliente.ativo == True, Cliente.salario.isnot(None)) \
+            .order_by(Cliente.id).all()
+        esperado = []
+        for cliente in clientes:
+            dividas = sum(float(getattr(cliente, valor) or 0) for flag, valor in elegibilidade.DIVIDAS
+                          if getattr(cliente, flag))
+            capacidade = float(cliente.salario) * elegibilidade.PERCENTUAL_RENDA - dividas
+            for posicao, tabela_id in enumerate(_forca_bruta(tabelas, capacidade, 2, "imovel"), start=1):
+                esperado.append((cliente.id, posicao, tabela_id))
+    finally:
+        db.close()
+    assert obtido and obtido == esperado
+    assert any(tipo != "imovel" for tipo in {t.tipo_bem for t in tabelas})  # o filtro teve efeito
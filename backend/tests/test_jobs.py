@@ -0,0 +1,57 @@
+"""Fila de jobs: jobs longos com batimento não são recuperados como órfãos"""
+from datetime import timedelta
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services import jobs
+
+
+def _executando(db, iniciado_ha, batimento_ha):
+    job = jobs.enfileirar(db, "documento", {"documento": "termo", "id": 0})
+    job.status = "executando"
+    job.iniciado_em = jobs.agora() - timedelta(seconds=iniciado_ha)
+    job.batimento_em = jobs.agora() - timedelta(seconds=batimento_ha)
+    db.commit()
+    return job
+
+
+def test_recupera_apenas_jobs_sem_batimento(client):
+    db = SessionLocal()
+    try:
+        timeout = settings.JOBS_TIMEOUT_SEGUNDOS
+        longo = _executando(db, iniciado_ha=timeout * 3, batimento_ha=5)
+        parado = _executando(db, iniciado_ha=timeout * 3, batimento_ha=timeout + 60)
+
+        jobs.recuperar_orfaos(db)
+        db.refresh(longo)
+        db.refresh(parado)
+        assert longo.status == "executando"
+        assert parado.status == "pendente"
+    finally:
+        db.close()
+
+
+def test_pulsar_renova_o_batimento_do_job_em_execucao(client, monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_BATIMENTO_SEGUNDOS", 0)
+    db = SessionLocal()
+    try:
+        job = _executando(db, iniciado_ha=10, batimento_ha=settings.JOBS_TIMEOUT_SEGUNDOS + 60)
+
+        recuperados = []
+
+        def handler(db, parametros, pasta):
+            jobs.pulsar()
+            recuperados.append(jobs.recuperar_orfaos(db))
+            raise RuntimeError("fim do teste")
+
+        monkeypatch.setitem(jobs.HANDLERS, "teste_batimento", handler)
+        job.tipo = "teste_batimento"
+        db.commit()
+        jobs.executar(db, job)
+
+        db.refresh(job)
+        assert recuperados == [0]
+        assert jobs.como_utc(job.batimento_em) > jobs.agora() - timedelta(seconds=60)
+        assert jobs._em_execucao["id"] is None
+    finally:
+        db.close()
@@ -0,0 +1,60 @@
+"""
+Limite de requisições (app.core.limite_taxa) com baldes locais
+"""
+import pytest
+
+from app.core import limite_taxa
+from app.core.config import settings
+from tests.conftest import EMAIL_ADMIN
+
+
+@pytest.fixture
+def limite_ligado(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_HABILITADO", True)
+    limite_taxa.limpar_local()
+    yield
+    limite_taxa.limpar_local()
+
+
+def _limites(monkeypatch, **valores):
+    async def limites():
+        return valores
+    monkeypatch.setattr(limite_taxa, "limites", limites)
+
+
+def test_balde_repoe_com_o_tempo(monkeypatch):
+    limite_taxa.limpar_local()
+    agora = [1000.0]
+    monkeypatch.setattr(limite_taxa.time, "monotonic", lambda: agora[0])
+    assert [limite_taxa.consumir("teste", 2)[0] for _ in range(3)] == [True, True, False]
+    permitido, espera = limite_taxa.consumir("teste", 2)
+    assert not permitido and espera == pytest.approx(30)
+
+    agora[0] += 30  # 2 por minuto: um token a cada 30s
+    assert limite_taxa.consumir("teste", 2)[0]
+    assert not limite_taxa.consumir("teste", 2)[0]
+
+
+def test_relatorios_limitados_por_usuario(client, limite_ligado, monkeypatch):
+    _limites(monkeypatch, relatorios=2)
+    beneficio = client.get("/api/v1/beneficios/?limit=1").json()[0]
+    url = f"/api/v1/relatorios/documentos/beneficio/{beneficio['id']}"
+    assert [client.get(url).status_code for _ in range(3)] == [200, 200, 429]
+    resposta = client.get(url)
+    assert int(resposta.headers["Retry-After"]) >= 1
+
+
+def test_login_limitado_por_email(client, limite_ligado, monkeypatch):
+    _limites(monkeypatch, login=3)
+    dados = {"username": EMAIL_ADMIN, "password": "senha-errada"}
+    codigos = [client.post("/api/v1/auth/login", data=dados).status_code for _ in range(4)]
+    assert codigos == [401, 401, 401, 429]
+
+
+def test_limites_vem_das_configuracoes(client, limite_ligado):
+    resposta = client.put("/api/v1/configuracoes/sistema", json={"rate_limit_exports_per_minute": 7})
+    assert resposta.status_code == 200
+    try:
+        assert limite_taxa._ler_limites()["exportacoes"] == 7
+    finally:
+        client.put("/api/v1/configuracoes/sistema", json={"rate_limit_exports_per_minute": 5})
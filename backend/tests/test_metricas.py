@@ -0,0 +1,40 @@
+"""
+Acesso ao /metrics: token quando METRICAS_TOKEN está definido, senão só clientes locais
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+from app.main import metrics
+
+
+def _status(host, token=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    requisicao = Request({"type": "http", "method": "GET", "path": "/metrics", "headers": headers,
+                          "client": (host, 50000)})
+    try:
+        return asyncio.run(metrics(requisicao)).status_code
+    except HTTPException as e:
+        return e.status_code
+
+
+def test_sem_token_so_clientes_locais(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICAS_TOKEN", None)
+    assert _status("127.0.0.1") == 200
+    assert _status("::1") == 200
+    assert _status("203.0.113.7") == 403
+    # O TestClient se apresenta como "testclient": não é local
+    assert client.get("/metrics").status_code == 403
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "203.0.113.7"])
+def test_com_token_exige_o_token(client, monkeypatch, host):
+    monkeypatch.setattr(settings, "METRICAS_TOKEN", "segredo")
+    assert _status(host) == 401
+    assert _status(host, "outro") == 401
+    assert _status(host, "segredo") == 200
+    resposta = client.get("/metrics", headers={"Authorization": "Bearer segredo"})
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,140 @@
+"""
+Orçamento de consultas SQL por requisição
+
+Cada rota declara o máximo de consultas por requisição (incluindo a do
+usuário autenticado). Rotas paginadas são chamadas com páginas de tamanhos
+diferentes e precisam gastar o mesmo número de consultas: N+1 falha aqui.
+Todo router incluído em app/api/v1/router.py precisa ter orçamento.
+"""
+from collections import Counter
+
+import pytest
+
+from app.api.v1.router import api_router
+from tests.conftest import contar_consultas
+
+
+PAGINAS = (5, 50)
+
+# (método, caminho, máximo de consultas, parâmetro de paginação ou None)
+# Nas rotas com corpo (CORPOS) a "página" é o tamanho da lista no corpo
+ORCAMENTOS = [
+    # auth
+    ("GET", "/api/v1/auth/me", 2, None),
+    # usuarios
+    ("GET", "/api/v1/usuarios/", 3, "limit"),
+    ("GET", "/api/v1/usuarios/{usuario_id}", 2, None),
+    # clientes
+    ("GET", "/api/v1/clientes/", 2, "limit"),
+    ("GET", "/api/v1/clientes/{cliente_id}", 2, None),
+    # beneficios
+    ("GET", "/api/v1/beneficios/", 2, "limit"),
+    ("GET", "/api/v1/beneficios/{beneficio_id}", 2, None),
+    ("GET", "/api/v1/beneficios/{beneficio_id}/historico", 3, None),
+    ("GET", "/api/v1/beneficios/{beneficio_id}/faixas", 3, None),
+    ("GET", "/api/v1/beneficios/{beneficio_id}/cronograma", 3, None),
+    ("GET", "/api/v1/beneficios/tabelas/", 2, None),
+    ("GET", "/api/v1/beneficios/administradoras/", 2, None),
+    ("POST", "/api/v1/beneficios/simular", 4, None),
+    # unidades
+    ("GET", "/api/v1/unidades/", 2, "limit"),
+    # empresas
+    ("GET", "/api/v1/empresas/", 2, "limit"),
+    # representantes
+    ("GET", "/api/v1/representantes/", 2, "limit"),
+    ("GET", "/api/v1/representantes/{representante_id}", 2, None),
+    # consultores
+    ("GET", "/api/v1/consultores/", 2, "limit"),
+    # utils
+    ("GET", "/api/v1/utils/validar-cpf/52998224725", 0, None),
+    # dashboard
+    ("GET", "/api/v1/dashboard/metricas", 4, None),
+    ("GET", "/api/v1/dashboard/atividades-recentes", 3, "limit"),
+    ("GET", "/api/v1/dashboard/vendas-por-periodo", 2, None),
+    ("GET", "/api/v1/dashboard/status-distribuicao", 2, None),
+    ("GET", "/api/v1/dashboard/tipo-bem-distribuicao", 2, None),
+    ("GET", "/api/v1/dashboard/vendas-mensal", 2, None),
+    ("GET", "/api/v1/dashboard/top-representantes", 2, "limit"),
+    # relatorios
+    ("GET", "/api/v1/relatorios/documentos/beneficio/{beneficio_id}", 2, None),
+    ("GET", "/api/v1/relatorios/cliente/{cliente_id}/pdf", 3, None),
+    ("GET", "/api/v1/relatorios/beneficio/{beneficio_id}/pdf", 4, None),
+    # termo: 10 na primeira geração (grava o documento), 6 servindo o armazenado
+    ("GET", "/api/v1/relatorios/termo-adesao/{beneficio_id}/pdf", 10, None),
+    ("POST", "/api/v1/relatorios/lote", 6, "beneficio_ids"),
+    # configuracoes
+    ("GET", "/api/v1/configuracoes/", 2, None),
+    ("GET", "/api/v1/configuracoes/sistema", 2, None),
+    ("GET", "/api/v1/configuracoes/pdf", 2, None),
+    # perfis
+    ("GET", "/api/v1/perfis/", 2, None),
+    ("GET", "/api/v1/perfis/permissoes/matriz", 4, None),
+    ("GET", "/api/v1/perfis/usuario/minhas-permissoes", 3, None),
+    # tabelas-credito
+    ("GET", "/api/v1/tabelas-credito/", 2, "limit"),
+    # campanhas
+    ("GET", "/api/v1/campanhas/elegibilidade", 5, None),
+    # jobs
+    ("GET", "/api/v1/jobs", 2, "limit"),
+]
+
+
+def _resumo(consultas):
+    repetidas = Counter(" ".join(sql.split())[:120] for sql in consultas).most_common(3)
+    return "; ".join(f"{n}x {sql}" for sql, n in repetidas)
+
+
+CORPOS = {
+    "/api/v1/beneficios/simular": lambda ids, tamanho: {"tipo_bem": "imovel"},
+    "/api/v1/relatorios/lote": lambda ids, tamanho: {
+        "beneficio_ids": ids["beneficio_ids"][:tamanho], "documentos": ["termo"]
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def ids(client):
+    return {
+        "beneficio_ids": [b["id"] for b in client.get(f"/api/v1/beneficios/?limit={max(PAGINAS)}").json()],
+        "usuario_id": client.get("/api/v1/usuarios/?limit=1").json()[0]["id"],
+        "cliente_id": client.get("/api/v1/clientes/?limit=1").json()[0]["id"],
+        "beneficio_id": client.get("/api/v1/beneficios/?limit=1&status=ativo").json()[0]["id"],
+        "representante_id": client.get("/api/v1/representantes/?limit=1").json()[0]["id"],
+    }
+
+
+def _chamar(client, metodo, caminho, parametros=None, corpo=None):
+    with contar_consultas() as consultas:
+        resposta = client.request(metodo, caminho, params=parametros, json=corpo)
+    assert resposta.status_code < 400, f"{metodo} {caminho}: {resposta.status_code} {resposta.text[:200]}"
+    return consultas
+
+
+@pytest.mark.parametrize(
+    "metodo,caminho,orcamento,paginacao", ORCAMENTOS, ids=[f"{m} {c}" for m, c, _, _ in ORCAMENTOS]
+)
+def test_orcamento_de_consultas(client, ids, metodo, caminho, orcamento, paginacao):
+    corpo = CORPOS.get(caminho)
+    caminho = caminho.format(**ids)
+    paginas = PAGINAS if paginacao else (None,)
+    contagens = []
+    for tamanho in paginas:
+        if corpo is not None:
+            consultas = _chamar(client, metodo, caminho, corpo=corpo(ids, tamanho))
+        else:
+            consultas = _chamar(client, metodo, caminho, {paginacao: tamanho} if paginacao else None)
+        contagens.append(len(consultas))
+        assert len(consultas) <= orcamento, (
+            f"{metodo} {caminho} (página {tamanho}): {len(consultas)} consultas, "
+            f"orçamento {orcamento}. Mais repetidas: {_resumo(consultas)}"
+        )
+    assert len(set(contagens)) == 1, (
+        f"{metodo} {caminho}: consultas variam com o tamanho da página {dict(zip(paginas, contagens))}"
+    )
+
+
+def test_todo_router_tem_orcamento():
+    """Um router novo em app/api/v1/router.py precisa declarar orçamentos aqui"""
+    prefixos = {rota.path.split("/")[3] for rota in api_router.routes}
+    cobertos = {caminho.split("/")[3] for _, caminho, _, _ in ORCAMENTOS}
+    assert prefixos - cobertos == set()
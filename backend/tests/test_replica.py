@@ -0,0 +1,92 @@
+"""
+Roteamento de leitura para a réplica (get_read_db)
+
+A "réplica" é uma cópia do banco de testes com os clientes desativados, o
+que deixa visível de onde o dashboard leu.
+"""
+import shutil
+
+import pytest
+
+from app.core import database
+
+
+URL_METRICAS = "/api/v1/dashboard/metricas"
+
+
+@pytest.fixture
+def replica(client, monkeypatch, tmp_path):
+    origem = database.engine.url.database
+    if database.engine.dialect.name != "sqlite":
+        pytest.skip("Cópia do banco só com SQLite")
+    copia = tmp_path / "replica.db"
+    shutil.copyfile(origem, copia)
+    engine_replica = database.criar_engine(f"sqlite:///{copia}")
+    with engine_replica.begin() as conn:
+        conn.exec_driver_sql("UPDATE clientes SET ativo = 0")
+
+    monkeypatch.setattr(database, "engine_replica", engine_replica)
+    monkeypatch.setattr(database, "_escritas", {})
+    monkeypatch.setattr(database, "_atraso", {"valor": None, "verificado_em": 0.0})
+    yield engine_replica
+    engine_replica.dispose()
+
+
+def _total_clientes(client):
+    return client.get(URL_METRICAS).json()["total_clientes"]
+
+
+def test_sem_replica_le_do_primario(client):
+    assert database.engine_replica is None
+    assert _total_clientes(client) > 0
+
+
+def test_leitura_vai_para_a_replica(client, replica):
+    assert _total_clientes(client) == 0
+
+
+def test_replica_atrasada_volta_ao_primario(client, replica, monkeypatch):
+    monkeypatch.setattr(database, "atraso_replica", lambda: database.settings.DB_REPLICA_ATRASO_MAX_SEGUNDOS + 1)
+    assert _total_clientes(client) > 0
+    monkeypatch.setattr(database, "atraso_replica", lambda: None)
+    assert _total_clientes(client) > 0
+
+
+def test_quem_escreveu_le_do_primario(client, replica, monkeypatch):
+    cliente = client.get("/api/v1/clientes/?limit=1").json()[0]
+    resposta = client.put(f"/api/v1/clientes/{cliente['id']}", json={"naturalidade": "Réplica/SP"})
+    assert resposta.status_code == 200
+    assert _total_clientes(client) > 0
+
+    # Fora da janela tolerada a escrita já chegou à réplica
+    for usuario_id in list(database._escritas):
+        database._escritas[usuario_id] -= database.settings.DB_REPLICA_ATRASO_MAX_SEGUNDOS + 1
+    assert _total_clientes(client) == 0
+
+
+@pytest.fixture
+def cache_ligado(monkeypatch):
+    from app.core import cache
+
+    monkeypatch.setattr(database.settings, "CACHE_HABILITADO", True)
+    cache.limpar_local()
+    yield cache
+    cache.limpar_local()
+
+
+def _primario(monkeypatch):
+    monkeypatch.setattr(database, "atraso_replica", lambda: database.settings.DB_REPLICA_ATRASO_MAX_SEGUNDOS + 1)
+
+
+def test_cache_calculado_na_replica(client, replica, cache_ligado, monkeypatch):
+    assert _total_clientes(client) == 0
+    _primario(monkeypatch)
+    assert _total_clientes(client) == 0  # valor da réplica gravado e servido do cache
+
+
+def test_replica_logo_apos_invalidacao_nao_grava(client, replica, cache_ligado, monkeypatch):
+    # Commit de outro usuário acabou de invalidar: a réplica pode ainda não tê-lo
+    cache_ligado.invalidar("clientes")
+    assert _total_clientes(client) == 0
+    _primario(monkeypatch)
+    assert _total_clientes(client) > 0  # nada foi gravado: recalculado no primário
@@ -0,0 +1,54 @@
+"""
+Listagens servidas por app.core.respostas (JSON pronto, ?format=compact e
+?fields= com projeção das colunas no SELECT)
+"""
+import pytest
+
+from tests.conftest import contar_consultas
+
+
+@pytest.mark.parametrize("url", ["/api/v1/clientes/?limit=5", "/api/v1/beneficios/?limit=5"])
+def test_formato_compacto_tem_os_mesmos_dados(client, url):
+    normal = client.get(url)
+    compacto = client.get(f"{url}&format=compact")
+    assert normal.status_code == compacto.status_code == 200
+    assert normal.headers["content-type"] == "application/json"
+
+    corpo = compacto.json()
+    linhas = [dict(zip(corpo["campos"], linha)) for linha in corpo["linhas"]]
+    assert linhas == normal.json()
+    assert len(compacto.content) < len(normal.content)
+
+
+def test_formato_desconhecido_recusado(client):
+    assert client.get("/api/v1/clientes/?format=csv").status_code == 422
+
+
+def test_listagem_seleciona_so_as_colunas_da_resposta(client):
+    with contar_consultas() as comandos:
+        assert client.get("/api/v1/clientes/?limit=5").status_code == 200
+    select = next(c for c in comandos if "FROM clientes" in c)
+    assert "clientes.nome" in select
+    assert "financiamento_veicular_valor" not in select
+
+
+@pytest.mark.parametrize("url, campos", [
+    ("/api/v1/clientes/?limit=5&fields=nome,id", ["id", "nome"]),
+    ("/api/v1/beneficios/?limit=5&fields=status,cliente_nome", ["cliente_nome", "status"]),
+])
+def test_fields_limita_a_resposta(client, url, campos):
+    completo = client.get(url.split("&fields=")[0]).json()
+    with contar_consultas() as comandos:
+        parcial = client.get(url).json()
+    assert parcial == [{c: item[c] for c in campos} for item in completo]
+    select = comandos[-1]
+    assert "created_at" not in select.split("FROM")[0]
+
+    compacto = client.get(f"{url}&format=compact").json()
+    assert compacto["campos"] == campos
+
+
+def test_fields_desconhecido_recusado(client):
+    resposta = client.get("/api/v1/clientes/?fields=id,senha")
+    assert resposta.status_code == 400
+    assert "senha" in resposta.json()["detail"]
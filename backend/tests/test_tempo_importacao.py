@@ -0,0 +1,63 @@
+"""
+Custo do cold import de app.main
+
+Cada worker do uvicorn (e cada processo do pool de PDFs) paga o import da
+aplicação ao subir. Os motores de relatório e o NumPy ficam fora desse
+caminho: são importados na primeira renderização/cálculo, nem o lifespan
+(aquecimento) pode carregá-los. O import roda num interpretador novo para não
+aproveitar módulos já carregados pelos testes.
+
+IMPORT_BUDGET_MS ajusta o orçamento para máquinas mais lentas (CI).
+"""
+import json
+import os
+import subprocess
+import sys
+
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ORCAMENTO_MS = float(os.getenv("IMPORT_BUDGET_MS", "4000"))
+
+# Não podem ser carregados só por importar a aplicação
+PESADOS = ("reportlab", "weasyprint", "pypdf", "numpy", "PIL")
+
+SCRIPT = """
+import json, sys, time
+inicio = time.perf_counter()
+import app.main
+ms = (time.perf_counter() - inicio) * 1000
+no_import = sorted(m for m in sys.modules if "." not in m)
+if "--lifespan" in sys.argv:
+    from fastapi.testclient import TestClient
+    with TestClient(app.main.app):
+        pass
+print(json.dumps({"ms": ms, "modulos": no_import, "depois_lifespan": sorted(m for m in sys.modules if "." not in m)}))
+"""
+
+
+def _importar(*args):
+    resultado = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *args], cwd=BACKEND, env=os.environ.copy(),
+        capture_output=True, text=True, timeout=120,
+    )
+    assert resultado.returncode == 0, resultado.stderr[-2000:]
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+def test_import_da_aplicacao():
+    medida = _importar()
+    carregados = sorted(set(PESADOS) & set(medida["modulos"]))
+    assert carregados == [], f"app.main carregou {carregados} no import; importe-os onde são usados"
+    assert medida["ms"] <= ORCAMENTO_MS, (
+        f"Cold import de app.main levou {medida['ms']:.0f}ms (orçamento {ORCAMENTO_MS:.0f}ms); "
+        f"use `python -X importtime -c 'import app.main'` para achar o culpado"
+    )
+
+
+def test_lifespan_nao_carrega_os_motores_de_relatorio(client):
+    # `client` garante o banco de testes pronto (DATABASE_URL herdado)
+    medida = _importar("--lifespan")
+    carregados = sorted(set(PESADOS) & set(medida["depois_lifespan"]))
+    assert carregados == [], (
+        f"O startup carregou {carregados} no processo HTTP; aquecimento de PDFs vai em etapas \"render\""
+    )